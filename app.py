@@ -1,111 +1,2782 @@
 # app.py
 
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, url_for, Response, make_response, g, has_request_context, stream_with_context
+from functools import wraps
+import click
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
-from datetime import datetime, timedelta
-from sqlalchemy import func
+import bcrypt as bcrypt_lib
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, event, insert, tuple_, inspect as sa_inspect, text, select, literal, exists
 import os
-import qrcode
+import importlib
 import io
 import base64
+import json
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import pickle
+import csv
+import queue
+import zlib
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from itertools import repeat
+import hashlib
+from collections import OrderedDict, Counter, deque
+import threading
+import time
+import random
+import bisect
+import sys
+from contextlib import contextmanager
+import numpy as np
 from flask_cors import CORS
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from werkzeug.middleware.proxy_fix import ProxyFix
+import sqlite3
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['X-Next-Cursor', 'Link'])
 
 # Database Configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///site.db'
+def database_url(name, default=None):
+    url = os.getenv(name, default)
+    # Hosted Postgres providers often hand out the postgres:// scheme SQLAlchemy no longer accepts.
+    if url and url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+def engine_options(url):
+    if url.startswith('sqlite'):
+        return {}
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_pre_ping': True,
+    }
+
+app.config['SQLALCHEMY_DATABASE_URI'] = database_url('DATABASE_URL', 'sqlite:///site.db')
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+app.config['SQLALCHEMY_BINDS'] = {}
+if database_url('READ_DATABASE_URL'):
+    # Read replica, or for SQLite a read-only connection to the same file:
+    # READ_DATABASE_URL='sqlite:///file:site.db?mode=ro&uri=true'
+    read_url = database_url('READ_DATABASE_URL')
+    app.config['SQLALCHEMY_BINDS']['read'] = {'url': read_url, **engine_options(read_url)}
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['SECRET_KEY'] = 'your-super-secret-key'
 
-db = SQLAlchemy(app)
-bcrypt = Bcrypt(app)
+# Applied to every SQLite connection as it is opened.
+app.config['SQLITE_PRAGMAS'] = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+}
+
+# Password Hashing Configuration
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 4 * app.config['PASSWORD_HASH_WORKERS']))
+app.config['PASSWORD_HASH_TIMEOUT'] = 30
+app.config['PASSWORD_HASH_BULK_WORKERS'] = int(os.getenv('PASSWORD_HASH_BULK_WORKERS', max(1, app.config['PASSWORD_HASH_WORKERS'] // 2)))
+app.config['BULK_REGISTER_BATCH_SIZE'] = 500
+app.config['BULK_REGISTER_MAX_ROWS'] = 10000
+
+# Recommendation Configuration
+app.config['RECOMMENDATION_INDEX_PATH'] = os.path.join(app.instance_path, 'recommendation_index.pkl')
+app.config['RECOMMENDATION_REFIT_RATIO'] = 0.1
+app.config['RECOMMENDATION_RESULT_TTL'] = timedelta(hours=24)
+app.config['RECOMMENDATION_BATCH_CHUNK_SIZE'] = 2000
+app.config['RECOMMENDATION_BATCH_MAX_USERS'] = 1000
+app.config['RECOMMENDATION_MAX_TOP_N'] = 50
+app.config['RECOMMENDATION_BACKEND'] = os.getenv('RECOMMENDATION_BACKEND', 'tfidf')  # tfidf, hashing or embedding
+app.config['RECOMMENDATION_TFIDF_MAX_FEATURES'] = 4096  # columns per dense club vector
+app.config['RECOMMENDATION_HASHING_FEATURES'] = 2048
+app.config['RECOMMENDATION_EMBEDDINGS_PATH'] = os.getenv('RECOMMENDATION_EMBEDDINGS_PATH')
+app.config['RECOMMENDATION_ANN_MIN_CLUBS'] = 20000  # smaller catalogs are scanned exactly
+app.config['RECOMMENDATION_ANN_PROBES'] = 8  # inverted lists scored per query
+app.config['RECOMMENDATION_WEIGHTS'] = {'text': 1.0, 'skills': 0.3, 'recruiting': 0.1, 'deadline': 0.1}
+
+# Check-in Configuration
+app.config['EVENT_KEY_CACHE_TTL'] = 300
+app.config['CHECKIN_BATCH_MAX'] = 1000
+# Batched check-ins carry the scanner's clock; outside these bounds a timestamp is rejected.
+app.config['CHECKIN_MAX_CLOCK_SKEW'] = timedelta(minutes=5)
+app.config['CHECKIN_MAX_AGE'] = timedelta(days=7)
+
+# Buzz Configuration
+app.config['BUZZ_WINDOWS'] = {'15m': 15, '1h': 60, '24h': 24 * 60}
+app.config['BUZZ_DEFAULT_WINDOW'] = '1h'
+# Counts are kept per worker process; with several workers, check-ins served by the others show up in
+# /buzz only after the next resync from the database, so this is also how stale /buzz may be.
+app.config['BUZZ_RESYNC_SECONDS'] = int(os.getenv('BUZZ_RESYNC_SECONDS', 60))
+
+# QR Code Configuration
+app.config['QR_CACHE_MAX_BYTES'] = 32 * 1024 * 1024
+app.config['QR_CACHE_DIR'] = os.getenv('QR_CACHE_DIR')
+
+# Chatbot Configuration
+app.config['CHATBOT_INTENTS_PATH'] = os.getenv('CHATBOT_INTENTS_PATH', os.path.join(app.root_path, 'chatbot_intents.json'))
+app.config['CHATBOT_RELOAD_INTERVAL'] = 2
+
+# Response Cache Configuration
+app.config['RESPONSE_CACHE_BACKEND'] = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+app.config['RESPONSE_CACHE_DIR'] = os.getenv('RESPONSE_CACHE_DIR', os.path.join(app.instance_path, 'response_cache'))
+app.config['RESPONSE_CACHE_TTL'] = int(os.getenv('RESPONSE_CACHE_TTL', 60))
+app.config['RESPONSE_CACHE_MAX_ENTRIES'] = 1024
+
+# Listing Configuration
+app.config['MAX_PAGE_SIZE'] = 500
+
+# Rate Limiting and Coalescing Configuration
+app.config['COALESCE_REQUESTS'] = os.getenv('COALESCE_REQUESTS', '1') == '1'
+app.config['RATE_LIMIT_ENABLED'] = os.getenv('RATE_LIMIT_ENABLED', '1') == '1'
+app.config['RATE_LIMIT_STORE'] = os.getenv('RATE_LIMIT_STORE', 'memory')  # 'sqlite' shares buckets between workers on a host
+app.config['RATE_LIMIT_STORE_PATH'] = os.getenv('RATE_LIMIT_STORE_PATH', os.path.join(app.instance_path, 'rate_limits.db'))
+app.config['RATE_LIMIT_MAX_KEYS'] = 100000  # in-process buckets kept before the least recently used are dropped
+# Reverse proxies in front of a WSGI server; the client address is then read from X-Forwarded-For.
+# Under uvicorn leave this at 0 and use its --forwarded-allow-ips, which already rewrites the client address.
+app.config['TRUSTED_PROXIES'] = int(os.getenv('TRUSTED_PROXIES', 0))
+# endpoint -> token bucket per authenticated user or client address, refilled at ``per_minute`` and holding up to ``burst`` requests
+app.config['RATE_LIMITS'] = {
+    'get_recommendations': {'per_minute': 30, 'burst': 10},
+    'get_batch_recommendations': {'per_minute': 10, 'burst': 3},
+    'generate_qr': {'per_minute': 60, 'burst': 20},
+    'generate_club_qr_codes': {'per_minute': 10, 'burst': 3},
+    'register': {'per_minute': 10, 'burst': 5},
+    'register_bulk': {'per_minute': 2, 'burst': 2},
+}
+
+# Club Statistics Configuration
+app.config['CLUB_STATS_DEFAULT_DAYS'] = 30
+app.config['CLUB_STATS_MAX_DAYS'] = 366
+app.config['CLUB_STATS_SHARDS'] = 16  # counter rows per club and metric; takes effect at upgrade-schema
+
+# Live Updates Configuration
+app.config['STREAM_MAX_PENDING'] = 256  # undelivered messages before a slow client is dropped
+app.config['STREAM_HISTORY'] = 1000  # recent messages kept for Last-Event-ID resumption
+app.config['STREAM_HEARTBEAT_SECONDS'] = 15
+app.config['STREAM_MAX_TOPICS'] = 20
+
+# Write-Behind Configuration
+app.config['WRITE_BEHIND_ENABLED'] = os.getenv('WRITE_BEHIND') == '1'
+app.config['WRITE_BEHIND_LOG_PATH'] = os.getenv('WRITE_BEHIND_LOG_PATH', os.path.join(app.instance_path, 'write_behind.log'))
+app.config['WRITE_BEHIND_FLUSH_INTERVAL'] = 0.05
+app.config['WRITE_BEHIND_BATCH_SIZE'] = 1000
+app.config['WRITE_BEHIND_MAX_PENDING'] = 50000
+app.config['WRITE_BEHIND_FSYNC'] = os.getenv('WRITE_BEHIND_FSYNC', '1') == '1'
+
+# Export Configuration
+app.config['EXPORT_CHUNK_SIZE'] = 1000  # rows fetched per round trip
+app.config['EXPORT_BUFFER_BYTES'] = 64 * 1024  # encoded bytes gathered before a chunk is sent
+
+# Startup Configuration
+# sklearn, scipy and qrcode (which pulls in PIL) load on first use. Preloading them
+# suits `gunicorn --preload`, where forked workers then share the imported pages.
+app.config['PRELOAD_HEAVY_MODULES'] = os.getenv('PRELOAD_HEAVY_MODULES') == '1'
+
+HEAVY_MODULES = ('scipy.sparse', 'sklearn.feature_extraction.text', 'qrcode', 'qrcode.image.svg')
+
+def preload_heavy_modules():
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+
+if app.config['PRELOAD_HEAVY_MODULES']:
+    preload_heavy_modules()
+
+# Instrumentation Configuration
+app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', '1') == '1'
+app.config['PROFILE_DIR'] = os.getenv('PROFILE_DIR')  # setting this turns the sampling profiler on
+app.config['PROFILE_SAMPLE_RATE'] = float(os.getenv('PROFILE_SAMPLE_RATE', 1.0))
+app.config['PROFILE_INTERVAL'] = 0.005
+
+def apply_sqlite_pragmas(dbapi_connection):
+    cursor = dbapi_connection.cursor()
+    for pragma, value in app.config['SQLITE_PRAGMAS'].items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
+
+@event.listens_for(Engine, 'connect')
+def configure_sqlite_connection(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        apply_sqlite_pragmas(dbapi_connection)
+
+db = SQLAlchemy(app)
+bcrypt = Bcrypt(app)
+
+def read_db():
+    """Session for read-only queries: the ``read`` bind when configured, else the primary session."""
+    if 'read' not in app.config['SQLALCHEMY_BINDS']:
+        return db.session
+    if 'read_session' not in g:
+        g.read_session = Session(bind=db.engines['read'])
+    return g.read_session
+
+@app.teardown_appcontext
+def close_read_session(exception):
+    read_session = g.pop('read_session', None)
+    if read_session is not None:
+        read_session.close()
+
+# --- Instrumentation ---
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    pairs = (
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in zip(names, values)
+    )
+    return '{' + ','.join(pairs) + '}'
+
+class CounterMetric:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{format_labels(self.labels, label_values)} {value}")
+        return lines
+
+class HistogramMetric:
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}  # label values -> (per-bucket counts with a trailing +Inf slot, [sum])
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1][0] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for label_values, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), counts):
+                    cumulative += count
+                    labels = format_labels(self.labels + ('le',), label_values + (bound,))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = format_labels(self.labels, label_values)
+                lines.append(f"{self.name}_sum{labels} {total[0]}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Per-process metrics rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help, labels=()):
+        metric = CounterMetric(name, help, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        metric = HistogramMetric(name, help, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        return '\n'.join(line for metric in self._metrics for line in metric.render()) + '\n'
+
+metrics = MetricsRegistry()
+REQUEST_DURATION = metrics.histogram(
+    'http_request_duration_seconds', 'Request latency by route.', ('method', 'route', 'status'))
+REQUEST_SQL_STATEMENTS = metrics.histogram(
+    'http_request_sql_statements', 'SQL statements issued per request.', ('route',), STATEMENT_BUCKETS)
+REQUEST_SQL_DURATION = metrics.histogram(
+    'http_request_sql_duration_seconds', 'Time spent in SQL per request.', ('route',))
+STAGE_DURATION = metrics.histogram(
+    'stage_duration_seconds', 'Time spent in instrumented stages.', ('stage',))
+COALESCED_REQUESTS = metrics.counter(
+    'coalesced_requests_total', 'Computations shared with a concurrent identical request.', ('route',))
+RATE_LIMITED_REQUESTS = metrics.counter(
+    'rate_limited_requests_total', 'Requests rejected with 429 by the rate limiter.', ('route',))
+PROFILES_WRITTEN = metrics.counter(
+    'request_profiles_written_total', 'Sampled request profiles written to PROFILE_DIR.', ('route',))
+
+@contextmanager
+def timed(stage):
+    """Record the duration of a block (or, as a decorator, a call) under ``stage``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_DURATION.observe(time.perf_counter() - started, stage)
+
+def request_route():
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info['statement_started'] = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_statement(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'sql_statements' in g:
+        g.sql_statements += 1
+        g.sql_seconds += time.perf_counter() - conn.info['statement_started']
+
+class SamplingProfiler:
+    """Samples request threads' stacks into folded-stack files under ``PROFILE_DIR``."""
+
+    def __init__(self):
+        self._active = {}  # thread id -> collections.Counter of folded stacks
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        thread_id = threading.get_ident()
+        with self._lock:
+            if thread_id in self._active:
+                return False
+            self._active[thread_id] = Counter()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+                self._thread.start()
+        return True
+
+    def stop(self):
+        with self._lock:
+            return self._active.pop(threading.get_ident(), None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                for thread_id, samples in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[self._fold(frame)] += 1
+            time.sleep(app.config['PROFILE_INTERVAL'])
+
+    @staticmethod
+    def _fold(frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ';'.join(reversed(stack))
+
+    def write(self, samples, route):
+        directory = app.config['PROFILE_DIR']
+        os.makedirs(directory, exist_ok=True)
+        name = re.sub(r'[^A-Za-z0-9]+', '_', f"{request.method}_{route}").strip('_')
+        path = os.path.join(directory, f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{threading.get_ident()}-{name}.folded")
+        with open(path, 'w') as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in samples.items())
+        PROFILES_WRITTEN.inc(route)
+
+request_profiler = SamplingProfiler()
+
+@app.before_request
+def start_request_instrumentation():
+    if app.config['METRICS_ENABLED']:
+        g.request_started = time.perf_counter()
+        g.sql_statements = 0
+        g.sql_seconds = 0.0
+    if app.config['PROFILE_DIR'] and random.random() < app.config['PROFILE_SAMPLE_RATE']:
+        g.profiling = request_profiler.start()
+
+@app.after_request
+def record_request_metrics(response):
+    if 'request_started' in g:
+        route = request_route()
+        REQUEST_DURATION.observe(time.perf_counter() - g.request_started, request.method, route, response.status_code)
+        REQUEST_SQL_STATEMENTS.observe(g.sql_statements, route)
+        REQUEST_SQL_DURATION.observe(g.sql_seconds, route)
+    return response
+
+@app.teardown_request
+def finish_request_profile(exception):
+    if g.pop('profiling', False):
+        samples = request_profiler.stop()
+        if samples:
+            request_profiler.write(samples, request_route())
+
+# --- Data Models ---
+
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(20), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(60), nullable=False)
+    full_name = db.Column(db.String(100), nullable=False)
+    role = db.Column(db.String(20), nullable=False, default='student')
+    
+    student_profile = db.relationship('StudentProfile', backref='user', uselist=False)
+    club = db.relationship('Club', backref='coordinator', uselist=False)
+    applications = db.relationship('Application', backref='student', lazy=True)
+    feedback = db.relationship('Feedback', backref='student', lazy=True)
+    attendance = db.relationship('Attendance', backref='student', lazy=True)
+
+    def __repr__(self):
+        return f"User('{self.username}', '{self.email}')"
+
+class StudentProfile(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    major = db.Column(db.String(50))
+    interests = db.Column(db.Text) 
+    skills = db.Column(db.Text) 
+    resume = db.Column(db.String(255))
+    personal_details = db.Column(db.Text)
+
+    __table_args__ = (
+        db.Index('ix_student_profile_user_id', 'user_id'),
+    )
+
+class Club(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    tags = db.Column(db.Text) 
+    coordinator_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    deadline = db.Column(db.Date)
+    contact_info = db.Column(db.String(100))
+    
+    is_recruiting = db.Column(db.Boolean, default=True)
+    open_positions = db.Column(db.Text)
+    skills_required = db.Column(db.Text)
+    total_members = db.Column(db.Integer, default=0)
+    interview_date = db.Column(db.DateTime)
+    
+    events = db.relationship('Event', backref='club', lazy=True)
+    applications = db.relationship('Application', backref='club', lazy=True)
+    feedback = db.relationship('Feedback', backref='club', lazy=True)
+
+    __table_args__ = (
+        db.Index('ix_club_coordinator_id', 'coordinator_id'),
+    )
+
+    def __repr__(self):
+        return f"Club('{self.name}')"
+
+class Event(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    date = db.Column(db.DateTime, nullable=False)
+    location = db.Column(db.String(100), nullable=False)
+    qr_code_key = db.Column(db.String(50), unique=True, nullable=False)
+    
+    attendees = db.relationship('Attendance', backref='event', lazy=True)
+
+    __table_args__ = (
+        db.Index('ix_event_club_id_date', 'club_id', 'date'),
+        db.Index('ix_event_date_id', 'date', 'id'),
+    )
+
+class Attendance(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
+    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('uq_attendance_event_student', 'event_id', 'student_id', unique=True),
+        db.Index('ix_attendance_student_id', 'student_id'),
+        db.Index('ix_attendance_timestamp_event_id', 'timestamp', 'event_id'),
+    )
+
+class Application(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('uq_application_student_club', 'student_id', 'club_id', unique=True),
+        db.Index('ix_application_club_id_id', 'club_id', 'id'),
+    )
+
+class Feedback(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
+    rating = db.Column(db.Integer)
+    comment = db.Column(db.Text)
+    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_feedback_club_id_id', 'club_id', 'id'),
+    )
+
+class IndexState(db.Model):
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class ClubRecommendation(db.Model):
+    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    rank = db.Column(db.Integer, primary_key=True)
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    index_version = db.Column(db.Integer, nullable=False)
+    computed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+# Normalised copies of the comma-separated columns on Club and StudentProfile,
+# kept in sync by the listeners under "Club Search". Names are lower-cased.
+
+class Tag(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+class Skill(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+
+class ClubTag(db.Model):
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tag.id'), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_club_tag_tag_id', 'tag_id', 'club_id'),
+    )
+
+class ClubSkill(db.Model):
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_club_skill_skill_id', 'skill_id', 'club_id'),
+    )
+
+class ClubPosition(db.Model):
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), primary_key=True)
+    name = db.Column(db.String(100), primary_key=True)
+
+class StudentInterest(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tag.id'), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_student_interest_tag_id', 'tag_id', 'user_id'),
+    )
+
+class StudentSkill(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    skill_id = db.Column(db.Integer, db.ForeignKey('skill.id'), primary_key=True)
+
+    __table_args__ = (
+        db.Index('ix_student_skill_skill_id', 'skill_id', 'user_id'),
+    )
+
+# Per-club rollups kept current by database triggers (see "Club Statistics").
+
+# Both rollups are split into CLUB_STATS_SHARDS rows per key so concurrent writes don't queue on one row lock.
+class ClubDailyStat(db.Model):
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    shard = db.Column(db.Integer, primary_key=True, default=0)
+    applications = db.Column(db.Integer, nullable=False, default=0)
+    checkins = db.Column(db.Integer, nullable=False, default=0)
+    feedback = db.Column(db.Integer, nullable=False, default=0)
+    rated = db.Column(db.Integer, nullable=False, default=0)
+    rating_total = db.Column(db.Integer, nullable=False, default=0)
+
+class ClubStatTotal(db.Model):
+    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), primary_key=True)
+    # 'status:<status>', 'event:<event id>', 'feedback', 'rated' or 'rating_total'
+    metric = db.Column(db.String(40), primary_key=True)
+    shard = db.Column(db.Integer, primary_key=True, default=0)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+# --- Schema Migrations ---
+
+def upgrade_schema():
+    """Create missing tables, columns, indexes, search index and stats triggers; safe to rerun."""
+    db.create_all(bind_key=None)
+    inspector = sa_inspect(db.engine)
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            existing_columns = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    connection.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+
+            existing_indexes = {i['name'] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing_indexes:
+                    continue
+                if index.unique and 'id' in table.columns:
+                    key_columns = ', '.join(f'"{c.name}"' for c in index.columns)
+                    keep_first = 'id'
+                    if 'status' in table.columns:
+                        # Keep the decided row, e.g. an accepted application over its pending double submit.
+                        keep_first = "CASE WHEN status = 'pending' THEN 1 ELSE 0 END, id"
+                    removed = connection.execute(text(
+                        f'DELETE FROM "{table.name}" WHERE id IN (SELECT id FROM '
+                        f'(SELECT id, ROW_NUMBER() OVER (PARTITION BY {key_columns} ORDER BY {keep_first}) AS n '
+                        f'FROM "{table.name}") ranked WHERE n > 1)'
+                    )).rowcount
+                    if removed:
+                        app.logger.warning("Removed %d duplicate rows from %s before creating %s",
+                                           removed, table.name, index.name)
+                index.create(connection)
+
+        # Backfill the normalised tag and skill tables from the CSV columns while they are empty.
+        if not any(connection.execute(select(link[2]).limit(1)).first() for link in CLUB_TERM_LINKS):
+            sync_club_terms(connection)
+        if not any(connection.execute(select(link[2]).limit(1)).first() for link in PROFILE_TERM_LINKS):
+            sync_profile_terms(connection)
+        setup_full_text_search(connection)
+        setup_club_stats(connection)
+
+@app.cli.command('upgrade-schema')
+def upgrade_schema_command():
+    """Create missing tables, columns and indexes."""
+    upgrade_schema()
+    click.echo("Schema is up to date.")
+
+# --- Recommendation Index ---
+
+def get_index_version(name):
+    version = db.session.query(IndexState.version).filter_by(name=name).scalar()
+    return version or 0
+
+def bump_index_version(connection, name):
+    table = IndexState.__table__
+    result = connection.execute(
+        table.update().where(table.c.name == name).values(version=table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(table.insert().values(name=name, version=1))
+
+@contextmanager
+def file_lock(path):
+    """Exclusive advisory lock shared by every worker process on this host."""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def top_n_indices(scores, n):
+    """Indices of the ``n`` highest scores along the last axis, best first, without a full sort."""
+    n = min(n, scores.shape[-1])
+    if n <= 0:
+        return np.zeros(scores.shape[:-1] + (0,), dtype=int)
+    if n < scores.shape[-1]:
+        candidates = np.argpartition(-scores, n - 1, axis=-1)[..., :n]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape)
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=-1), axis=-1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=-1)
+
+def club_text(tags, description):
+    return f"{tags} {description}"
+
+def profile_text(major, interests, skills):
+    return f"{major} {interests} {skills}"
+
+def normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+class TfidfVectorBackend:
+    """Bag-of-words TF-IDF over club tags and descriptions, fit on the club catalog."""
+
+    name = 'tfidf'
+    needs_fit = True
+
+    def __init__(self):
+        self._vectorizer = None
+
+    def fit(self, texts):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        with timed('tfidf_fit'):
+            self._vectorizer = TfidfVectorizer(
+                stop_words='english', max_features=app.config['RECOMMENDATION_TFIDF_MAX_FEATURES'], dtype=np.float32
+            ).fit(texts)
+
+    def transform(self, texts):
+        # Rows come out L2-normalised, so a dot product with them is the cosine.
+        return self._vectorizer.transform(texts).toarray()
+
+class HashingVectorBackend:
+    """Character n-grams hashed into a fixed number of columns; nothing to fit."""
+
+    name = 'hashing'
+    needs_fit = False
+
+    def fit(self, texts):
+        pass
+
+    def transform(self, texts):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        vectorizer = HashingVectorizer(
+            analyzer='char_wb', ngram_range=(3, 5), n_features=app.config['RECOMMENDATION_HASHING_FEATURES'],
+            alternate_sign=False, norm='l2', dtype=np.float32,
+        )
+        return vectorizer.transform(texts).toarray()
+
+class EmbeddingVectorBackend:
+    """Mean of pre-trained word vectors (GloVe text or ``.npz``) from ``RECOMMENDATION_EMBEDDINGS_PATH``."""
+
+    name = 'embedding'
+    needs_fit = False
+    _tables = {}
+    _tables_lock = threading.Lock()
+
+    def fit(self, texts):
+        pass
+
+    def transform(self, texts):
+        lookup, vectors = self._table(app.config['RECOMMENDATION_EMBEDDINGS_PATH'])
+        result = np.zeros((len(texts), vectors.shape[1]), dtype=np.float32)
+        for i, text in enumerate(texts):
+            rows = [lookup[word] for word in search_words(text) if word in lookup]
+            if rows:
+                result[i] = vectors[rows].mean(axis=0)
+        return normalize_rows(result)
+
+    @classmethod
+    def _table(cls, path):
+        if not path:
+            raise RuntimeError("RECOMMENDATION_EMBEDDINGS_PATH must point at a word vector file")
+        with cls._tables_lock:
+            if path not in cls._tables:
+                if path.endswith('.npz'):
+                    saved = np.load(path)
+                    words, vectors = saved['words'].tolist(), saved['vectors'].astype(np.float32)
+                else:
+                    words, rows = [], []
+                    with open(path, encoding='utf-8') as f:
+                        for line in f:
+                            parts = line.rstrip().split(' ')
+                            if len(parts) > 2:  # word2vec files start with a "count dims" header
+                                words.append(parts[0])
+                                rows.append(np.asarray(parts[1:], dtype=np.float32))
+                    vectors = np.vstack(rows)
+                cls._tables[path] = ({word: i for i, word in enumerate(words)}, vectors)
+            return cls._tables[path]
+
+RECOMMENDATION_BACKENDS = {
+    backend.name: backend for backend in (TfidfVectorBackend, HashingVectorBackend, EmbeddingVectorBackend)
+}
+
+def train_centroids(matrix, lists, iterations=10, seed=0):
+    """Spherical k-means on (a sample of) the rows; returns ``lists`` unit-length centroids."""
+    rng = np.random.default_rng(seed)
+    sample = matrix[np.sort(rng.choice(matrix.shape[0], min(matrix.shape[0], 64 * lists), replace=False))]
+    centroids = sample[rng.choice(sample.shape[0], lists, replace=False)]
+    for _ in range(iterations):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        empty = ~sums.any(axis=1)
+        sums[empty] = centroids[empty]
+        centroids = normalize_rows(sums)
+    return centroids
+
+def assign_lists(matrix, centroids, chunk_size=4096):
+    return np.concatenate([
+        np.argmax(matrix[start:start + chunk_size] @ centroids.T, axis=1)
+        for start in range(0, matrix.shape[0], chunk_size)
+    ]) if matrix.shape[0] else np.zeros(0, dtype=int)
+
+class ClubVectors:
+    """One build of the club index: unit vectors grouped by IVF list, plus per-club signals."""
+
+    def __init__(self, version, backend, club_ids, matrix, centroids, offsets, recruiting, deadlines, skills, skill_terms):
+        self.version = version
+        self.backend = backend
+        self.club_ids = club_ids
+        self.matrix = matrix
+        self.centroids = centroids
+        self.offsets = offsets
+        self.recruiting = recruiting
+        self.deadlines = deadlines
+        self.skills = skills
+        self.skill_terms = skill_terms
+
+    @classmethod
+    def empty(cls, version, backend):
+        return cls(version, backend, [], None, None, None, None, None, None, {})
+
+    @classmethod
+    def build(cls, version, backend, vectors, signals, centroids=None):
+        """Group ``vectors`` ({club_id: row}) into IVF lists and attach ``signals`` (club_id -> row)."""
+        import scipy.sparse as sp
+        ids = sorted(vectors)
+        if not ids:
+            return cls.empty(version, backend)
+        matrix = np.vstack([vectors[club_id] for club_id in ids]).astype(np.float32)
+        lists = int(np.sqrt(len(ids)))
+        if centroids is None and len(ids) >= app.config['RECOMMENDATION_ANN_MIN_CLUBS']:
+            centroids = train_centroids(matrix, lists)
+        if centroids is not None and len(ids) >= app.config['RECOMMENDATION_ANN_MIN_CLUBS']:
+            assignment = assign_lists(matrix, centroids)
+            order = np.argsort(assignment, kind='stable')
+            offsets = np.searchsorted(assignment[order], np.arange(len(centroids) + 1))
+        else:
+            centroids, order, offsets = None, np.arange(len(ids)), np.array([0, len(ids)])
+        ids = [ids[i] for i in order]
+        skill_terms = {}
+        rows, columns, weights = [], [], []
+        for row, club_id in enumerate(ids):
+            required = split_terms(signals[club_id].skills_required)
+            for term in required:
+                rows.append(row)
+                columns.append(skill_terms.setdefault(term, len(skill_terms)))
+                weights.append(1 / len(required))
+        skills = sp.csr_matrix((weights, (rows, columns)), shape=(len(ids), max(1, len(skill_terms))), dtype=np.float32)
+        return cls(
+            version, backend, ids, matrix[order], centroids, offsets,
+            np.array([1.0 if signals[club_id].is_recruiting else 0.0 for club_id in ids], dtype=np.float32),
+            np.array([signals[club_id].deadline.toordinal() if signals[club_id].deadline else 0 for club_id in ids]),
+            skills, skill_terms,
+        )
+
+    def rows(self):
+        return dict(zip(self.club_ids, self.matrix)) if self.club_ids else {}
+
+    def score_candidates(self, query, top_n):
+        """``(rows, text scores)`` for the ``RECOMMENDATION_ANN_PROBES`` lists nearest ``query``."""
+        probes = top_n_indices(self.centroids @ query, app.config['RECOMMENDATION_ANN_PROBES'])
+        ranges = [(self.offsets[k], self.offsets[k + 1]) for k in probes]
+        if sum(stop - start for start, stop in ranges) < top_n:
+            return slice(None), self.matrix @ query
+        rows = np.concatenate([np.arange(start, stop) for start, stop in ranges])
+        return rows, np.concatenate([self.matrix[start:stop] @ query for start, stop in ranges])
+
+    def blend(self, text_scores, profile_skills, rows):
+        """Weighted mean of text similarity, required-skill coverage, recruiting and an open deadline, in [0, 1]."""
+        weights = app.config['RECOMMENDATION_WEIGHTS']
+        scores = weights['text'] * np.clip(np.atleast_2d(text_scores), 0, 1)
+        if weights['skills'] and self.skill_terms:
+            scores = scores + weights['skills'] * (profile_skills @ self.skills[rows].T).toarray()
+        scores = scores + weights['recruiting'] * self.recruiting[rows]
+        deadlines = self.deadlines[rows]
+        today = datetime.utcnow().date().toordinal()
+        scores = scores + weights['deadline'] * ((deadlines == 0) | (deadlines >= today))
+        # Clients show the score as a match percentage, so keep it on the same scale as the cosine.
+        return scores / (sum(weights.values()) or 1)
+
+    def profile_skills(self, skills):
+        import scipy.sparse as sp
+        rows, columns = [], []
+        for row, value in enumerate(skills):
+            for term in split_terms(value):
+                if term in self.skill_terms:
+                    rows.append(row)
+                    columns.append(self.skill_terms[term])
+        return sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)),
+                             shape=(len(skills), self.skills.shape[1]))
+
+def club_signals(club_ids=None):
+    query = db.session.query(Club.id, Club.tags, Club.description, Club.skills_required, Club.is_recruiting, Club.deadline)
+    if club_ids is not None:
+        query = query.filter(Club.id.in_(club_ids))
+    return {row.id: row for row in query.order_by(Club.id)}
+
+class RecommendationIndex:
+    """Club vectors built once per ``clubs`` version and shared by every worker through a memory-mapped file."""
+
+    def __init__(self):
+        self._state = ClubVectors.empty(None, None)
+        self._lock = threading.RLock()
+        self._local_changes = set()
+        self._local_bumps = 0
+        self._drift = 0
+
+    @property
+    def path(self):
+        return app.config['RECOMMENDATION_INDEX_PATH']
+
+    def mark_changed(self, club_id):
+        with self._lock:
+            self._local_changes.add(club_id)
+            self._local_bumps += 1
+
+    def refresh(self):
+        current = get_index_version('clubs')
+        backend_name = app.config['RECOMMENDATION_BACKEND']
+        if self._state.version == current and self._state.backend is not None and self._state.backend.name == backend_name:
+            return self._state
+        with self._lock:
+            state = self._state
+            if state.version == current and state.backend is not None and state.backend.name == backend_name:
+                return state
+            refit_limit = max(1, len(state.club_ids)) * app.config['RECOMMENDATION_REFIT_RATIO']
+            if (state.backend is not None and state.backend.name == backend_name and self._local_changes
+                    and state.version + self._local_bumps == current
+                    and (not state.backend.needs_fit or self._drift + len(self._local_changes) <= refit_limit)):
+                self._apply_local_changes(current)
+                self._save()
+            elif not self._load(current, backend_name):
+                self._rebuild(current, backend_name)
+            self._local_changes.clear()
+            self._local_bumps = 0
+            return self._state
+
+    def recommend(self, text, top_n=5, skills=None):
+        """Return ``(club_id, score)`` pairs for the clubs closest to ``text``."""
+        return self.recommend_many([text], top_n=top_n, skills=[skills])[0]
+
+    def recommend_many(self, texts, top_n=5, state=None, skills=None):
+        """Score a batch of profile texts (and their comma-separated ``skills``) against the clubs."""
+        state = state or self.refresh()
+        if not state.club_ids:
+            return [[] for _ in texts]
+        with timed('recommendation_score'):
+            queries = state.backend.transform(texts)
+            profile_skills = state.profile_skills(skills or [None] * len(texts))
+            if state.centroids is None:
+                # Exact scan: one dense product for the whole batch.
+                scores = state.blend(queries @ state.matrix.T, profile_skills, slice(None))
+                top = top_n_indices(scores, top_n)
+                return [
+                    [(state.club_ids[j], float(scores[i, j])) for j in top[i]]
+                    for i in range(len(texts))
+                ]
+            results = []
+            for i, query in enumerate(queries):
+                rows, text_scores = state.score_candidates(query, top_n)
+                scores = state.blend(text_scores, profile_skills[i], rows)[0]
+                row_ids = np.arange(len(state.club_ids))[rows]
+                results.append([(state.club_ids[row_ids[j]], float(scores[j])) for j in top_n_indices(scores, top_n)])
+            return results
+
+    def _apply_local_changes(self, version):
+        state = self._state
+        rows = state.rows()
+        signals = club_signals()
+        for club_id in self._local_changes:
+            rows.pop(club_id, None)
+        changed = [signals[club_id] for club_id in self._local_changes if club_id in signals]
+        if changed:
+            vectors = state.backend.transform([club_text(club.tags, club.description) for club in changed])
+            rows.update(zip((club.id for club in changed), vectors))
+        self._drift += len(self._local_changes)
+        self._state = ClubVectors.build(version, state.backend, rows, signals, state.centroids)
+
+    def _rebuild(self, version, backend_name):
+        with file_lock(self.path + '.lock'):
+            if self._load(version, backend_name):
+                return
+            signals = club_signals()
+            backend = RECOMMENDATION_BACKENDS[backend_name]()
+            texts = [club_text(club.tags, club.description) for club in signals.values()]
+            if texts:
+                backend.fit(texts)
+            vectors = dict(zip(signals, backend.transform(texts))) if texts else {}
+            self._state = ClubVectors.build(version, backend, vectors, signals)
+            self._drift = 0
+            self._save()
+
+    def _load(self, version, backend_name):
+        try:
+            with open(self.path, 'rb') as f:
+                saved = pickle.load(f)
+            state = saved['state']
+            if state.version != version or state.backend.name != backend_name:
+                return False
+            if saved['vectors']:
+                state.matrix = np.load(saved['vectors'], mmap_mode='r')
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError, ValueError):
+            return False
+        self._state = state
+        self._drift = saved['drift']
+        return True
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        state = self._state
+        vectors_path = None
+        if state.matrix is not None:
+            vectors_path = f"{self.path}.{state.version}-{os.getpid()}-{time.time_ns()}.npy"
+            np.save(vectors_path, np.ascontiguousarray(state.matrix))
+            state.matrix = np.load(vectors_path, mmap_mode='r')
+        saved = ClubVectors.__new__(ClubVectors)
+        saved.__dict__.update(state.__dict__, matrix=None)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'state': saved, 'vectors': vectors_path, 'drift': self._drift}, f)
+        os.replace(tmp_path, self.path)
+        # Workers still mapping an older file keep reading it until they reload; unlinking is safe.
+        directory, prefix = os.path.split(self.path)
+        for name in os.listdir(directory):
+            stale = os.path.join(directory, name)
+            if name.startswith(prefix + '.') and name.endswith('.npy') and stale != vectors_path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+recommendation_index = RecommendationIndex()
+
+@event.listens_for(Club, 'after_insert')
+@event.listens_for(Club, 'after_delete')
+def club_catalog_changed(mapper, connection, target):
+    bump_index_version(connection, 'clubs')
+    recommendation_index.mark_changed(target.id)
+
+RECOMMENDATION_CLUB_ATTRIBUTES = ('tags', 'description', 'skills_required', 'is_recruiting', 'deadline')
+
+@event.listens_for(Club, 'after_update')
+def club_text_changed(mapper, connection, target):
+    state = db.inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in RECOMMENDATION_CLUB_ATTRIBUTES):
+        bump_index_version(connection, 'clubs')
+        recommendation_index.mark_changed(target.id)
+
+def precompute_recommendations(top_k=5, chunk_size=None, user_ids=None):
+    """Store the top K clubs for every student (or ``user_ids``), ``chunk_size`` profiles at a time."""
+    chunk_size = chunk_size or app.config['RECOMMENDATION_BATCH_CHUNK_SIZE']
+    state = recommendation_index.refresh()
+    version = state.version
+    query = db.session.query(
+        StudentProfile.user_id, StudentProfile.major, StudentProfile.interests, StudentProfile.skills
+    ).order_by(StudentProfile.user_id)
+    if user_ids is not None:
+        query = query.filter(StudentProfile.user_id.in_(user_ids))
+
+    # Keyset over user_id rather than one long cursor, since each chunk commits.
+    written = 0
+    last_user_id = None
+    while True:
+        page = query if last_user_id is None else query.filter(StudentProfile.user_id > last_user_id)
+        chunk = page.limit(chunk_size).all()
+        if not chunk:
+            break
+        written += _store_recommendation_chunk(chunk, top_k, state, version)
+        last_user_id = chunk[-1].user_id
+    return written
+
+def _store_recommendation_chunk(profiles, top_k, state, version):
+    results = recommendation_index.recommend_many(
+        [profile_text(p.major, p.interests, p.skills) for p in profiles], top_n=top_k, state=state,
+        skills=[p.skills for p in profiles],
+    )
+    now = datetime.utcnow()
+    rows = [
+        {"student_id": profile.user_id, "rank": rank, "club_id": club_id,
+         "score": score, "index_version": version, "computed_at": now}
+        for profile, scored in zip(profiles, results)
+        for rank, (club_id, score) in enumerate(scored)
+    ]
+    student_ids = [profile.user_id for profile in profiles]
+    db.session.query(ClubRecommendation).filter(
+        ClubRecommendation.student_id.in_(student_ids)
+    ).delete(synchronize_session=False)
+    if rows:
+        db.session.execute(insert(ClubRecommendation), rows)
+    db.session.commit()
+    return len(profiles)
+
+def stored_recommendations(user_id, top_n):
+    """Fresh precomputed recommendations for ``user_id``, or ``None`` if there are none."""
+    oldest = datetime.utcnow() - app.config['RECOMMENDATION_RESULT_TTL']
+    rows = db.session.query(ClubRecommendation, Club).join(
+        Club, Club.id == ClubRecommendation.club_id
+    ).filter(
+        ClubRecommendation.student_id == user_id,
+        ClubRecommendation.index_version == get_index_version('clubs'),
+        ClubRecommendation.computed_at >= oldest,
+    ).order_by(ClubRecommendation.rank).limit(top_n).all()
+    if not rows:
+        return None
+    return [{
+        "id": club.id,
+        "name": club.name,
+        "description": club.description,
+        "score": stored.score
+    } for stored, club in rows]
+
+@app.cli.command('precompute-recommendations')
+@click.option('--top-k', default=5, show_default=True, help='Clubs to store per student.')
+@click.option('--chunk-size', default=None, type=int, help='Students scored per matrix product.')
+def precompute_recommendations_command(top_k, chunk_size):
+    """Precompute club recommendations for every student profile."""
+    written = precompute_recommendations(top_k=top_k, chunk_size=chunk_size)
+    click.echo(f"Stored recommendations for {written} students.")
+
+# --- Club Search ---
+
+# (source column, link model, owner column, term column, vocabulary model or None to store the name)
+CLUB_TERM_LINKS = (
+    (Club.tags, ClubTag, ClubTag.club_id, ClubTag.tag_id, Tag),
+    (Club.skills_required, ClubSkill, ClubSkill.club_id, ClubSkill.skill_id, Skill),
+    (Club.open_positions, ClubPosition, ClubPosition.club_id, ClubPosition.name, None),
+)
+PROFILE_TERM_LINKS = (
+    (StudentProfile.interests, StudentInterest, StudentInterest.user_id, StudentInterest.tag_id, Tag),
+    (StudentProfile.skills, StudentSkill, StudentSkill.user_id, StudentSkill.skill_id, Skill),
+)
+TERM_SYNC_CHUNK = 500
+
+def normalize_term(value):
+    return ' '.join(value.split()).lower()
+
+def split_terms(value):
+    """Distinct normalised terms of a comma-separated value, in order."""
+    terms = (normalize_term(term) for term in (value or '').split(','))
+    return list(dict.fromkeys(term for term in terms if term))
+
+def replace_term_links(connection, links, owner_ids, values):
+    """Rewrite the link rows of ``owner_ids`` from ``values`` ({owner id: {column key: csv}})."""
+    for source, link, owner_column, term_column, vocabulary in links:
+        connection.execute(link.__table__.delete().where(owner_column.in_(owner_ids)))
+        terms = {owner: split_terms(row[source.key]) for owner, row in values.items()}
+        names = {term for owner_terms in terms.values() for term in owner_terms}
+        if not names:
+            continue
+        if vocabulary is not None:
+            connection.execute(
+                insert_ignoring_duplicates(vocabulary, ['name'], connection.dialect.name),
+                [{'name': name} for name in names],
+            )
+            ids = dict(connection.execute(
+                select(vocabulary.name, vocabulary.id).where(vocabulary.name.in_(names))
+            ).all())
+        connection.execute(insert(link), [
+            {owner_column.key: owner, term_column.key: ids[term] if vocabulary is not None else term}
+            for owner, owner_terms in terms.items() for term in owner_terms
+        ])
+
+def _sync_terms(connection, owner_key, links, owner_ids):
+    if owner_ids is None:
+        owner_ids = connection.execute(select(owner_key).order_by(owner_key)).scalars().all()
+    sources = [link[0] for link in links]
+    for start in range(0, len(owner_ids), TERM_SYNC_CHUNK):
+        chunk = owner_ids[start:start + TERM_SYNC_CHUNK]
+        rows = connection.execute(select(owner_key, *sources).where(owner_key.in_(chunk))).all()
+        replace_term_links(connection, links, chunk, {row[0]: row._mapping for row in rows})
+
+def sync_club_terms(connection, club_ids=None):
+    """Rebuild the tag, skill and position links of ``club_ids`` (default: all) after non-ORM writes."""
+    _sync_terms(connection, Club.id, CLUB_TERM_LINKS, club_ids)
+
+def sync_profile_terms(connection, user_ids=None):
+    """Rebuild the interest and skill links of ``user_ids`` (default: every profile)."""
+    _sync_terms(connection, StudentProfile.user_id, PROFILE_TERM_LINKS, user_ids)
+
+def changed_term_links(target, links):
+    state = db.inspect(target)
+    return [link for link in links if state.attrs[link[0].key].history.has_changes()]
+
+@event.listens_for(Club, 'after_insert')
+@event.listens_for(Club, 'after_update')
+def club_terms_changed(mapper, connection, target):
+    links = changed_term_links(target, CLUB_TERM_LINKS)
+    if links:
+        values = {link[0].key: getattr(target, link[0].key) for link in links}
+        replace_term_links(connection, links, [target.id], {target.id: values})
+
+@event.listens_for(StudentProfile, 'after_insert')
+@event.listens_for(StudentProfile, 'after_update')
+def profile_terms_changed(mapper, connection, target):
+    links = changed_term_links(target, PROFILE_TERM_LINKS)
+    if links:
+        values = {link[0].key: getattr(target, link[0].key) for link in links}
+        replace_term_links(connection, links, [target.user_id], {target.user_id: values})
+
+@event.listens_for(Club, 'before_delete')
+def club_terms_deleted(mapper, connection, target):
+    replace_term_links(connection, CLUB_TERM_LINKS, [target.id], {})
+
+@event.listens_for(StudentProfile, 'before_delete')
+def profile_terms_deleted(mapper, connection, target):
+    replace_term_links(connection, PROFILE_TERM_LINKS, [target.user_id], {})
+
+SQLITE_CLUB_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS club_fts USING fts5(name, description, tags, content='club', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS club_fts_insert AFTER INSERT ON club BEGIN "
+    "INSERT INTO club_fts(rowid, name, description, tags) VALUES (new.id, new.name, new.description, new.tags); END",
+    "CREATE TRIGGER IF NOT EXISTS club_fts_delete AFTER DELETE ON club BEGIN "
+    "INSERT INTO club_fts(club_fts, rowid, name, description, tags) "
+    "VALUES ('delete', old.id, old.name, old.description, old.tags); END",
+    "CREATE TRIGGER IF NOT EXISTS club_fts_update AFTER UPDATE OF name, description, tags ON club BEGIN "
+    "INSERT INTO club_fts(club_fts, rowid, name, description, tags) "
+    "VALUES ('delete', old.id, old.name, old.description, old.tags); "
+    "INSERT INTO club_fts(rowid, name, description, tags) VALUES (new.id, new.name, new.description, new.tags); END",
+)
+
+POSTGRES_CLUB_FTS = (
+    "ALTER TABLE club ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(tags, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_club_search_vector ON club USING gin (search_vector)",
+)
+
+def setup_full_text_search(connection):
+    """Create the club full-text index (FTS5 on SQLite, a GIN ``tsvector`` on Postgres) if missing."""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        created = connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'club_fts'")).first() is None
+        for statement in SQLITE_CLUB_FTS:
+            connection.execute(text(statement))
+        if created:
+            connection.execute(text("INSERT INTO club_fts(club_fts) VALUES ('rebuild')"))
+    elif dialect == 'postgresql':
+        for statement in POSTGRES_CLUB_FTS:
+            connection.execute(text(statement))
+
+def search_words(value):
+    return re.findall(r'\w+', value.lower())
+
+def full_text_matches(words, dialect=None):
+    """Subquery of ``(club_id, rank)`` for clubs matching every word, the last one as a prefix."""
+    dialect = dialect or db.engine.dialect.name
+    if dialect == 'sqlite':
+        query = ' '.join(f'"{word}"' for word in words) + '*'
+        # bm25 is lower-is-better; weight name over tags over description.
+        statement = text(
+            "SELECT rowid AS club_id, -bm25(club_fts, 10.0, 1.0, 5.0) AS rank "
+            "FROM club_fts WHERE club_fts MATCH :query"
+        )
+    elif dialect == 'postgresql':
+        query = ' & '.join(words) + ':*'
+        statement = text(
+            "SELECT id AS club_id, ts_rank(search_vector, query) AS rank "
+            "FROM club, to_tsquery('english', :query) AS query WHERE search_vector @@ query"
+        )
+    else:
+        raise NotImplementedError(f"full-text search is not supported on {dialect}")
+    return statement.bindparams(query=query).columns(
+        club_id=db.Integer, rank=db.Float
+    ).subquery('text_matches')
+
+def term_matches(owner_column, term_column, vocabulary, names):
+    """Subquery of ``(owner_id, matches)``: how many of ``names`` each owner is linked to."""
+    return select(owner_column.label('owner_id'), func.count().label('matches')).join(
+        vocabulary, vocabulary.id == term_column
+    ).where(vocabulary.name.in_(names)).group_by(owner_column).subquery()
+
+# --- Club Statistics ---
+
+CLUB_DAILY_COLUMNS = ('applications', 'checkins', 'feedback', 'rated', 'rating_total')
+
+# table -> columns whose update moves a row between rollup buckets
+CLUB_STAT_SOURCES = {
+    'attendance': ('event_id', 'timestamp'),
+    'application': ('club_id', 'status', 'timestamp'),
+    'feedback': ('club_id', 'rating', 'timestamp'),
+}
+
+def sql_day(dialect, expression):
+    return f"date({expression})" if dialect == 'sqlite' else f"CAST({expression} AS date)"
+
+def club_stat_updates(dialect, table, row, sign):
+    """Upserts adding ``row`` (``NEW`` or ``OLD``) of ``table`` to the rollups, ``sign`` times."""
+    timestamp = f'{row}."timestamp"'
+    shard = f"{row}.id % {app.config['CLUB_STATS_SHARDS']}"
+    if table == 'attendance':
+        club, source = 'event.club_id', f"FROM event WHERE event.id = {row}.event_id AND"
+        daily = {'checkins': sign}
+        totals = {f"'event:' || {row}.event_id": sign}
+    elif table == 'application':
+        club, source = f"{row}.club_id", "WHERE"
+        daily = {'applications': sign}
+        totals = {f"'status:' || {row}.status": sign}
+    else:
+        club, source = f"{row}.club_id", "WHERE"
+        rated = f"CASE WHEN {row}.rating IS NULL THEN 0 ELSE {sign} END"
+        rating = f"{sign} * COALESCE({row}.rating, 0)"
+        daily = {'feedback': sign, 'rated': rated, 'rating_total': rating}
+        totals = {"'feedback'": sign, "'rated'": rated, "'rating_total'": rating}
+    statements = [
+        f"INSERT INTO club_daily_stat (club_id, day, shard, {', '.join(CLUB_DAILY_COLUMNS)}) "
+        f"SELECT {club}, {sql_day(dialect, timestamp)}, {shard}, {', '.join(str(daily.get(c, 0)) for c in CLUB_DAILY_COLUMNS)} "
+        f"{source} {timestamp} IS NOT NULL ON CONFLICT (club_id, day, shard) DO UPDATE SET "
+        + ', '.join(f"{c} = club_daily_stat.{c} + excluded.{c}" for c in CLUB_DAILY_COLUMNS)
+    ]
+    for metric, value in totals.items():
+        statements.append(
+            f"INSERT INTO club_stat_total (club_id, metric, shard, value) SELECT {club}, {metric}, {shard}, {value} "
+            f"{source} 1 = 1 ON CONFLICT (club_id, metric, shard) DO UPDATE SET value = club_stat_total.value + excluded.value"
+        )
+    return statements
+
+def club_stat_trigger_names(dialect, table):
+    if dialect == 'sqlite':
+        return [f"{table}_stats_insert", f"{table}_stats_delete", f"{table}_stats_update"]
+    return [f"{table}_stats"]
+
+def club_stats_installed(session):
+    """Whether every trigger that maintains the rollups exists in the database behind ``session``."""
+    dialect = session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        found = session.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars()
+    elif dialect == 'postgresql':
+        found = session.execute(text("SELECT tgname FROM pg_trigger")).scalars()
+    else:
+        return False
+    return {name for table in CLUB_STAT_SOURCES for name in club_stat_trigger_names(dialect, table)} <= set(found)
+
+def club_stat_triggers(dialect):
+    """DDL for the triggers that apply every attendance, application and feedback write to the rollups."""
+    statements = []
+    for table, columns in CLUB_STAT_SOURCES.items():
+        added = club_stat_updates(dialect, table, 'NEW', 1)
+        removed = club_stat_updates(dialect, table, 'OLD', -1)
+        columns = ', '.join(f'"{column}"' for column in columns)
+        if dialect == 'sqlite':
+            statements += [f"DROP TRIGGER IF EXISTS {name}" for name in club_stat_trigger_names(dialect, table)]
+            statements += [
+                f"CREATE TRIGGER {table}_stats_insert AFTER INSERT ON {table} BEGIN "
+                + ''.join(f"{statement}; " for statement in added) + "END",
+                f"CREATE TRIGGER {table}_stats_delete AFTER DELETE ON {table} BEGIN "
+                + ''.join(f"{statement}; " for statement in removed) + "END",
+                f"CREATE TRIGGER {table}_stats_update AFTER UPDATE OF {columns} ON {table} BEGIN "
+                + ''.join(f"{statement}; " for statement in removed + added) + "END",
+            ]
+        else:
+            statements += [
+                f"CREATE OR REPLACE FUNCTION {table}_stats() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+                "IF TG_OP <> 'INSERT' THEN " + ''.join(f"{statement}; " for statement in removed) + "END IF; "
+                "IF TG_OP <> 'DELETE' THEN " + ''.join(f"{statement}; " for statement in added) + "END IF; "
+                "RETURN NULL; END $$",
+                f"DROP TRIGGER IF EXISTS {table}_stats ON {table}",
+                f"CREATE TRIGGER {table}_stats AFTER INSERT OR DELETE OR UPDATE OF {columns} ON {table} "
+                f"FOR EACH ROW EXECUTE FUNCTION {table}_stats()",
+            ]
+    return statements
+
+def rebuild_club_stats(connection):
+    """Recompute both rollup tables from the source rows."""
+    dialect = connection.dialect.name
+    application_day = sql_day(dialect, 'application."timestamp"')
+    attendance_day = sql_day(dialect, 'attendance."timestamp"')
+    feedback_day = sql_day(dialect, 'feedback."timestamp"')
+    connection.execute(ClubDailyStat.__table__.delete())
+    connection.execute(ClubStatTotal.__table__.delete())
+    connection.execute(text(
+        f"INSERT INTO club_daily_stat (club_id, day, shard, {', '.join(CLUB_DAILY_COLUMNS)}) "
+        f"SELECT club_id, day, 0, {', '.join(f'SUM({c})' for c in CLUB_DAILY_COLUMNS)} FROM ("
+        f"SELECT club_id, {application_day} AS day, 1 AS applications, 0 AS checkins, 0 AS feedback, "
+        f'0 AS rated, 0 AS rating_total FROM application WHERE application."timestamp" IS NOT NULL '
+        f"UNION ALL SELECT event.club_id, {attendance_day}, 0, 1, 0, 0, 0 "
+        f'FROM attendance JOIN event ON event.id = attendance.event_id WHERE attendance."timestamp" IS NOT NULL '
+        f"UNION ALL SELECT club_id, {feedback_day}, 0, 0, 1, CASE WHEN rating IS NULL THEN 0 ELSE 1 END, "
+        f'COALESCE(rating, 0) FROM feedback WHERE feedback."timestamp" IS NOT NULL'
+        f") AS source_rows GROUP BY club_id, day"
+    ))
+    connection.execute(text(
+        "INSERT INTO club_stat_total (club_id, metric, shard, value) "
+        "SELECT club_id, 'status:' || status, 0, COUNT(*) FROM application GROUP BY club_id, status "
+        "UNION ALL SELECT event.club_id, 'event:' || attendance.event_id, 0, COUNT(*) "
+        "FROM attendance JOIN event ON event.id = attendance.event_id GROUP BY event.club_id, attendance.event_id "
+        "UNION ALL SELECT club_id, 'feedback', 0, COUNT(*) FROM feedback GROUP BY club_id "
+        "UNION ALL SELECT club_id, 'rated', 0, COUNT(rating) FROM feedback GROUP BY club_id "
+        "UNION ALL SELECT club_id, 'rating_total', 0, COALESCE(SUM(rating), 0) FROM feedback GROUP BY club_id"
+    ))
+
+def setup_club_stats(connection):
+    """Create the statistics triggers, and fill the rollups if they are still empty."""
+    if connection.dialect.name not in ('sqlite', 'postgresql'):
+        return
+    for statement in club_stat_triggers(connection.dialect.name):
+        connection.execute(text(statement))
+    if connection.execute(select(ClubStatTotal.club_id).limit(1)).first() is None:
+        rebuild_club_stats(connection)
+
+@event.listens_for(db.metadata, 'after_create')
+def create_club_stat_triggers(metadata, connection, tables=(), **kw):
+    # So a database made with db.create_all() keeps its statistics too, not only one made by upgrade_schema().
+    if ClubStatTotal.__table__ in tables:
+        setup_club_stats(connection)
+
+@app.cli.command('rebuild-club-stats')
+def rebuild_club_stats_command():
+    """Recompute the per-club statistics from applications, attendance and feedback."""
+    with db.engine.begin() as connection:
+        rebuild_club_stats(connection)
+    click.echo("Club statistics rebuilt.")
+
+# --- Check-in Fast Path ---
+
+class EventKeyCache:
+    """In-memory ``qr_code_key -> (event_id, event_name, club_id)`` lookups with a TTL."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry and entry[1] > now:
+                    found[key] = entry[0]
+        missing = [key for key in set(keys) if key not in found]
+        if missing:
+            rows = db.session.query(Event.qr_code_key, Event.id, Event.name, Event.club_id).filter(
+                Event.qr_code_key.in_(missing)
+            ).all()
+            expires = now + app.config['EVENT_KEY_CACHE_TTL']
+            with self._lock:
+                for key, event_id, name, club_id in rows:
+                    found[key] = (event_id, name, club_id)
+                    self._entries[key] = (found[key], expires)
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def peek(self, key):
+        """Cached entry for ``key`` without falling back to the database."""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry and entry[1] > time.monotonic() else None
+
+    def put(self, key, event_id, name, club_id):
+        with self._lock:
+            self._entries[key] = ((event_id, name, club_id), time.monotonic() + app.config['EVENT_KEY_CACHE_TTL'])
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+event_key_cache = EventKeyCache()
+
+@event.listens_for(Event, 'after_update')
+@event.listens_for(Event, 'after_delete')
+def event_key_changed(mapper, connection, target):
+    history = db.inspect(target).attrs.qr_code_key.history
+    for key in list(history.deleted or []) + [target.qr_code_key]:
+        event_key_cache.invalidate(key)
+
+def insert_ignoring_duplicates(model, index_elements, dialect=None):
+    """``INSERT ... ON CONFLICT DO NOTHING`` for ``dialect`` (default: the app's database)."""
+    dialect = dialect or db.engine.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        raise NotImplementedError(f"insert-or-ignore is not supported on {dialect}")
+    return dialect_insert(model).on_conflict_do_nothing(index_elements=index_elements)
+
+def attendance_insert(event_id, user_id, timestamp, dialect=None):
+    """One-statement check-in insert; returns a row only if the user exists and the row is new."""
+    source = select(literal(event_id), literal(user_id), literal(timestamp)).where(
+        exists().where(User.id == user_id)
+    )
+    return insert_ignoring_duplicates(Attendance, ['event_id', 'student_id'], dialect).from_select(
+        ['event_id', 'student_id', 'timestamp'], source
+    ).returning(Attendance.id)
+
+def record_attendance(event_id, user_id, timestamp=None):
+    """Insert one check-in; returns False if it was a duplicate or the user doesn't exist."""
+    stmt = attendance_insert(event_id, user_id, timestamp or datetime.utcnow())
+    return db.session.execute(stmt).first() is not None
+
+def attendance_recorded(event_id, club_id, user_id, timestamp):
+    """Update in-memory state and notify subscribers after a check-in has been committed."""
+    buzz_engine.record(club_id, timestamp)
+    checkin = {"event_id": event_id, "club_id": club_id, "student_id": user_id, "timestamp": timestamp.isoformat()}
+    event_broker.publish('buzz', {"club_id": club_id, "checkins": 1, "timestamp": checkin["timestamp"]})
+    event_broker.publish(f'event:{event_id}:attendance', checkin)
+    event_broker.publish(f'club:{club_id}:attendance', checkin)
+
+def record_attendance_batch(rows):
+    """Insert many ``{event_id, student_id, timestamp}`` rows; returns the inserted pairs."""
+    if not rows:
+        return set()
+    stmt = insert_ignoring_duplicates(Attendance, ['event_id', 'student_id']).returning(
+        Attendance.event_id, Attendance.student_id
+    )
+    return {tuple(row) for row in db.session.execute(stmt, rows)}
+
+# --- Buzz Engine ---
+
+def epoch_minute(timestamp):
+    return int((timestamp - datetime(1970, 1, 1)).total_seconds() // 60)
+
+class BuzzEngine:
+    """Sliding-window check-in counts per club in a ``clubs x minutes`` ring buffer."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._names = {}
+        self._counts = None
+        self._minutes = None
+        self._results = {}
+        self._synced_at = None
+        self._resyncing = False
+
+    @property
+    def size(self):
+        return max(app.config['BUZZ_WINDOWS'].values())
+
+    def record(self, club_id, timestamp, count=1):
+        minute = epoch_minute(timestamp)
+        with self._lock:
+            if self._counts is None:
+                return
+            self._record(club_id, minute, count)
+            self._results.clear()
+
+    def _record(self, club_id, minute, count):
+        now_minute = epoch_minute(datetime.utcnow())
+        if minute <= now_minute - self.size:
+            return
+        # A slot holding a future minute would block (and a later clear would drop) the live counts.
+        minute = min(minute, now_minute)
+        row = self._rows.get(club_id)
+        if row is None:
+            row = self._rows[club_id] = len(self._rows)
+            if row >= self._counts.shape[0]:
+                grown = np.zeros((max(16, row * 2), self.size), dtype=np.int64)
+                grown[:self._counts.shape[0]] = self._counts
+                self._counts = grown
+        slot = minute % self.size
+        if self._minutes[slot] != minute:
+            if self._minutes[slot] > minute:
+                return
+            self._minutes[slot] = minute
+            self._counts[:, slot] = 0
+        self._counts[row, slot] += count
+
+    def set_club_name(self, club_id, name):
+        with self._lock:
+            self._names[club_id] = name
+            self._results.clear()
+
+    def scores(self, window_minutes):
+        """``[(club_name, score)]`` for clubs with check-ins in the window, busiest first."""
+        if self._synced_at is None:
+            self.rebuild()
+        elif time.monotonic() - self._synced_at > app.config['BUZZ_RESYNC_SECONDS']:
+            self._resync_in_background()
+
+        now_minute = epoch_minute(datetime.utcnow())
+        with self._lock:
+            cached = self._results.get(window_minutes)
+            if cached and cached[0] == now_minute:
+                return cached[1]
+            in_window = (self._minutes > now_minute - window_minutes) & (self._minutes <= now_minute)
+            totals = self._counts[:, in_window].sum(axis=1)
+            by_name = {}
+            for club_id, row in self._rows.items():
+                name = self._names.get(club_id)
+                if totals[row] and name is not None:
+                    by_name[name] = by_name.get(name, 0) + int(totals[row])
+            result = sorted(by_name.items(), key=lambda item: item[1], reverse=True)
+            self._results[window_minutes] = (now_minute, result)
+            return result
+
+    def rebuild(self):
+        """Reload counts for the longest window from the Attendance table."""
+        since = datetime.utcnow() - timedelta(minutes=self.size)
+        names = dict(read_db().query(Club.id, Club.name).all())
+        rows = read_db().query(Event.club_id, Attendance.timestamp).join(
+            Attendance, Attendance.event_id == Event.id
+        ).filter(Attendance.timestamp >= since).yield_per(10000)
+
+        with self._lock:
+            self._rows = {}
+            self._counts = np.zeros((max(16, len(names)), self.size), dtype=np.int64)
+            self._minutes = np.full(self.size, -1, dtype=np.int64)
+            for club_id, timestamp in rows:
+                self._record(club_id, epoch_minute(timestamp), 1)
+            self._names = names
+            self._results.clear()
+            self._synced_at = time.monotonic()
+
+    def _resync_in_background(self):
+        with self._lock:
+            if self._resyncing:
+                return
+            self._resyncing = True
+
+        def resync():
+            try:
+                with app.app_context():
+                    self.rebuild()
+            finally:
+                self._resyncing = False
+
+        threading.Thread(target=resync, daemon=True).start()
+
+buzz_engine = BuzzEngine()
+
+@event.listens_for(Club, 'after_insert')
+@event.listens_for(Club, 'after_update')
+def club_name_changed(mapper, connection, target):
+    buzz_engine.set_club_name(target.id, target.name)
+
+# --- QR Code Rendering ---
+
+QR_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+@timed('qr_render')
+def render_qr(qr_code_key, box_size=10, border=4, fmt='png'):
+    import qrcode
+    import qrcode.image.svg
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(qr_code_key)
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    if fmt == 'svg':
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def qr_etag(cache_key):
+    return hashlib.sha1(repr(cache_key).encode('utf-8')).hexdigest()
+
+class QRImageCache:
+    """LRU of rendered QR images, optionally backed by files in ``QR_CACHE_DIR``."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, cache_key):
+        with self._lock:
+            image = self._entries.get(cache_key)
+            if image is not None:
+                self._entries.move_to_end(cache_key)
+                return image
+
+        path = self._disk_path(cache_key)
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                image = f.read()
+        else:
+            image = single_flight.do(('qr',) + cache_key, lambda: render_qr(*cache_key))
+            if path:
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(image)
+                os.replace(tmp_path, path)
+        self._put(cache_key, image)
+        return image
+
+    def _put(self, cache_key, image):
+        max_bytes = app.config['QR_CACHE_MAX_BYTES']
+        with self._lock:
+            if cache_key in self._entries or len(image) > max_bytes:
+                return
+            self._entries[cache_key] = image
+            self._size += len(image)
+            while self._size > max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _disk_path(self, cache_key):
+        cache_dir = app.config['QR_CACHE_DIR']
+        if not cache_dir:
+            return None
+        os.makedirs(cache_dir, exist_ok=True)
+        return os.path.join(cache_dir, f"{qr_etag(cache_key)}.{cache_key[3]}")
+
+qr_image_cache = QRImageCache()
+
+def qr_options():
+    """Validated ``(box_size, border, format)`` from the query string."""
+    box_size = request.args.get('box_size', 10, type=int)
+    border = request.args.get('border', 4, type=int)
+    fmt = request.args.get('format', 'png').lower()
+    if not 1 <= box_size <= 40:
+        raise ValueError("box_size must be between 1 and 40")
+    if not 0 <= border <= 20:
+        raise ValueError("border must be between 0 and 20")
+    if fmt not in QR_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(QR_FORMATS)}")
+    return box_size, border, fmt
+
+# --- Response Cache ---
+
+class InProcessCacheBackend:
+    """TTL + LRU cache local to one worker process."""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Kept apart from the LRU: evicting a tag generation would make stale entries current again.
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+class FileCacheBackend:
+    """Cache shared by every worker on one host through files; stands in for a store such as Redis."""
+
+    PRUNE_EVERY = 500
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.counter_directory = os.path.join(directory, 'counters')
+        os.makedirs(self.counter_directory, exist_ok=True)
+        self._writes = 0
+
+    def _path(self, key, directory=None):
+        return os.path.join(directory or self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    @staticmethod
+    def _write(path, value):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f)
+        os.replace(tmp_path, path)
+
+    def get(self, key):
+        if key.startswith('tag:'):
+            return self._read(self._path(key, self.counter_directory))
+        entry = self._read(self._path(key))
+        if entry is None or entry[0] < time.time():
+            return None
+        return entry[1]
+
+    def set(self, key, value, ttl):
+        self._write(self._path(key), (time.time() + ttl, value))
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self._prune(ttl)
+
+    def incr(self, key):
+        path = self._path(key, self.counter_directory)
+        with file_lock(os.path.join(self.counter_directory, 'counters.lock')):
+            value = (self._read(path) or 0) + 1
+            self._write(path, value)
+        return value
+
+    def _prune(self, ttl):
+        oldest = time.time() - ttl
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < oldest:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+class ResponseCache:
+    """Caches whole GET responses; bumping a tag's generation invalidates every entry that uses it."""
+
+    def __init__(self):
+        self._backend = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            if app.config['RESPONSE_CACHE_BACKEND'] == 'filesystem':
+                self._backend = FileCacheBackend(app.config['RESPONSE_CACHE_DIR'])
+            else:
+                self._backend = InProcessCacheBackend(app.config['RESPONSE_CACHE_MAX_ENTRIES'])
+        return self._backend
+
+    def invalidate(self, tags):
+        for tag in tags:
+            self.backend.incr(f"tag:{tag}")
+
+    def key(self, tags):
+        """Cache key for the current request, given the tags its response depends on."""
+        generations = [f"{tag}={self.backend.get(f'tag:{tag}') or 0}" for tag in tags]
+        return f"response:{request.full_path}:{','.join(generations)}"
+
+    def store(self, key, response):
+        """Cache a successful response; returns the entry, or ``None`` if it isn't cacheable."""
+        if response.status_code != 200:
+            return None
+        body = response.get_data()
+        entry = {
+            "body": body,
+            "mimetype": response.mimetype,
+            "headers": {k: v for k, v in response.headers.items() if k in ('X-Next-Cursor', 'Link')},
+            "etag": hashlib.sha1(body).hexdigest(),
+            "last_modified": datetime.utcnow().replace(microsecond=0),
+        }
+        self.backend.set(key, entry, app.config['RESPONSE_CACHE_TTL'])
+        return entry
+
+    def respond(self, entry):
+        response = Response(entry["body"], mimetype=entry["mimetype"], headers=entry["headers"])
+        response.set_etag(entry["etag"])
+        response.last_modified = entry["last_modified"]
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+
+    def cached(self, tags):
+        """Decorator; ``tags`` maps the view's keyword arguments to a list of tag names."""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(**kwargs):
+                key = self.key(tags(**kwargs))
+                entry = self.backend.get(key)
+                if entry is None:
+                    def compute():
+                        response = make_response(view(**kwargs))
+                        return self.store(key, response) or freeze_response(response)
+                    # Concurrent misses for the same key wait for one render instead of each running the query.
+                    entry = single_flight.do(key, compute)
+                    if isinstance(entry, tuple):
+                        return thaw_response(entry)
+                return self.respond(entry)
+            return wrapper
+        return decorator
+
+response_cache = ResponseCache()
+
+def queue_invalidation(target, tags):
+    session = db.object_session(target)
+    if session is not None:
+        session.info.setdefault('invalidated_tags', set()).update(tags)
+
+@event.listens_for(Club, 'after_insert')
+@event.listens_for(Club, 'after_update')
+@event.listens_for(Club, 'after_delete')
+def club_responses_changed(mapper, connection, target):
+    coordinators = set(db.inspect(target).attrs.coordinator_id.history.deleted or []) | {target.coordinator_id}
+    queue_invalidation(target, ['clubs', 'events', f'club_events:{target.id}']
+                       + [f'coordinator:{coordinator_id}' for coordinator_id in coordinators])
+
+@event.listens_for(Event, 'after_insert')
+@event.listens_for(Event, 'after_update')
+@event.listens_for(Event, 'after_delete')
+def event_responses_changed(mapper, connection, target):
+    club_ids = set(db.inspect(target).attrs.club_id.history.deleted or []) | {target.club_id}
+    queue_invalidation(target, ['events'] + [f'club_events:{club_id}' for club_id in club_ids])
+
+@event.listens_for(db.session, 'after_commit')
+def invalidate_committed_responses(session):
+    tags = session.info.pop('invalidated_tags', None)
+    if tags:
+        response_cache.invalidate(tags)
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def discard_rolled_back_invalidations(session, previous_transaction):
+    session.info.pop('invalidated_tags', None)
+
+# --- Request Coalescing ---
+
+class SingleFlight:
+    """Lets concurrent callers for one key share a single run of ``fn``, result or exception."""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        if not app.config['COALESCE_REQUESTS']:
+            return fn()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {'done': threading.Event()}
+        if not leader:
+            call['done'].wait()
+            COALESCED_REQUESTS.inc(request_route() if has_request_context() else 'none')
+            if 'error' in call:
+                raise call['error']
+            return call['result']
+        try:
+            call['result'] = fn()
+            return call['result']
+        except BaseException as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+
+single_flight = SingleFlight()
+
+def freeze_response(response):
+    """``(body, status, headers)`` of a buffered response, safe to hand to other requests."""
+    return response.get_data(), response.status_code, list(response.headers.items())
+
+def thaw_response(frozen):
+    body, status, headers = frozen
+    return Response(body, status=status, headers=headers)
+
+def coalesced(view):
+    """Share one run of a GET view between concurrent requests for the same URL."""
+    @wraps(view)
+    def wrapper(**kwargs):
+        return thaw_response(single_flight.do(
+            ('view', request.method, request.full_path), lambda: freeze_response(make_response(view(**kwargs)))
+        ))
+    return wrapper
+
+# --- Rate Limiting ---
+
+class InProcessRateLimitStore:
+    """LRU-bounded token buckets local to one worker process."""
+
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, now):
+        """Spend one token from ``key``'s bucket; returns ``(allowed, tokens left, seconds until a token)``."""
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, tokens, 0 if allowed else (1 - tokens) / rate
+
+class SqliteRateLimitStore:
+    """Token buckets in a SQLite file shared by every worker on one host."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")  # buckets are disposable
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS bucket (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def take(self, key, rate, burst, now):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT tokens, updated FROM bucket WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row or (burst, now)
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            connection.execute("INSERT OR REPLACE INTO bucket (key, tokens, updated) VALUES (?, ?, ?)",
+                               (key, tokens, now))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return allowed, tokens, 0 if allowed else (1 - tokens) / rate
+
+class RateLimiter:
+    """Per-endpoint token buckets from ``RATE_LIMITS``, checked before the view runs."""
+
+    def __init__(self):
+        self._store = None
+
+    @property
+    def store(self):
+        if self._store is None:
+            if app.config['RATE_LIMIT_STORE'] == 'sqlite':
+                self._store = SqliteRateLimitStore(app.config['RATE_LIMIT_STORE_PATH'])
+            else:
+                self._store = InProcessRateLimitStore(app.config['RATE_LIMIT_MAX_KEYS'])
+        return self._store
+
+    @store.setter
+    def store(self, store):
+        self._store = store
+
+    @staticmethod
+    def client_key():
+        """The authenticated user set on ``g.user_id`` by an auth layer, else the client address."""
+        # Ids in the URL are unauthenticated, so keying on them would let a client dodge the limit
+        # by cycling ids, or lock a student out by spamming theirs.
+        user_id = g.get('user_id')
+        return f"user:{user_id}" if user_id is not None else f"addr:{request.remote_addr}"
+
+    def check(self):
+        """A 429 response if the current request is over its endpoint's limit, else ``None``."""
+        limit = app.config['RATE_LIMITS'].get(request.endpoint)
+        if limit is None:
+            return None
+        allowed, tokens, retry_after = self.store.take(
+            f"{request.endpoint}:{self.client_key()}", limit['per_minute'] / 60, limit['burst'], time.time()
+        )
+        g.rate_limit = (limit['burst'], int(tokens))
+        if allowed:
+            return None
+        RATE_LIMITED_REQUESTS.inc(request_route())
+        response = jsonify({"message": "Too many requests. Please slow down."})
+        response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+        return response, 429
+
+rate_limiter = RateLimiter()
+
+if app.config['TRUSTED_PROXIES']:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['TRUSTED_PROXIES'],
+                            x_proto=app.config['TRUSTED_PROXIES'])
+
+@app.before_request
+def enforce_rate_limit():
+    if app.config['RATE_LIMIT_ENABLED']:
+        return rate_limiter.check()
+
+@app.after_request
+def add_rate_limit_headers(response):
+    if 'rate_limit' in g:
+        response.headers['X-RateLimit-Limit'] = str(g.rate_limit[0])
+        response.headers['X-RateLimit-Remaining'] = str(g.rate_limit[1])
+    return response
+
+# --- Live Updates ---
+
+APPLICATION_STATUSES = ('pending', 'accepted', 'rejected')
+
+TOPIC_PATTERN = re.compile(r'^(buzz|event:\d+:attendance|club:\d+:(attendance|applications)|student:\d+:applications)$')
+
+def parse_topics(value):
+    """Validate a comma-separated ``?topics=`` value; raises ``ValueError``."""
+    topics = set(split_csv(value)) - {''}
+    if not topics:
+        raise ValueError("topics is required")
+    if len(topics) > app.config['STREAM_MAX_TOPICS']:
+        raise ValueError(f"At most {app.config['STREAM_MAX_TOPICS']} topics per stream")
+    unknown = sorted(t for t in topics if not TOPIC_PATTERN.match(t))
+    if unknown:
+        raise ValueError(f"Unknown topic(s): {', '.join(unknown)}")
+    return topics
+
+def format_sse(message):
+    message_id, topic, data = message
+    return f"id: {message_id}\nevent: {topic}\ndata: {json.dumps(data)}\n\n"
+
+class Subscription:
+    """One client's bounded inbox, read from a request thread."""
+
+    def __init__(self, topics):
+        self.topics = topics
+        self.closed = False
+        self._queue = queue.Queue(app.config['STREAM_MAX_PENDING'])
+
+    def deliver(self, message):
+        """Called by the broker under its lock; returns False if the inbox is full."""
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self):
+        self.closed = True
+
+    def get(self, timeout):
+        """The next message, or None after ``timeout`` seconds without one."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class EventBroker:
+    """In-process pub/sub; lagging subscribers are dropped and can replay via ``Last-Event-ID``."""
+
+    def __init__(self):
+        self._subscribers = {}  # topic -> set of subscriptions
+        self._history = deque(maxlen=app.config['STREAM_HISTORY'])
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def subscribe(self, subscription, last_event_id=None):
+        with self._lock:
+            for topic in subscription.topics:
+                self._subscribers.setdefault(topic, set()).add(subscription)
+            if last_event_id is not None:
+                for message in self._history:
+                    if message[0] > last_event_id and message[1] in subscription.topics:
+                        subscription.deliver(message)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._unsubscribe(subscription)
+
+    def _unsubscribe(self, subscription):
+        for topic in subscription.topics:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def publish(self, topic, data):
+        with self._lock:
+            message = (self._next_id, topic, data)
+            self._next_id += 1
+            self._history.append(message)
+            for subscription in list(self._subscribers.get(topic, ())):
+                if not subscription.deliver(message):
+                    self._unsubscribe(subscription)
+                    subscription.close()
+
+event_broker = EventBroker()
+
+def queue_publication(target, topic, data):
+    session = db.object_session(target)
+    if session is not None:
+        session.info.setdefault('pending_publications', []).append((topic, data))
+
+def queue_application_status(target):
+    data = {"application_id": target.id, "student_id": target.student_id, "club_id": target.club_id,
+            "status": target.status}
+    queue_publication(target, f'club:{target.club_id}:applications', data)
+    queue_publication(target, f'student:{target.student_id}:applications', data)
+
+@event.listens_for(Application, 'after_insert')
+def application_created(mapper, connection, target):
+    # Unconditional: a status filled in by the column default leaves no attribute history.
+    queue_application_status(target)
+
+@event.listens_for(Application, 'after_update')
+def application_status_changed(mapper, connection, target):
+    if db.inspect(target).attrs.status.history.has_changes():
+        queue_application_status(target)
+
+@event.listens_for(db.session, 'after_commit')
+def publish_committed_messages(session):
+    for topic, data in session.info.pop('pending_publications', ()):
+        event_broker.publish(topic, data)
+
+@event.listens_for(db.session, 'after_soft_rollback')
+def discard_rolled_back_messages(session, previous_transaction):
+    session.info.pop('pending_publications', None)
+
+# --- Write-Behind Queue ---
+
+def write_key(record):
+    if record['kind'] == 'attendance':
+        return ('attendance', record['event_id'], record['student_id'])
+    return ('application', record['student_id'], record['club_id'])
+
+class WriteQueueFull(Exception):
+    pass
+
+class WriteBehindQueue:
+    """Acknowledges check-ins and applications once fsync'd to a local log, then inserts them in batches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._sync_lock = threading.Lock()  # taken before _lock, never after
+        self._flush_lock = threading.Lock()
+        self._pending = []  # (key, record) in log order
+        self._keys = set()
+        self._log = None
+        self._written = 0
+        self._synced = 0
+        self._started = False
+        self.available = False
+
+    def start(self):
+        """Take the log and replay it on first use; returns whether write-behind is on in this process."""
+        with self._lock:
+            if self._started:
+                return self.available
+            self._started = True
+            if not app.config['WRITE_BEHIND_ENABLED']:
+                return False
+            path = app.config['WRITE_BEHIND_LOG_PATH']
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            log = open(path, 'a+')
+            try:
+                import fcntl
+                fcntl.flock(log, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except ImportError:
+                pass
+            except OSError:
+                log.close()
+                app.logger.warning("Write-behind log %s is held by another process; writing synchronously", path)
+                return False
+            log.seek(0)
+            for line in log:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn by a crash before its fsync, so it was never acknowledged
+                key = write_key(record)
+                if key not in self._keys:
+                    self._keys.add(key)
+                    self._pending.append((key, record))
+            self._log = log
+            self._rewrite_log()
+            self.available = True
+        if self._pending:
+            app.logger.info("Replaying %d write-behind records from %s", len(self._pending), path)
+        threading.Thread(target=self._run, name='write-behind', daemon=True).start()
+        return True
+
+    def submit(self, record):
+        """Durably queue ``record``; returns False if the same write is already pending."""
+        key = write_key(record)
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            if key in self._keys:
+                return False
+            if len(self._pending) >= app.config['WRITE_BEHIND_MAX_PENDING']:
+                raise WriteQueueFull()
+            self._log.write(line)
+            self._log.flush()
+            self._keys.add(key)
+            self._pending.append((key, record))
+            self._written += 1
+            written = self._written
+            if len(self._pending) >= app.config['WRITE_BEHIND_BATCH_SIZE']:
+                self._wakeup.notify()
+        if app.config['WRITE_BEHIND_FSYNC']:
+            self._sync(written)
+        return True
+
+    def _sync(self, written):
+        with self._sync_lock:
+            if self._synced >= written:
+                return  # another writer's fsync already covered this line
+            with self._lock:
+                target, log = self._written, self._log
+            os.fsync(log.fileno())
+            self._synced = target
+
+    def _rewrite_log(self):
+        """Replace the log with the pending records; callers hold ``_lock`` (and ``_sync_lock`` once running)."""
+        path = app.config['WRITE_BEHIND_LOG_PATH']
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as tmp:
+            tmp.writelines(json.dumps(record) + '\n' for _, record in self._pending)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        log = open(tmp_path, 'a+')
+        try:
+            import fcntl
+            fcntl.flock(log, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except ImportError:
+            pass
+        os.replace(tmp_path, path)
+        self._log.close()
+        self._log = log
+        self._synced = self._written
+
+    def _run(self):
+        interval = app.config['WRITE_BEHIND_FLUSH_INTERVAL']
+        while True:
+            with self._lock:
+                if len(self._pending) < app.config['WRITE_BEHIND_BATCH_SIZE']:
+                    self._wakeup.wait(interval)
+            try:
+                with app.app_context():
+                    self.flush()
+            except Exception:
+                app.logger.exception("Write-behind flush failed; retrying")
+                time.sleep(interval)
+
+    def flush(self):
+        """Write everything pending to the database, one transaction per batch."""
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self._pending[:app.config['WRITE_BEHIND_BATCH_SIZE']]
+                if not batch:
+                    return
+                with timed('write_behind_flush'):
+                    attendance, applications = self._write_batch([record for _, record in batch])
+                with self._sync_lock, self._lock:
+                    # Only this method removes records, so the batch is still the head of the queue.
+                    del self._pending[:len(batch)]
+                    self._keys.difference_update(key for key, _ in batch)
+                    self._rewrite_log()
+                for record in attendance:
+                    attendance_recorded(record['event_id'], record['club_id'], record['student_id'],
+                                        datetime.fromisoformat(record['timestamp']))
+                for application_id, record in applications:
+                    data = {"application_id": application_id, "student_id": record['student_id'],
+                            "club_id": record['club_id'], "status": 'pending'}
+                    event_broker.publish(f"club:{record['club_id']}:applications", data)
+                    event_broker.publish(f"student:{record['student_id']}:applications", data)
+
+    def _write_batch(self, records):
+        """Insert and commit ``records``, retrying one by one if the batch violates a constraint."""
+        try:
+            return self._insert(records)
+        except IntegrityError:
+            db.session.rollback()
+        attendance, applications = [], []
+        for record in records:
+            try:
+                inserted = self._insert([record])
+            except IntegrityError as e:
+                db.session.rollback()
+                app.logger.error("Dropping write-behind record %s: %s", record, e.orig)
+                continue
+            attendance += inserted[0]
+            applications += inserted[1]
+        return attendance, applications
 
-# --- Data Models ---
+    def _insert(self, records):
+        checkins = {(r['event_id'], r['student_id']): r for r in records if r['kind'] == 'attendance'}
+        inserted = record_attendance_batch([
+            {"event_id": r['event_id'], "student_id": r['student_id'], "timestamp": datetime.fromisoformat(r['timestamp'])}
+            for r in checkins.values()
+        ])
+        applications = {(r['student_id'], r['club_id']): r for r in records if r['kind'] == 'application'}
+        created = []
+        if applications:
+            stmt = insert_ignoring_duplicates(Application, ['student_id', 'club_id']).returning(
+                Application.id, Application.student_id, Application.club_id
+            )
+            created = list(db.session.execute(stmt, [
+                {"student_id": r['student_id'], "club_id": r['club_id'], "status": 'pending',
+                 "timestamp": datetime.fromisoformat(r['timestamp'])}
+                for r in applications.values()
+            ]))
+        db.session.commit()
+        return ([checkins[pair] for pair in inserted],
+                [(application_id, applications[(student_id, club_id)]) for application_id, student_id, club_id in created])
 
-class User(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    username = db.Column(db.String(20), unique=True, nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
-    password_hash = db.Column(db.String(60), nullable=False)
-    full_name = db.Column(db.String(100), nullable=False)
-    role = db.Column(db.String(20), nullable=False, default='student')
-    
-    student_profile = db.relationship('StudentProfile', backref='user', uselist=False)
-    club = db.relationship('Club', backref='coordinator', uselist=False)
-    applications = db.relationship('Application', backref='student', lazy=True)
-    feedback = db.relationship('Feedback', backref='student', lazy=True)
-    attendance = db.relationship('Attendance', backref='student', lazy=True)
+write_behind = WriteBehindQueue()
 
-    def __repr__(self):
-        return f"User('{self.username}', '{self.email}')"
+@app.cli.command('flush-writes')
+def flush_writes_command():
+    """Replay the write-behind log into the database."""
+    if not write_behind.start():
+        click.echo("Write-behind is disabled (set WRITE_BEHIND=1) or its log is held by a running server.")
+        return
+    write_behind.flush()
+    click.echo("Write-behind log flushed.")
 
-class StudentProfile(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    major = db.Column(db.String(50))
-    interests = db.Column(db.Text) 
-    skills = db.Column(db.Text) 
-    resume = db.Column(db.String(255))
-    personal_details = db.Column(db.Text)
+# --- Password Hashing ---
 
-class Club(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), unique=True, nullable=False)
-    description = db.Column(db.Text, nullable=False)
-    tags = db.Column(db.Text) 
-    coordinator_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    deadline = db.Column(db.Date)
-    contact_info = db.Column(db.String(100))
-    
-    is_recruiting = db.Column(db.Boolean, default=True)
-    open_positions = db.Column(db.Text)
-    skills_required = db.Column(db.Text)
-    total_members = db.Column(db.Integer, default=0)
-    interview_date = db.Column(db.DateTime)
-    
-    events = db.relationship('Event', backref='club', lazy=True)
-    applications = db.relationship('Application', backref='club', lazy=True)
-    feedback = db.relationship('Feedback', backref='club', lazy=True)
+def hash_password(password, rounds):
+    """bcrypt hash compatible with ``Bcrypt.check_password_hash``; runs in a worker process."""
+    return bcrypt_lib.hashpw(password.encode('utf-8'), bcrypt_lib.gensalt(rounds)).decode('utf-8')
 
-    def __repr__(self):
-        return f"Club('{self.name}')"
+def validate_password(password):
+    # bcrypt itself accepts an empty password (Flask-Bcrypt refused it) and fails on non-strings in the worker.
+    if not isinstance(password, str) or not password:
+        raise ValueError("Password must be a non-empty string.")
+    if len(password.encode('utf-8')) > 72:
+        raise ValueError("Password must be at most 72 bytes long.")
 
-class Event(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
-    name = db.Column(db.String(100), nullable=False)
-    date = db.Column(db.DateTime, nullable=False)
-    location = db.Column(db.String(100), nullable=False)
-    qr_code_key = db.Column(db.String(50), unique=True, nullable=False)
-    
-    attendees = db.relationship('Attendance', backref='event', lazy=True)
+class PasswordHashQueueFull(Exception):
+    pass
 
-class Attendance(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    event_id = db.Column(db.Integer, db.ForeignKey('event.id'), nullable=False)
-    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+class PasswordHasher:
+    """Runs bcrypt in bounded process pools; bulk imports get a pool of their own."""
 
-class Application(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
-    status = db.Column(db.String(20), nullable=False, default='pending')
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    def __init__(self):
+        self._executor = None
+        self._bulk_executor = None
+        self._slots = None
+        self._lock = threading.Lock()
 
-class Feedback(db.Model):
-    id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    club_id = db.Column(db.Integer, db.ForeignKey('club.id'), nullable=False)
-    rating = db.Column(db.Integer)
-    comment = db.Column(db.Text)
-    timestamp = db.Column(db.DateTime, default=datetime.utcnow)
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=app.config['PASSWORD_HASH_WORKERS'])
+                self._slots = threading.BoundedSemaphore(app.config['PASSWORD_HASH_MAX_PENDING'])
+            return self._executor
+
+    def _bulk_pool(self):
+        with self._lock:
+            if self._bulk_executor is None:
+                self._bulk_executor = ProcessPoolExecutor(max_workers=app.config['PASSWORD_HASH_BULK_WORKERS'])
+            return self._bulk_executor
+
+    def hash(self, password):
+        validate_password(password)
+        executor = self._pool()
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashQueueFull()
+        try:
+            future = executor.submit(hash_password, password, app.config['BCRYPT_LOG_ROUNDS'])
+        except BaseException:
+            self._slots.release()
+            raise
+        # The slot is held until the job itself finishes, not just until this caller stops waiting.
+        future.add_done_callback(lambda _: self._slots.release())
+        with timed('bcrypt'):
+            try:
+                return future.result(timeout=app.config['PASSWORD_HASH_TIMEOUT'])
+            except FutureTimeoutError:
+                future.cancel()
+                raise
+
+    def hash_many(self, passwords):
+        """Hash a batch on the bulk pool; used by bulk imports."""
+        workers = app.config['PASSWORD_HASH_BULK_WORKERS']
+        chunksize = max(1, len(passwords) // (workers * 4))
+        with timed('bcrypt_batch'):
+            return list(self._bulk_pool().map(
+                hash_password, passwords, repeat(app.config['BCRYPT_LOG_ROUNDS']), chunksize=chunksize
+            ))
+
+password_hasher = PasswordHasher()
+
+STUDENT_IMPORT_FIELDS = ('username', 'email', 'password', 'full_name')
+
+def import_students(rows, batch_size=None):
+    """Create students from dicts in batched transactions; returns ``(created, skipped)``."""
+    batch_size = batch_size or app.config['BULK_REGISTER_BATCH_SIZE']
+    created = 0
+    skipped = []
+    batch = []
+    for line, row in enumerate(rows, start=1):
+        batch.append((line, row))
+        if len(batch) == batch_size:
+            created += _import_student_batch(batch, skipped)
+            batch = []
+    if batch:
+        created += _import_student_batch(batch, skipped)
+    return created, sorted(skipped, key=lambda entry: entry["row"])
+
+def _import_student_batch(batch, skipped):
+    valid = []
+    for line, row in batch:
+        row = {k: (v or '').strip() for k, v in row.items() if k}
+        if not all(row.get(field) for field in STUDENT_IMPORT_FIELDS):
+            skipped.append({"row": line, "reason": "missing required fields"})
+        elif len(row['password'].encode('utf-8')) > 72:
+            skipped.append({"row": line, "reason": "password is longer than 72 bytes"})
+        else:
+            valid.append((line, row))
+
+    usernames = [row['username'] for _, row in valid]
+    emails = [row['email'] for _, row in valid]
+    taken = set()
+    for username, email in db.session.query(User.username, User.email).filter(
+        (User.username.in_(usernames)) | (User.email.in_(emails))
+    ):
+        taken.update((('username', username), ('email', email)))
+
+    accepted = []
+    for line, row in valid:
+        if ('username', row['username']) in taken or ('email', row['email']) in taken:
+            skipped.append({"row": line, "reason": "username or email already exists"})
+            continue
+        taken.update((('username', row['username']), ('email', row['email'])))
+        accepted.append(row)
+    if not accepted:
+        return 0
+
+    hashes = password_hasher.hash_many([row['password'] for row in accepted])
+    user_ids = db.session.execute(insert(User).returning(User.id, sort_by_parameter_order=True), [{
+        "username": row['username'],
+        "email": row['email'],
+        "password_hash": password_hash,
+        "full_name": row['full_name'],
+        "role": 'student',
+    } for row, password_hash in zip(accepted, hashes)]).scalars().all()
+    db.session.execute(insert(StudentProfile), [{
+        "user_id": user_id,
+        "major": row.get('major') or None,
+        "interests": row.get('interests') or None,
+        "skills": row.get('skills') or None,
+    } for row, user_id in zip(accepted, user_ids)])
+    sync_profile_terms(db.session.connection(), user_ids)
+    db.session.commit()
+    return len(accepted)
+
+@app.cli.command('import-students')
+@click.argument('csv_path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=None, type=int, help='Students written per transaction.')
+def import_students_command(csv_path, batch_size):
+    """Register every student in a CSV with username,email,password,full_name columns."""
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        created, skipped = import_students(csv.DictReader(f), batch_size=batch_size)
+    click.echo(f"Registered {created} students; skipped {len(skipped)} rows.")
+    for entry in skipped:
+        click.echo(f"  row {entry['row']}: {entry['reason']}")
+
+# --- Listing Helpers ---
+
+def split_csv(value):
+    return value.split(',') if value else []
+
+def isoformat(value):
+    return value.isoformat() if value else None
+
+def encode_cursor(values):
+    payload = [v.isoformat() if hasattr(v, 'isoformat') else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+
+def decode_cursor(token, order_keys):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, list) or len(payload) != len(order_keys):
+        raise ValueError("Invalid cursor")
+    values = []
+    for key, value in zip(order_keys, payload):
+        python_type = key.type.python_type
+        if python_type is datetime:
+            if not isinstance(value, str):
+                raise ValueError("Invalid cursor")
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+        elif python_type is not type(value):
+            raise ValueError("Invalid cursor")
+        values.append(value)
+    return values
+
+def parse_bool(value):
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f"Invalid boolean: {value}")
+
+def parse_date(value, name):
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date for {name}: {value}")
+    # Stored timestamps are naive UTC; an offset such as a trailing Z is converted rather than kept.
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def listing_fields(registry):
+    """Field names chosen by ``?fields=`` (default: all of ``registry``)."""
+    if not request.args.get('fields'):
+        return list(registry)
+    fields = [f.strip() for f in request.args['fields'].split(',') if f.strip()]
+    unknown = [f for f in fields if f not in registry]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return fields
+
+def serialize_row(registry, row, fields):
+    item = {}
+    for i, field in enumerate(fields):
+        serializer = registry[field][1]
+        item[field] = serializer(row[i]) if serializer else row[i]
+    return item
+
+def prepare_listing(registry, order_keys, build_query):
+    """Keyset-paginated, column-projected listing query; returns ``(query, fields, limit)``."""
+    fields = listing_fields(registry)
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    if cursor and not limit:
+        limit = app.config['MAX_PAGE_SIZE']
+    if limit is not None and not 0 < limit <= app.config['MAX_PAGE_SIZE']:
+        raise ValueError(f"limit must be between 1 and {app.config['MAX_PAGE_SIZE']}")
+
+    query = build_query([registry[f][0] for f in fields] + list(order_keys), fields)
+    if cursor:
+        query = query.filter(tuple_(*order_keys) > tuple_(*decode_cursor(cursor, order_keys)))
+    query = query.order_by(*order_keys)
+    if limit:
+        query = query.limit(limit + 1)
+    return query, fields, limit
+
+def render_listing(registry, rows, fields, limit):
+    """Serialize listing rows; the cursor for the next page goes in ``X-Next-Cursor``."""
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][len(fields):])
+
+    response = jsonify([serialize_row(registry, row, fields) for row in rows])
+    if next_cursor:
+        # Path arguments win over a query parameter of the same name.
+        args = {**request.args.to_dict(), 'cursor': next_cursor, 'limit': limit, **(request.view_args or {})}
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{url_for(request.endpoint, **args)}>; rel="next"'
+    return response
+
+def listing_response(registry, order_keys, build_query):
+    try:
+        query, fields, limit = prepare_listing(registry, order_keys, build_query)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    return render_listing(registry, query.all(), fields, limit), 200
+
+CLUB_FIELDS = {
+    "id": (Club.id, None),
+    "name": (Club.name, None),
+    "description": (Club.description, None),
+    "tags": (Club.tags, split_csv),
+    "deadline": (Club.deadline, isoformat),
+    "contact_info": (Club.contact_info, None),
+    "is_recruiting": (Club.is_recruiting, None),
+    "open_positions": (Club.open_positions, split_csv),
+    "skills_required": (Club.skills_required, split_csv),
+    "total_members": (Club.total_members, None),
+    "interview_date": (Club.interview_date, isoformat),
+}
+
+EVENT_FIELDS = {
+    "id": (Event.id, None),
+    "name": (Event.name, None),
+    "date": (Event.date, isoformat),
+    "location": (Event.location, None),
+    "club_name": (Club.name, None),
+}
+
+CLUB_APPLICATION_FIELDS = {
+    "id": (Application.id, None),
+    "student_name": (func.coalesce(User.full_name, 'N/A'), None),
+    "student_id": (Application.student_id, None),
+    "status": (Application.status, None),
+    "timestamp": (Application.timestamp, isoformat),
+}
+
+CLUB_FEEDBACK_FIELDS = {
+    "id": (Feedback.id, None),
+    "student_name": (func.coalesce(User.full_name, 'N/A'), None),
+    "rating": (Feedback.rating, None),
+    "comment": (Feedback.comment, None),
+    "timestamp": (Feedback.timestamp, isoformat),
+}
+
+ATTENDANCE_FIELDS = {
+    "id": (Attendance.id, None),
+    "event_id": (Attendance.event_id, None),
+    "event_name": (Event.name, None),
+    "student_id": (Attendance.student_id, None),
+    "student_name": (func.coalesce(User.full_name, 'N/A'), None),
+    "timestamp": (Attendance.timestamp, isoformat),
+}
+
+# --- Streaming Export ---
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+def export_lines(registry, rows, fields, fmt):
+    """Encode rows one at a time as CSV (with a header) or NDJSON, yielding bytes in buffered chunks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == 'csv':
+        writer.writerow(fields)
+    for row in rows:
+        item = serialize_row(registry, row, fields)
+        if fmt == 'csv':
+            writer.writerow([','.join(v) if isinstance(v, list) else v for v in item.values()])
+        else:
+            buffer.write(json.dumps(item) + '\n')
+        if buffer.tell() >= app.config['EXPORT_BUFFER_BYTES']:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31 selects the gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_response(registry, order_key, build_query, filename):
+    """Stream ``build_query``'s rows as a CSV or NDJSON attachment, optionally gzipped."""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"message": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    compress = request.args.get('compress')
+    if compress not in (None, 'gzip'):
+        return jsonify({"message": "compress must be gzip"}), 400
+    try:
+        fields = listing_fields(registry)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    query = build_query([registry[f][0] for f in fields], fields).order_by(order_key)
+    chunks = export_lines(registry, query.yield_per(app.config['EXPORT_CHUNK_SIZE']), fields, fmt)
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    filename = f"{filename}.{extension}"
+    if compress:
+        chunks = gzip_chunks(chunks)
+        mimetype = 'application/gzip'
+        filename += '.gz'
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
 
 # --- API Endpoints ---
 
@@ -115,7 +2786,17 @@ def register():
     if not data or not all(k in data for k in ('username', 'email', 'password', 'full_name', 'role')):
         return jsonify({"message": "Missing required fields"}), 400
 
-    hashed_password = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+    try:
+        hashed_password = password_hasher.hash(data['password'])
+    except PasswordHashQueueFull:
+        response = jsonify({"message": "Registration is busy right now. Please try again in a moment."})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    except FutureTimeoutError:
+        return jsonify({"message": "Registration timed out. Please try again."}), 503
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
     new_user = User(
         username=data['username'],
         email=data['email'],
@@ -123,16 +2804,12 @@ def register():
         full_name=data['full_name'],
         role=data['role']
     )
-    
+    if new_user.role == 'student':
+        new_user.student_profile = StudentProfile()
+
     try:
         db.session.add(new_user)
         db.session.commit()
-        
-        if new_user.role == 'student':
-            new_profile = StudentProfile(user_id=new_user.id)
-            db.session.add(new_profile)
-            db.session.commit()
-            
         return jsonify({"message": f"{data['role']} registered successfully", "user_id": new_user.id}), 201
     except IntegrityError:
         db.session.rollback()
@@ -141,25 +2818,95 @@ def register():
         db.session.rollback()
         return jsonify({"message": f"An unexpected error occurred: {str(e)}"}), 500
 
+@app.route("/register/bulk", methods=["POST"])
+def register_bulk():
+    upload = request.files.get('file')
+    if upload:
+        text_stream = io.TextIOWrapper(upload.stream, encoding='utf-8', newline='')
+    elif request.mimetype == 'text/csv':
+        text_stream = io.StringIO(request.get_data(as_text=True), newline='')
+    else:
+        return jsonify({"message": "Send a CSV as a 'file' upload or with Content-Type: text/csv"}), 400
+
+    reader = csv.DictReader(text_stream)
+    if not reader.fieldnames or not set(STUDENT_IMPORT_FIELDS) <= set(reader.fieldnames):
+        return jsonify({"message": f"CSV must have columns: {', '.join(STUDENT_IMPORT_FIELDS)}"}), 400
+    rows = []
+    for row in reader:
+        rows.append(row)
+        if len(rows) > app.config['BULK_REGISTER_MAX_ROWS']:
+            return jsonify({"message": f"At most {app.config['BULK_REGISTER_MAX_ROWS']} rows per upload"}), 400
+
+    try:
+        created, skipped = import_students(rows)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"An unexpected error occurred: {str(e)}"}), 500
+    return jsonify({"created": created, "skipped": skipped}), 200
+
+def clubs_query(columns, fields):
+    query = read_db().query(*columns)
+    if 'is_recruiting' in request.args:
+        query = query.filter(Club.is_recruiting == parse_bool(request.args['is_recruiting']))
+    if request.args.get('tag'):
+        query = query.filter(Club.id.in_(
+            select(ClubTag.club_id).join(Tag, Tag.id == ClubTag.tag_id).where(Tag.name == normalize_term(request.args['tag']))
+        ))
+    if request.args.get('deadline_after'):
+        query = query.filter(Club.deadline >= parse_date(request.args['deadline_after'], 'deadline_after').date())
+    if request.args.get('deadline_before'):
+        query = query.filter(Club.deadline <= parse_date(request.args['deadline_before'], 'deadline_before').date())
+    return query
+
 @app.route("/clubs", methods=["GET"])
+@response_cache.cached(lambda: ['clubs'])
 def get_clubs():
-    clubs = Club.query.all()
-    club_list = []
-    for club in clubs:
-        club_list.append({
-            "id": club.id,
-            "name": club.name,
-            "description": club.description,
-            "tags": club.tags.split(',') if club.tags else [],
-            "deadline": club.deadline.isoformat() if club.deadline else None,
-            "contact_info": club.contact_info,
-            "is_recruiting": club.is_recruiting,
-            "open_positions": club.open_positions.split(',') if club.open_positions else [],
-            "skills_required": club.skills_required.split(',') if club.skills_required else [],
-            "total_members": club.total_members,
-            "interview_date": club.interview_date.isoformat() if club.interview_date else None,
-        })
-    return jsonify(club_list), 200
+    return listing_response(CLUB_FIELDS, [Club.id], clubs_query)
+
+@app.route("/clubs/search", methods=["GET"])
+@response_cache.cached(lambda: ['clubs'])
+def search_clubs():
+    """Ranked club search over ``?q=`` and repeatable ``?tag=`` / ``?skill=``."""
+    words = search_words(request.args.get('q', ''))
+    tags = split_terms(','.join(request.args.getlist('tag')))
+    skills = split_terms(','.join(request.args.getlist('skill')))
+    if not (words or tags or skills):
+        return jsonify({"message": "Provide q, tag or skill"}), 400
+    try:
+        fields = listing_fields(CLUB_FIELDS)
+        limit = request.args.get('limit', 20, type=int)
+        if not 0 < limit <= app.config['MAX_PAGE_SIZE']:
+            raise ValueError(f"limit must be between 1 and {app.config['MAX_PAGE_SIZE']}")
+        is_recruiting = parse_bool(request.args['is_recruiting']) if 'is_recruiting' in request.args else None
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    query = read_db().query(*[CLUB_FIELDS[f][0] for f in fields]).select_from(Club)
+    matched_terms = []
+    for names, (_, _, owner_column, term_column, vocabulary) in (
+        (tags, CLUB_TERM_LINKS[0]), (skills, CLUB_TERM_LINKS[1])
+    ):
+        if names:
+            matches = term_matches(owner_column, term_column, vocabulary, names)
+            query = query.join(matches, matches.c.owner_id == Club.id)
+            matched_terms.append(matches.c.matches)
+    text_rank = literal(0.0)
+    if words:
+        text_matches = full_text_matches(words)
+        query = query.join(text_matches, text_matches.c.club_id == Club.id)
+        text_rank = text_matches.c.rank
+    if is_recruiting is not None:
+        query = query.filter(Club.is_recruiting == is_recruiting)
+    matched = sum(matched_terms[1:], matched_terms[0]) if matched_terms else literal(0)
+    order = ([matched.desc()] if matched_terms else []) + ([text_rank.desc()] if words else [])
+
+    rows = query.add_columns(matched, text_rank).order_by(*order, Club.id).limit(limit).all()
+    results = []
+    for row in rows:
+        item = serialize_row(CLUB_FIELDS, row, fields)
+        item["relevance"] = {"matched_terms": row[len(fields)], "text_score": round(row[len(fields) + 1], 4)}
+        results.append(item)
+    return jsonify(results), 200
 
 @app.route("/profile/<int:user_id>", methods=["PUT"])
 def update_profile(user_id):
@@ -174,111 +2921,246 @@ def update_profile(user_id):
     profile.skills = data.get('skills', profile.skills)
     profile.resume = data.get('resume', profile.resume)
     profile.personal_details = data.get('personal_details', profile.personal_details)
+    ClubRecommendation.query.filter_by(student_id=user_id).delete()
 
     db.session.commit()
     return jsonify({"message": "Profile updated successfully"}), 200
 
 @app.route("/recommendations/<int:user_id>", methods=["GET"])
+@coalesced
 def get_recommendations(user_id):
     user_profile = StudentProfile.query.filter_by(user_id=user_id).first()
     if not user_profile:
         return jsonify({"message": "Student profile not found"}), 404
 
-    all_clubs = Club.query.all()
-    if not all_clubs:
-        return jsonify({"recommendations": []}), 200
+    top_n = 5
+    stored = stored_recommendations(user_id, top_n)
+    if stored is not None:
+        return jsonify({"recommendations": stored}), 200
 
-    user_text = f"{user_profile.major} {user_profile.interests} {user_profile.skills}"
-    club_texts = [f"{club.tags} {club.description}" for club in all_clubs]
-    corpus = [user_text] + club_texts
-    
-    vectorizer = TfidfVectorizer(stop_words='english')
-    tfidf_matrix = vectorizer.fit_transform(corpus)
-    cosine_similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:]).flatten()
+    user_text = profile_text(user_profile.major, user_profile.interests, user_profile.skills)
+    scored = recommendation_index.recommend(user_text, top_n=top_n, skills=user_profile.skills)
+    clubs = {club.id: club for club in Club.query.filter(Club.id.in_([club_id for club_id, _ in scored]))}
 
-    club_scores = list(zip(all_clubs, cosine_similarities))
-    club_scores.sort(key=lambda x: x[1], reverse=True)
-    
-    top_n = 5
     recommended_clubs = []
-    for club, score in club_scores[:top_n]:
-        recommended_clubs.append({
-            "id": club.id,
-            "name": club.name,
-            "description": club.description,
-            "score": float(score)
-        })
+    for club_id, score in scored:
+        club = clubs.get(club_id)
+        if club:
+            recommended_clubs.append({
+                "id": club.id,
+                "name": club.name,
+                "description": club.description,
+                "score": score
+            })
 
     return jsonify({"recommendations": recommended_clubs}), 200
 
+@app.route("/recommendations/batch", methods=["POST"])
+def get_batch_recommendations():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"message": "Expected a JSON object"}), 400
+    user_ids = data.get("user_ids")
+    if not isinstance(user_ids, list) or not user_ids:
+        return jsonify({"message": "user_ids must be a non-empty list"}), 400
+    if len(user_ids) > app.config['RECOMMENDATION_BATCH_MAX_USERS']:
+        return jsonify({"message": f"At most {app.config['RECOMMENDATION_BATCH_MAX_USERS']} user_ids per request"}), 400
+    if not all(type(user_id) is int for user_id in user_ids):
+        return jsonify({"message": "user_ids must be integers"}), 400
+    top_n = data.get("top_n", 5)
+    if type(top_n) is not int or not 0 < top_n <= app.config['RECOMMENDATION_MAX_TOP_N']:
+        return jsonify({"message": f"top_n must be an integer between 1 and {app.config['RECOMMENDATION_MAX_TOP_N']}"}), 400
+
+    profiles = StudentProfile.query.filter(StudentProfile.user_id.in_(user_ids)).all()
+    results = recommendation_index.recommend_many(
+        [profile_text(p.major, p.interests, p.skills) for p in profiles], top_n=top_n,
+        skills=[p.skills for p in profiles],
+    )
+    club_ids = {club_id for scored in results for club_id, _ in scored}
+    clubs = {club.id: club for club in Club.query.filter(Club.id.in_(club_ids))}
+
+    recommendations = {}
+    for profile, scored in zip(profiles, results):
+        recommendations[str(profile.user_id)] = [{
+            "id": club_id,
+            "name": clubs[club_id].name,
+            "description": clubs[club_id].description,
+            "score": score
+        } for club_id, score in scored if club_id in clubs]
+    missing = [user_id for user_id in user_ids if str(user_id) not in recommendations]
+
+    return jsonify({"recommendations": recommendations, "missing": missing}), 200
+
+def write_queue_full():
+    response = jsonify({"message": "The server is busy right now. Please try again in a moment."})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
 @app.route("/checkin/<string:qr_code_key>/<int:user_id>", methods=["POST"])
 def checkin(qr_code_key, user_id):
-    event = Event.query.filter_by(qr_code_key=qr_code_key).first()
-    user = User.query.get(user_id)
-
+    event = event_key_cache.get(qr_code_key)
     if not event:
         return jsonify({"message": "Invalid QR code. Event not found."}), 404
-    
-    if not user:
+    event_id, event_name, club_id = event
+    timestamp = datetime.utcnow()
+
+    if write_behind.start():
+        if not db.session.get(User, user_id):
+            return jsonify({"message": "Invalid user ID."}), 404
+        already = db.session.query(exists().where(
+            Attendance.event_id == event_id, Attendance.student_id == user_id
+        )).scalar()
+        record = {"kind": "attendance", "event_id": event_id, "club_id": club_id, "student_id": user_id,
+                  "timestamp": timestamp.isoformat()}
+        try:
+            if already or not write_behind.submit(record):
+                return jsonify({"message": "You are already checked in to this event."}), 409
+        except WriteQueueFull:
+            return write_queue_full()
+        return jsonify({"message": f"Successfully checked in to {event_name}!"}), 202
+
+    try:
+        inserted = record_attendance(event_id, user_id, timestamp)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"message": f"An error occurred: {str(e)}"}), 500
+
+    if inserted:
+        attendance_recorded(event_id, club_id, user_id, timestamp)
+        return jsonify({"message": f"Successfully checked in to {event_name}!"}), 201
+    if not db.session.get(User, user_id):
         return jsonify({"message": "Invalid user ID."}), 404
-    
-    if Attendance.query.filter_by(event_id=event.id, student_id=user.id).first():
-        return jsonify({"message": "You are already checked in to this event."}), 409
-    
-    new_attendance = Attendance(event_id=event.id, student_id=user.id)
-    
+    return jsonify({"message": "You are already checked in to this event."}), 409
+
+@app.route("/checkin/batch", methods=["POST"])
+def checkin_batch():
+    data = request.get_json() or {}
+    checkins = data.get("checkins")
+    if not isinstance(checkins, list) or not checkins:
+        return jsonify({"message": "checkins must be a non-empty list"}), 400
+    if len(checkins) > app.config['CHECKIN_BATCH_MAX']:
+        return jsonify({"message": f"At most {app.config['CHECKIN_BATCH_MAX']} check-ins per request"}), 400
+
+    try:
+        parsed = []
+        for item in checkins:
+            timestamp = item.get("timestamp")
+            parsed.append((
+                str(item["qr_code_key"]),
+                int(item["user_id"]),
+                parse_date(timestamp, "timestamp") if timestamp else datetime.utcnow(),
+            ))
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return jsonify({"message": "Each check-in needs a qr_code_key, a user_id and an optional ISO timestamp"}), 400
+
+    events = event_key_cache.get_many([key for key, _, _ in parsed])
+    user_ids = {user_id for _, user_id, _ in parsed}
+    known_users = {user_id for (user_id,) in db.session.query(User.id).filter(User.id.in_(user_ids))}
+
+    now = datetime.utcnow()
+    earliest, latest = now - app.config['CHECKIN_MAX_AGE'], now + app.config['CHECKIN_MAX_CLOCK_SKEW']
+    results = []
+    rows = {}
+    for key, user_id, timestamp in parsed:
+        event = events.get(key)
+        if not earliest <= timestamp <= latest:
+            results.append("invalid_timestamp")
+        elif not event:
+            results.append("invalid_event")
+        elif user_id not in known_users:
+            results.append("invalid_user")
+        else:
+            results.append((event[0], user_id))
+            rows.setdefault((event[0], user_id), {"event_id": event[0], "student_id": user_id, "timestamp": timestamp})
+    club_ids = {event_id: club_id for event_id, _, club_id in events.values()}
+
     try:
-        db.session.add(new_attendance)
+        inserted = record_attendance_batch(list(rows.values()))
         db.session.commit()
-        return jsonify({"message": f"Successfully checked in to {event.name}!"}), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": f"An error occurred: {str(e)}"}), 500
 
+    for event_id, user_id in inserted:
+        attendance_recorded(event_id, club_ids[event_id], user_id, rows[(event_id, user_id)]["timestamp"])
+
+    response = []
+    for (key, user_id, _), result in zip(parsed, results):
+        if isinstance(result, tuple):
+            pair, result = result, "checked_in" if result in inserted else "duplicate"
+            inserted.discard(pair)
+        response.append({"qr_code_key": key, "user_id": user_id, "status": result})
+    return jsonify({"results": response}), 200
+
 @app.route("/events/<int:event_id>/attendees", methods=["GET"])
 def get_event_attendees(event_id):
-    event = Event.query.get(event_id)
+    event = read_db().get(Event, event_id)
     if not event:
         return jsonify({"message": "Event not found."}), 404
     
-    attendances = Attendance.query.filter_by(event_id=event.id).all()
+    attendances = read_db().query(Attendance.timestamp, User.id, User.full_name).join(
+        User, User.id == Attendance.student_id
+    ).filter(Attendance.event_id == event.id).order_by(Attendance.id).all()
     attendees_list = []
-    for attendance in attendances:
-        user = User.query.get(attendance.student_id)
-        if user:
-            attendees_list.append({
-                "student_id": user.id,
-                "student_name": user.full_name,
-                "timestamp": attendance.timestamp.isoformat()
-            })
+    for timestamp, student_id, student_name in attendances:
+        attendees_list.append({
+            "student_id": student_id,
+            "student_name": student_name,
+            "timestamp": timestamp.isoformat()
+        })
     
     return jsonify({"event_name": event.name, "attendees": attendees_list}), 200
 
 @app.route("/generate_qr/<int:event_id>", methods=["GET"])
 def generate_qr(event_id):
-    event = Event.query.get(event_id)
-    if not event:
+    qr_code_key = db.session.query(Event.qr_code_key).filter_by(id=event_id).scalar()
+    if not qr_code_key:
         return jsonify({"message": "Event not found"}), 404
+    try:
+        box_size, border, fmt = qr_options()
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
-    qr_data = event.qr_code_key
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(qr_data)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    buffer = io.BytesIO()
-    img.save(buffer, format="PNG")
-    img_str = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    
-    return jsonify({"image_base64": img_str}), 200
+    raw = request.args.get('raw', 'false').lower() in ('1', 'true', 'yes')
+    cache_key = (qr_code_key, box_size, border, fmt)
+    etag = qr_etag(cache_key + (raw,))
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        image = qr_image_cache.get(cache_key)
+        if raw:
+            response = Response(image, mimetype=QR_FORMATS[fmt])
+        else:
+            response = jsonify({"image_base64": base64.b64encode(image).decode('utf-8')})
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route("/clubs/<int:club_id>/generate_qr", methods=["GET"])
+def generate_club_qr_codes(club_id):
+    if not db.session.get(Club, club_id):
+        return jsonify({"message": "Club not found."}), 404
+    try:
+        box_size, border, fmt = qr_options()
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    events = db.session.query(Event.id, Event.name, Event.qr_code_key).filter_by(
+        club_id=club_id
+    ).order_by(Event.date).all()
+    qr_codes = [{
+        "event_id": event_id,
+        "event_name": name,
+        "format": fmt,
+        "image_base64": base64.b64encode(qr_image_cache.get((qr_code_key, box_size, border, fmt))).decode('utf-8')
+    } for event_id, name, qr_code_key in events]
+    return jsonify({"qr_codes": qr_codes}), 200
 
 @app.route("/clubs/coordinator/<int:coordinator_id>", methods=["GET"])
+@response_cache.cached(lambda coordinator_id: [f'coordinator:{coordinator_id}'])
 def get_club_by_coordinator(coordinator_id):
-    club = Club.query.filter_by(coordinator_id=coordinator_id).first()
+    club = read_db().query(Club).filter_by(coordinator_id=coordinator_id).first()
     if not club:
         return jsonify({"message": "Club not found for this coordinator."}), 404
     return jsonify({
@@ -296,12 +3178,13 @@ def get_club_by_coordinator(coordinator_id):
     })
 
 @app.route("/clubs/<int:club_id>/events", methods=["GET"])
+@response_cache.cached(lambda club_id: [f'club_events:{club_id}'])
 def get_club_events(club_id):
-    club = Club.query.get(club_id)
+    club = read_db().get(Club, club_id)
     if not club:
         return jsonify({"message": "Club not found."}), 404
     
-    events = Event.query.filter_by(club_id=club_id).order_by(Event.date).all()
+    events = read_db().query(Event).filter_by(club_id=club_id).order_by(Event.date).all()
     event_list = [{
         "id": event.id,
         "name": event.name,
@@ -311,49 +3194,107 @@ def get_club_events(club_id):
     return jsonify({"events": event_list}), 200
 
 # ---  Chatbot Endpoint ---
-chatbot_intents = {
-    "greetings": {
-        "patterns": ["hello", "hi", "hey", "greetings"],
-        "responses": ["Hello! How can I help you with club recruitment today?", "Hi there! I can answer questions about clubs, events, and how to join."]
-    },
-    "club_info": {
-        "patterns": ["clubs", "societies", "list clubs", "find societies", "what clubs are there"],
-        "responses": ["You can find a list of all clubs in the Club Directory tab. You can filter them by category or use the search bar to find something specific!"]
-    },
-    "event_info": {
-        "patterns": ["events", "what's on", "schedule", "upcoming events", "events list"],
-        "responses": ["Check the Home page for a list of all upcoming events from our clubs. We update it frequently!"]
-    },
-    "join_club": {
-        "patterns": ["how to join", "join a club", "apply", "membership"],
-        "responses": ["To join a club, you can usually apply through their page, or you can attend an event to meet the members and talk to the coordinator."]
-    },
-    "thank_you": {
-        "patterns": ["thank you", "thanks", "appreciate it"],
-        "responses": ["You're welcome! Happy to help.", "Glad I could assist!"]
-    },
-    "goodbye": {
-        "patterns": ["bye", "goodbye", "see you later"],
-        "responses": ["Goodbye! Feel free to reach out if you have more questions.", "See you around!"]
-    }
-}
+
+class IntentMatcher:
+    """Matches a message against every intent pattern in one merged regex; the first intent listed wins."""
+
+    def __init__(self, intents):
+        self.intents = intents
+        self._pattern_intents = {}
+        for priority, (intent, data) in enumerate(intents.items()):
+            for pattern in data.get("patterns", []):
+                self._pattern_intents.setdefault(pattern.lower().strip(), (priority, intent))
+        self._pattern_intents.pop('', None)
+        # The regex reports only the longest pattern at each position; any shorter pattern it contains
+        # up to a word boundary matched there too, so a match counts with the best of their priorities.
+        for pattern, (priority, intent) in list(self._pattern_intents.items()):
+            for end in range(1, len(pattern)):
+                prefix = self._pattern_intents.get(pattern[:end])
+                if prefix and not re.match(r'\w', pattern[end]) and prefix[0] < priority:
+                    priority, intent = prefix
+            self._pattern_intents[pattern] = (priority, intent)
+        self._regex = None
+        if self._pattern_intents:
+            # A zero-width lookahead tries every start position, so overlapping matches aren't skipped.
+            self._regex = re.compile(r'(?<!\w)(?=(' + self._trie_regex(self._pattern_intents) + r')(?!\w))')
+
+    @staticmethod
+    def _trie_regex(patterns):
+        trie = {}
+        for pattern in patterns:
+            node = trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        def render(node):
+            branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            if len(branches) == 1 and '' not in node:
+                return branches[0]
+            return '(?:' + '|'.join(branches) + ')' + ('?' if '' in node else '')
+
+        return render(trie)
+
+    def match(self, message):
+        """Name of the best matching intent for an already lower-cased message, or ``None``."""
+        if self._regex is None:
+            return None
+        best = None
+        for found in self._regex.finditer(message):
+            priority, intent = self._pattern_intents[found.group(1)]
+            if best is None or priority < best[0]:
+                best = (priority, intent)
+                if priority == 0:
+                    break
+        return best[1] if best else None
+
+class IntentRegistry:
+    """Loads intents from ``CHATBOT_INTENTS_PATH`` and recompiles them when the file changes."""
+
+    def __init__(self):
+        self._matcher = IntentMatcher({})
+        self._mtime = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def matcher(self):
+        now = time.monotonic()
+        if now - self._checked_at >= app.config['CHATBOT_RELOAD_INTERVAL']:
+            with self._lock:
+                if now - self._checked_at >= app.config['CHATBOT_RELOAD_INTERVAL']:
+                    self._checked_at = now
+                    self._reload_if_changed()
+        return self._matcher
+
+    def _reload_if_changed(self):
+        path = app.config['CHATBOT_INTENTS_PATH']
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(path, encoding='utf-8') as f:
+                self._matcher = IntentMatcher(json.load(f))
+        except (OSError, ValueError, AttributeError):
+            app.logger.exception("Could not load chatbot intents from %s; keeping the previous set", path)
+        self._mtime = mtime
+
+intent_registry = IntentRegistry()
 
 @app.route("/chatbot", methods=["POST"])
 def chatbot_response():
     data = request.get_json()
     user_message = data.get("message", "").lower().strip()
 
-    matched_intent = None
-    for intent, data in chatbot_intents.items():
-        for pattern in data["patterns"]:
-            if re.search(r'\b' + pattern + r'\b', user_message):
-                matched_intent = intent
-                break
-        if matched_intent:
-            break
+    matcher = intent_registry.matcher()
+    matched_intent = matcher.match(user_message)
 
     if matched_intent:
-        response = chatbot_intents[matched_intent]["responses"][0]
+        response = matcher.intents[matched_intent]["responses"][0]
     else:
         response = "I'm sorry, I don't understand that. You can ask about 'clubs', 'events', or how to 'join' one."
     
@@ -361,30 +3302,51 @@ def chatbot_response():
 
 @app.route("/buzz", methods=["GET"])
 def get_buzz_data():
-    one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-    
-    buzz_data = db.session.query(
-        Club.name,
-        func.count(Attendance.id).label('buzz_score')
-    ).select_from(Club).join(Event).join(Attendance).filter(
-        Attendance.timestamp >= one_hour_ago
-    ).group_by(Club.name).order_by(
-        func.count(Attendance.id).desc()
-    ).all()
-    
+    window = request.args.get('window', app.config['BUZZ_DEFAULT_WINDOW'])
+    if window not in app.config['BUZZ_WINDOWS']:
+        return jsonify({"message": f"window must be one of {', '.join(app.config['BUZZ_WINDOWS'])}"}), 400
+
     buzz_list = []
-    for club_name, score in buzz_data:
+    for club_name, score in buzz_engine.scores(app.config['BUZZ_WINDOWS'][window]):
         buzz_list.append({"club_name": club_name, "buzz_score": score})
-    
+
     return jsonify({"buzz_data": buzz_list}), 200
 
+@app.route("/stream", methods=["GET"])
+def stream_updates():
+    try:
+        topics = parse_topics(request.args.get('topics'))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    subscription = event_broker.subscribe(
+        Subscription(topics), int(last_event_id) if last_event_id.isdigit() else None)
+    heartbeat = app.config['STREAM_HEARTBEAT_SECONDS']
+
+    def generate():
+        try:
+            yield f"retry: {heartbeat * 1000}\n\n"
+            while not subscription.closed:
+                message = subscription.get(heartbeat)
+                # Comment lines keep proxies from timing out idle connections.
+                yield format_sse(message) if message else ": heartbeat\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    return Response(generate(), content_type='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route("/user/profile/<int:user_id>", methods=["GET"])
 def get_user_profile(user_id):
-    user = User.query.get(user_id)
+    user = read_db().get(User, user_id)
     if not user:
         return jsonify({"message": "User not found"}), 404
     
-    profile = StudentProfile.query.filter_by(user_id=user.id).first()
+    profile = read_db().query(StudentProfile).filter_by(user_id=user.id).first()
     
     user_data = {
         "id": user.id,
@@ -400,13 +3362,14 @@ def get_user_profile(user_id):
 
 @app.route("/applications/<int:student_id>", methods=["GET"])
 def get_student_applications(student_id):
-    applications = Application.query.filter_by(student_id=student_id).all()
+    applications = read_db().query(Application, Club.name).outerjoin(
+        Club, Club.id == Application.club_id
+    ).filter(Application.student_id == student_id).order_by(Application.id).all()
     app_list = []
-    for app in applications:
-        club = Club.query.get(app.club_id)
+    for app, club_name in applications:
         app_list.append({
             "id": app.id,
-            "club_name": club.name if club else "N/A",
+            "club_name": club_name or "N/A",
             "status": app.status,
             "timestamp": app.timestamp.isoformat()
         })
@@ -414,47 +3377,170 @@ def get_student_applications(student_id):
 
 @app.route("/applications/club/<int:club_id>", methods=["GET"])
 def get_club_applications(club_id):
-    applications = Application.query.filter_by(club_id=club_id).all()
-    app_list = []
-    for app in applications:
-        student = User.query.get(app.student_id)
-        app_list.append({
-            "id": app.id,
-            "student_name": student.full_name if student else "N/A",
-            "student_id": app.student_id,
-            "status": app.status,
-            "timestamp": app.timestamp.isoformat()
-        })
-    return jsonify(app_list), 200
+    def build_query(columns, fields):
+        query = read_db().query(*columns).select_from(Application).filter(Application.club_id == club_id)
+        if 'student_name' in fields:
+            query = query.outerjoin(User, User.id == Application.student_id)
+        if request.args.get('status'):
+            query = query.filter(Application.status == request.args['status'])
+        return query
+
+    return listing_response(CLUB_APPLICATION_FIELDS, [Application.id], build_query)
+
+@app.route("/applications/<int:application_id>/status", methods=["PUT"])
+def update_application_status(application_id):
+    status = (request.get_json(silent=True) or {}).get('status')
+    if status not in APPLICATION_STATUSES:
+        return jsonify({"message": f"status must be one of {', '.join(APPLICATION_STATUSES)}"}), 400
+    application = db.session.get(Application, application_id)
+    if not application:
+        return jsonify({"message": "Application not found"}), 404
+    application.status = status
+    db.session.commit()
+    return jsonify({"message": "Application status updated", "status": status}), 200
 
 @app.route("/feedback/club/<int:club_id>", methods=["GET"])
 def get_club_feedback(club_id):
-    feedback_entries = Feedback.query.filter_by(club_id=club_id).all()
-    feedback_list = []
-    for entry in feedback_entries:
-        student = User.query.get(entry.student_id)
-        feedback_list.append({
-            "id": entry.id,
-            "student_name": student.full_name if student else "N/A",
-            "rating": entry.rating,
-            "comment": entry.comment,
-            "timestamp": entry.timestamp.isoformat()
+    def build_query(columns, fields):
+        query = read_db().query(*columns).select_from(Feedback).filter(Feedback.club_id == club_id)
+        if 'student_name' in fields:
+            query = query.outerjoin(User, User.id == Feedback.student_id)
+        return query
+
+    return listing_response(CLUB_FEEDBACK_FIELDS, [Feedback.id], build_query)
+
+@app.route("/clubs/<int:club_id>/stats", methods=["GET"])
+def get_club_stats(club_id):
+    try:
+        days = int(request.args.get('days', app.config['CLUB_STATS_DEFAULT_DAYS']))
+    except ValueError:
+        days = 0
+    if not 0 < days <= app.config['CLUB_STATS_MAX_DAYS']:
+        return jsonify({"message": f"days must be between 1 and {app.config['CLUB_STATS_MAX_DAYS']}"}), 400
+
+    events = read_db().query(Club.id, Event.id, Event.name, Event.date).outerjoin(
+        Event, Event.club_id == Club.id
+    ).filter(Club.id == club_id).order_by(Event.date, Event.id).all()
+    if not events:
+        return jsonify({"message": "Club not found"}), 404
+    totals = dict(read_db().query(ClubStatTotal.metric, func.sum(ClubStatTotal.value)).filter(
+        ClubStatTotal.club_id == club_id
+    ).group_by(ClubStatTotal.metric))
+    if not totals and not club_stats_installed(read_db()):
+        app.logger.error("Club statistics triggers are missing; run `flask upgrade-schema`")
+        return jsonify({"message": "Club statistics are not set up on this database"}), 503
+    today = datetime.utcnow().date()
+    first_day = today - timedelta(days=days - 1)
+    daily = {row.day: row for row in read_db().query(
+        ClubDailyStat.day, *[func.sum(getattr(ClubDailyStat, c)).label(c) for c in CLUB_DAILY_COLUMNS]
+    ).filter(
+        ClubDailyStat.club_id == club_id, ClubDailyStat.day >= first_day
+    ).group_by(ClubDailyStat.day)}
+
+    def average(rating_total, rated):
+        return round(rating_total / rated, 2) if rated else None
+
+    by_status = {status: totals.get(f'status:{status}', 0) for status in APPLICATION_STATUSES}
+    by_status.update({metric.split(':', 1)[1]: value for metric, value in totals.items()
+                      if metric.startswith('status:') and value})
+    series = []
+    for offset in range(days):
+        day = first_day + timedelta(days=offset)
+        row = daily.get(day)
+        series.append({
+            "date": day.isoformat(),
+            "applications": row.applications if row else 0,
+            "checkins": row.checkins if row else 0,
+            "feedback": row.feedback if row else 0,
+            "average_rating": average(row.rating_total, row.rated) if row else None,
         })
-    return jsonify(feedback_list), 200
+    return jsonify({
+        "club_id": club_id,
+        "applications": {"total": sum(by_status.values()), "by_status": by_status},
+        "feedback": {"count": totals.get('feedback', 0),
+                     "average_rating": average(totals.get('rating_total', 0), totals.get('rated', 0))},
+        "attendance": {
+            "total": sum(value for metric, value in totals.items() if metric.startswith('event:')),
+            "by_event": [{"event_id": event_id, "name": name, "date": isoformat(date),
+                          "checkins": totals.get(f'event:{event_id}', 0)}
+                         for _, event_id, name, date in events if event_id is not None],
+        },
+        "daily": series,
+    }), 200
+
+@app.route("/clubs/<int:club_id>/applications/export", methods=["GET"])
+def export_club_applications(club_id):
+    if read_db().get(Club, club_id) is None:
+        return jsonify({"message": "Club not found"}), 404
+
+    def build_query(columns, fields):
+        query = read_db().query(*columns).select_from(Application).filter(Application.club_id == club_id)
+        if 'student_name' in fields:
+            query = query.outerjoin(User, User.id == Application.student_id)
+        if request.args.get('status'):
+            query = query.filter(Application.status == request.args['status'])
+        return query
+
+    return export_response(CLUB_APPLICATION_FIELDS, Application.id, build_query, f"club-{club_id}-applications")
+
+@app.route("/clubs/<int:club_id>/feedback/export", methods=["GET"])
+def export_club_feedback(club_id):
+    if read_db().get(Club, club_id) is None:
+        return jsonify({"message": "Club not found"}), 404
+
+    def build_query(columns, fields):
+        query = read_db().query(*columns).select_from(Feedback).filter(Feedback.club_id == club_id)
+        if 'student_name' in fields:
+            query = query.outerjoin(User, User.id == Feedback.student_id)
+        return query
+
+    return export_response(CLUB_FEEDBACK_FIELDS, Feedback.id, build_query, f"club-{club_id}-feedback")
+
+def attendance_export_query(columns, fields):
+    query = read_db().query(*columns).select_from(Attendance)
+    if 'student_name' in fields:
+        query = query.outerjoin(User, User.id == Attendance.student_id)
+    if 'event_name' in fields:
+        query = query.join(Event, Event.id == Attendance.event_id)
+    return query
+
+@app.route("/events/<int:event_id>/attendance/export", methods=["GET"])
+def export_event_attendance(event_id):
+    if read_db().get(Event, event_id) is None:
+        return jsonify({"message": "Event not found."}), 404
+
+    def build_query(columns, fields):
+        return attendance_export_query(columns, fields).filter(Attendance.event_id == event_id)
+
+    return export_response(ATTENDANCE_FIELDS, Attendance.id, build_query, f"event-{event_id}-attendance")
+
+@app.route("/clubs/<int:club_id>/attendance/export", methods=["GET"])
+def export_club_attendance(club_id):
+    if read_db().get(Club, club_id) is None:
+        return jsonify({"message": "Club not found"}), 404
+
+    def build_query(columns, fields):
+        club_events = select(Event.id).where(Event.club_id == club_id)
+        return attendance_export_query(columns, fields).filter(Attendance.event_id.in_(club_events))
+
+    return export_response(ATTENDANCE_FIELDS, Attendance.id, build_query, f"club-{club_id}-attendance")
+
+def events_query(columns, fields):
+    query = read_db().query(*columns).select_from(Event)
+    if 'club_name' in fields:
+        query = query.join(Club, Club.id == Event.club_id)
+    if request.args.get('club_id'):
+        query = query.filter(Event.club_id == request.args.get('club_id', type=int))
+    if request.args.get('date_from'):
+        query = query.filter(Event.date >= parse_date(request.args['date_from'], 'date_from'))
+    if request.args.get('date_to'):
+        query = query.filter(Event.date <= parse_date(request.args['date_to'], 'date_to'))
+    return query
 
 @app.route("/events", methods=["GET"])
+@response_cache.cached(lambda: ['events'])
 def get_events():
-    events = Event.query.order_by(Event.date).all()
-    event_list = []
-    for event in events:
-        event_list.append({
-            "id": event.id,
-            "name": event.name,
-            "date": event.date.isoformat(),
-            "location": event.location,
-            "club_name": event.club.name
-        })
-    return jsonify(event_list), 200
+    return listing_response(EVENT_FIELDS, [Event.date, Event.id], events_query)
 
 @app.route("/apply/<int:student_id>/<int:club_id>", methods=["POST"])
 def apply_for_club(student_id, club_id):
@@ -467,6 +3553,16 @@ def apply_for_club(student_id, club_id):
     existing_application = Application.query.filter_by(student_id=student_id, club_id=club_id).first()
     if existing_application:
         return jsonify({"message": "You have already applied to this club"}), 409
+
+    if write_behind.start():
+        record = {"kind": "application", "student_id": student_id, "club_id": club_id,
+                  "timestamp": datetime.utcnow().isoformat()}
+        try:
+            if not write_behind.submit(record):
+                return jsonify({"message": "You have already applied to this club"}), 409
+        except WriteQueueFull:
+            return write_queue_full()
+        return jsonify({"message": "Application submitted successfully", "status": "pending"}), 202
         
     new_application = Application(student_id=student_id, club_id=club_id, status='pending')
     
@@ -474,6 +3570,9 @@ def apply_for_club(student_id, club_id):
         db.session.add(new_application)
         db.session.commit()
         return jsonify({"message": "Application submitted successfully", "status": "pending"}), 201
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"message": "You have already applied to this club"}), 409
     except Exception as e:
         db.session.rollback()
         return jsonify({"message": f"An error occurred: {str(e)}"}), 500
@@ -485,7 +3584,7 @@ def home():
 
 if __name__ == '__main__':
     with app.app_context():
-        db.create_all()
+        upgrade_schema()
         if not User.query.first():
             hashed_pass = bcrypt.generate_password_hash("password123").decode('utf-8')
             student_user = User(username='johndoe', email='john@example.com', password_hash=hashed_pass, full_name='John Doe', role='student')
@@ -574,5 +3673,7 @@ if __name__ == '__main__':
             new_event = Event(club_id=db.session.query(Club.id).filter_by(name="AI & Robotics Club").scalar(), name="AI Workshop", date=datetime.utcnow() + timedelta(days=7), location="Engineering Hall", qr_code_key="ai-workshop-2025")
             db.session.add(new_event)
             db.session.commit()
+
+        buzz_engine.rebuild()
     
     app.run(debug=True)
\ No newline at end of file
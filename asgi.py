@@ -0,0 +1,301 @@
+# asgi.py
+"""ASGI entry point; hot reads, check-ins and ``/stream`` are served on the event loop.
+
+    pip install uvicorn asgiref aiosqlite   # asyncpg instead of aiosqlite for Postgres
+    uvicorn asgi:application --workers 4
+"""
+
+import asyncio
+import json
+import re
+import threading
+from urllib.parse import parse_qs
+from datetime import datetime
+
+from asgiref.wsgi import WsgiToAsgi
+from flask import jsonify, make_response
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import (
+    app, db, Club, Event, User, CLUB_FIELDS, EVENT_FIELDS, InProcessCacheBackend,
+    apply_sqlite_pragmas, attendance_insert, attendance_recorded, buzz_engine, clubs_query,
+    COALESCED_REQUESTS, Subscription, engine_options, event_broker, event_key_cache, events_query, format_sse, parse_topics,
+    freeze_response, prepare_listing, render_listing, request_route, response_cache, thaw_response, write_behind,
+)
+
+ASYNC_DRIVERS = {'sqlite': 'sqlite+aiosqlite', 'postgresql': 'postgresql+asyncpg'}
+
+class AsyncDatabase:
+    """Async engines mirroring the Flask app's primary and ``read`` binds."""
+
+    def __init__(self):
+        self.sessions = None
+        self.read_sessions = None
+        self.dialect = None
+        self._engines = []
+
+    def start(self):
+        with app.app_context():
+            primary_url = db.engines[None].url
+            read_url = db.engines['read'].url if 'read' in db.engines else None
+        primary = self._create_engine(primary_url)
+        read = self._create_engine(read_url) if read_url is not None else primary
+        self.dialect = primary_url.get_backend_name()
+        self.sessions = async_sessionmaker(primary, expire_on_commit=False)
+        self.read_sessions = async_sessionmaker(read, expire_on_commit=False)
+
+    def _create_engine(self, url):
+        backend = url.get_backend_name()
+        engine = create_async_engine(url.set(drivername=ASYNC_DRIVERS[backend]), **engine_options(str(url)))
+        if backend == 'sqlite':
+            event.listen(engine.sync_engine, 'connect', lambda dbapi_connection, _: apply_sqlite_pragmas(dbapi_connection))
+        self._engines.append(engine)
+        return engine
+
+    async def stop(self):
+        for engine in self._engines:
+            await engine.dispose()
+
+database = AsyncDatabase()
+
+# --- Native Handlers ---
+
+in_flight = {}  # cache key -> task rendering it
+
+async def coalesced(key, compute):
+    """Await the task already computing ``key``, or start one; the async twin of ``single_flight``."""
+    if not app.config['COALESCE_REQUESTS']:
+        return await compute()
+    task = in_flight.get(key)
+    if task is None:
+        task = in_flight[key] = asyncio.ensure_future(compute())
+        task.add_done_callback(lambda _: in_flight.pop(key, None))
+    else:
+        COALESCED_REQUESTS.inc(request_route())
+    # Shielded so one client disconnecting doesn't cancel the render the others are waiting on.
+    return await asyncio.shield(task)
+
+async def cache_call(function, *args):
+    # Only the in-process backend is cheap enough to call on the loop; the file backend does disk I/O.
+    if isinstance(response_cache.backend, InProcessCacheBackend):
+        return function(*args)
+    return await asyncio.to_thread(function, *args)
+
+def cache_lookup(tags):
+    key = response_cache.key(tags)
+    return key, response_cache.backend.get(key)
+
+async def listing(tags, registry, order_keys, build_query):
+    key, entry = await cache_call(cache_lookup, tags)
+    if entry is None:
+        async def compute():
+            try:
+                query, fields, limit = prepare_listing(registry, order_keys, build_query)
+            except ValueError as e:
+                return freeze_response(make_response(jsonify({"message": str(e)}), 400))
+            async with database.read_sessions() as session:
+                rows = (await session.execute(query.statement)).all()
+            response = render_listing(registry, rows, fields, limit)
+            return await cache_call(response_cache.store, key, response) or freeze_response(response)
+
+        entry = await coalesced(key, compute)
+        if isinstance(entry, tuple):
+            return thaw_response(entry)
+    return response_cache.respond(entry)
+
+async def get_clubs():
+    return await listing(['clubs'], CLUB_FIELDS, [Club.id], clubs_query)
+
+async def get_events():
+    return await listing(['events'], EVENT_FIELDS, [Event.date, Event.id], events_query)
+
+async def get_buzz_data():
+    # Buzz is answered from memory, so the Flask view is safe to run on the loop.
+    return app.view_functions['get_buzz_data']()
+
+async def checkin(qr_code_key, user_id):
+    user_id = int(user_id)
+    async with database.sessions() as session:
+        event_info = event_key_cache.peek(qr_code_key)
+        if event_info is None:
+            row = (await session.execute(
+                select(Event.id, Event.name, Event.club_id).where(Event.qr_code_key == qr_code_key)
+            )).first()
+            if row is None:
+                return jsonify({"message": "Invalid QR code. Event not found."}), 404
+            event_info = tuple(row)
+            event_key_cache.put(qr_code_key, *event_info)
+        event_id, event_name, club_id = event_info
+        timestamp = datetime.utcnow()
+
+        try:
+            inserted = (await session.execute(
+                attendance_insert(event_id, user_id, timestamp, database.dialect)
+            )).first() is not None
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            return jsonify({"message": f"An error occurred: {str(e)}"}), 500
+
+        if inserted:
+            attendance_recorded(event_id, club_id, user_id, timestamp)
+            return jsonify({"message": f"Successfully checked in to {event_name}!"}), 201
+        if (await session.execute(select(User.id).where(User.id == user_id))).first() is None:
+            return jsonify({"message": "Invalid user ID."}), 404
+        return jsonify({"message": "You are already checked in to this event."}), 409
+
+NATIVE_ROUTES = [
+    ('GET', re.compile(r'^/clubs$'), get_clubs),
+    ('GET', re.compile(r'^/events$'), get_events),
+    ('GET', re.compile(r'^/buzz$'), get_buzz_data),
+]
+if not app.config['WRITE_BEHIND_ENABLED']:
+    # With write-behind on, check-ins are queued by the Flask view instead.
+    NATIVE_ROUTES.append(('POST', re.compile(r'^/checkin/(?P<qr_code_key>[^/]+)/(?P<user_id>\d+)$'), checkin))
+
+# --- Live Updates ---
+
+class AsyncSubscription(Subscription):
+    """A subscription whose inbox is read on the event loop; the broker may publish from any thread."""
+
+    def __init__(self, topics, loop):
+        super().__init__(topics)
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+
+    def deliver(self, message):
+        with self._pending_lock:
+            if self._pending >= app.config['STREAM_MAX_PENDING']:
+                return False
+            self._pending += 1
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, message)
+        return True
+
+    def close(self):
+        super().close()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+
+    async def get(self, timeout):
+        try:
+            message = await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if message is not None:
+            with self._pending_lock:
+                self._pending -= 1
+        return message
+
+async def stream(scope, receive, send):
+    """``GET /stream`` on the event loop; mirrors the Flask view of the same path."""
+    query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    headers = dict((k.decode('latin-1').lower(), v.decode('latin-1')) for k, v in scope['headers'])
+    try:
+        topics = parse_topics(query.get('topics', [''])[0])
+    except ValueError as e:
+        await send({'type': 'http.response.start', 'status': 400,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': json.dumps({"message": str(e)}).encode()})
+        return
+
+    last_event_id = headers.get('last-event-id', '')
+    subscription = event_broker.subscribe(AsyncSubscription(topics, asyncio.get_running_loop()),
+                                          int(last_event_id) if last_event_id.isdigit() else None)
+    heartbeat = app.config['STREAM_HEARTBEAT_SECONDS']
+
+    async def watch_disconnect():
+        while (await receive())['type'] != 'http.disconnect':
+            pass
+        subscription.close()
+
+    watcher = asyncio.create_task(watch_disconnect())
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'), (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no')]})
+        chunk = f"retry: {heartbeat * 1000}\n\n"
+        while not subscription.closed:
+            await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+            message = await subscription.get(heartbeat)
+            chunk = format_sse(message) if message else ": heartbeat\n\n"
+        if not watcher.done():
+            # Dropped by the broker for lagging; end the response so the client reconnects.
+            await send({'type': 'http.response.body', 'body': b''})
+    except OSError:
+        pass
+    finally:
+        event_broker.unsubscribe(subscription)
+        watcher.cancel()
+
+# --- ASGI Plumbing ---
+
+async def read_body(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            return body
+
+async def dispatch_native(handler, kwargs, scope, receive, send):
+    """Run a native handler inside a Flask request context, with the app's request hooks."""
+    body = await read_body(receive)
+    client = scope.get('client') or ('', 0)
+    with app.test_request_context(
+        scope['path'],
+        method=scope['method'],
+        query_string=scope.get('query_string', b'').decode('latin-1'),
+        headers=[(k.decode('latin-1'), v.decode('latin-1')) for k, v in scope['headers']],
+        data=body,
+        environ_base={'REMOTE_ADDR': client[0]},
+    ):
+        try:
+            response = app.preprocess_request()
+            if response is None:
+                response = await handler(**kwargs)
+            response = app.process_response(make_response(response))
+        except Exception as e:
+            response = make_response(app.handle_exception(e))
+
+    headers = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in response.headers.items()]
+    await send({'type': 'http.response.start', 'status': response.status_code, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': response.get_data()})
+
+def warm_up():
+    with app.app_context():
+        buzz_engine.rebuild()
+    write_behind.start()
+
+def drain():
+    if write_behind.available:
+        with app.app_context():
+            write_behind.flush()
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            database.start()
+            await asyncio.to_thread(warm_up)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await asyncio.to_thread(drain)
+            await database.stop()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+flask_application = WsgiToAsgi(app)
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['type'] == 'http':
+        if scope['path'] == '/stream' and scope['method'] == 'GET':
+            return await stream(scope, receive, send)
+        for method, pattern, handler in NATIVE_ROUTES:
+            match = pattern.match(scope['path'])
+            if match and scope['method'] == method:
+                return await dispatch_native(handler, match.groupdict(), scope, receive, send)
+    return await flask_application(scope, receive, send)
@@ -0,0 +1,85 @@
+"""Messages/sec for the chatbot intent matcher as the pattern count grows.
+
+    python benchmarks/chatbot_benchmark.py [--sizes 10 100 1000 5000]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import IntentMatcher  # noqa: E402
+
+WORDS = ("club event join apply schedule robotics dance debate music coding poetry drama "
+         "sports chess film art design finance startup quiz photography volunteering").split()
+
+
+def synthetic_intents(pattern_count, patterns_per_intent=10, seed=7):
+    rng = random.Random(seed)
+    intents = {}
+    for i in range(0, pattern_count, patterns_per_intent):
+        patterns = [f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i + j}"
+                    for j in range(min(patterns_per_intent, pattern_count - i))]
+        intents[f"intent_{i}"] = {"patterns": patterns, "responses": [f"response {i}"]}
+    return intents
+
+
+def synthetic_messages(intents, count, seed=11):
+    rng = random.Random(seed)
+    patterns = [p for data in intents.values() for p in data["patterns"]]
+    messages = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(12)]
+        if rng.random() < 0.5:
+            words.insert(rng.randrange(len(words)), rng.choice(patterns))
+        messages.append(" ".join(words))
+    return messages
+
+
+def naive_match(intents, message):
+    for intent, data in intents.items():
+        for pattern in data["patterns"]:
+            if re.search(r'\b' + pattern + r'\b', message):
+                return intent
+    return None
+
+
+def rate(fn, messages, min_seconds=0.5):
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for message in messages:
+            fn(message)
+        count += len(messages)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--messages", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'patterns':>9} {'compile ms':>11} {'compiled msg/s':>15} {'per-pattern msg/s':>18} {'speedup':>8}")
+    for size in args.sizes:
+        intents = synthetic_intents(size)
+        messages = synthetic_messages(intents, args.messages)
+        start = time.perf_counter()
+        matcher = IntentMatcher(intents)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        mismatches = sum(matcher.match(m) != naive_match(intents, m) for m in messages[:50])
+        compiled = rate(matcher.match, messages)
+        naive = rate(lambda m: naive_match(intents, m), messages[:max(1, 2000 // size)])
+        print(f"{size:>9} {compile_ms:>11.1f} {compiled:>15.0f} {naive:>18.0f} {compiled / naive:>7.0f}x"
+              + (f"  ({mismatches} mismatches)" if mismatches else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Fire concurrent QR check-ins at a running backend.
+
+    python app.py &
+    python benchmarks/checkin_load_test.py --seed --students 500
+    python benchmarks/checkin_load_test.py --batch 50   # offline-scanner sync
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(students, qr_code_key):
+    """Insert load-test students and an event straight into the app's database."""
+    from datetime import datetime
+    from sqlalchemy import insert
+    from app import app, db, upgrade_schema, User, Club, Event
+
+    with app.app_context():
+        upgrade_schema()
+        existing = db.session.query(User.id).filter(User.username.like("load%")).count()
+        if students > existing:
+            db.session.execute(insert(User), [
+                {"username": f"load{i}", "email": f"load{i}@example.com", "password_hash": "x",
+                 "full_name": f"Load Student {i}", "role": "student"}
+                for i in range(existing, students)])
+        if not Event.query.filter_by(qr_code_key=qr_code_key).first():
+            club = Club.query.first() or Club(name="Load Club", description="Load testing",
+                                              coordinator_id=1)
+            db.session.add(club)
+            db.session.flush()
+            db.session.add(Event(club_id=club.id, name="Load Test", date=datetime.utcnow(),
+                                 location="Main Gate", qr_code_key=qr_code_key))
+        db.session.commit()
+        ids = [user_id for (user_id,) in db.session.query(User.id).filter(
+            User.username.like("load%")).order_by(User.id).limit(students)]
+    return ids
+
+
+def post(url, payload=None):
+    data = json.dumps(payload).encode() if payload is not None else b""
+    req = urllib.request.Request(url, data=data, method="POST",
+                                 headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            status, body = resp.status, resp.read()
+    except urllib.error.HTTPError as e:
+        status, body = e.code, e.read()
+    except OSError:
+        status, body = "error", b""
+    return status, time.perf_counter() - start, body
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, len(sorted_values) * pct // 100)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--qr-code-key", default="load-test-key")
+    parser.add_argument("--students", type=int, default=500)
+    parser.add_argument("--first-user-id", type=int, default=1)
+    parser.add_argument("--scans-per-student", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=0, help="send check-ins in /checkin/batch requests of this size")
+    parser.add_argument("--seed", action="store_true", help="create the students and event first")
+    args = parser.parse_args()
+
+    if args.seed:
+        user_ids = seed(args.students, args.qr_code_key)
+    else:
+        user_ids = list(range(args.first_user_id, args.first_user_id + args.students))
+    scans = [user_id for user_id in user_ids for _ in range(args.scans_per_student)]
+
+    if args.batch:
+        batches = [scans[i:i + args.batch] for i in range(0, len(scans), args.batch)]
+        jobs = [(f"{args.url}/checkin/batch",
+                 {"checkins": [{"qr_code_key": args.qr_code_key, "user_id": u} for u in batch]})
+                for batch in batches]
+    else:
+        jobs = [(f"{args.url}/checkin/{args.qr_code_key}/{u}", None) for u in scans]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(lambda job: post(*job), jobs))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _, _ in results)
+    if args.batch:
+        checked_in = sum(
+            item["status"] == "checked_in"
+            for status, _, body in results if status == 200
+            for item in json.loads(body)["results"])
+    else:
+        checked_in = statuses.get(201, 0)
+    latencies = sorted(latency * 1000 for _, latency, _ in results)
+
+    print(f"{len(jobs)} requests ({len(scans)} scans) in {elapsed:.2f}s -> {len(jobs) / elapsed:.0f} req/s")
+    print(f"status codes: {dict(statuses)}")
+    print(f"latency ms: p50={percentile(latencies, 50):.1f} p95={percentile(latencies, 95):.1f} "
+          f"p99={percentile(latencies, 99):.1f} max={latencies[-1]:.1f}")
+    print(f"new check-ins: {checked_in} for {len(user_ids)} students")
+    if checked_in > len(user_ids):
+        print("DUPLICATE CHECK-INS DETECTED")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""Drive every API route through the Flask test client against synthetic data.
+
+    python benchmarks/endpoint_benchmark.py --scale 10k --output before.json
+    python benchmarks/endpoint_benchmark.py --scale 10k --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# name -> (method, path, body, slow). Bodies are sent as JSON, or as CSV when they are strings;
+# callables receive (rng, ids, n) with n the request number.
+ROUTES = {
+    "home": ("GET", "/", None, False),
+    "register": ("POST", "/register", lambda rng, ids, n: {
+        "username": f"bench{n}", "email": f"bench{n}@example.com", "password": "benchmark-password",
+        "full_name": f"Bench {n}", "role": "student"}, True),
+    "register_bulk": ("POST", "/register/bulk", lambda rng, ids, n: "username,email,password,full_name\n" + "".join(
+        f"bulk{n}_{i},bulk{n}_{i}@example.com,benchmark-password,Bulk {n} {i}\n" for i in range(10)), True),
+    "clubs": ("GET", "/clubs", None, False),
+    "clubs_page": ("GET", "/clubs?limit=50&fields=id,name,tags", None, False),
+    "club_search": ("GET", lambda rng, ids, n: f"/clubs/search?q={rng.choice(['music', 'data', 'robot'])}"
+                    f"&tag={rng.choice(['ai', 'dance', 'finance'])}&fields=id,name", None, False),
+    "update_profile": ("PUT", lambda rng, ids, n: f"/profile/{ids.student(rng)}", lambda rng, ids, n: {
+        "interests": "AI,Robotics,Music", "skills": "Python"}, False),
+    "recommendations": ("GET", lambda rng, ids, n: f"/recommendations/{ids.student(rng)}", None, False),
+    "recommendations_batch": ("POST", "/recommendations/batch", lambda rng, ids, n: {
+        "user_ids": [ids.student(rng) for _ in range(50)]}, False),
+    "checkin": ("POST", lambda rng, ids, n: f"/checkin/synthetic-{ids.event(rng)}/{ids.student(rng)}",
+                None, False),
+    "checkin_batch": ("POST", "/checkin/batch", lambda rng, ids, n: {"checkins": [
+        {"qr_code_key": f"synthetic-{ids.event(rng)}", "user_id": ids.student(rng)} for _ in range(50)]},
+        False),
+    "event_attendees": ("GET", lambda rng, ids, n: f"/events/{ids.event(rng)}/attendees", None, False),
+    "generate_qr": ("GET", lambda rng, ids, n: f"/generate_qr/{ids.event(rng)}", None, False),
+    "club_qr_codes": ("GET", lambda rng, ids, n: f"/clubs/{ids.club(rng)}/generate_qr", None, False),
+    "coordinator_clubs": ("GET", lambda rng, ids, n: f"/clubs/coordinator/{ids.club(rng)}", None, False),
+    "club_events": ("GET", lambda rng, ids, n: f"/clubs/{ids.club(rng)}/events", None, False),
+    "chatbot": ("POST", "/chatbot", lambda rng, ids, n: {"message": rng.choice(
+        ["hello", "what clubs are there", "how do I apply", "when is the next event", "thanks"])}, False),
+    "buzz": ("GET", "/buzz", None, False),
+    "metrics": ("GET", "/metrics", None, False),
+    "user_profile": ("GET", lambda rng, ids, n: f"/user/profile/{ids.student(rng)}", None, False),
+    "student_applications": ("GET", lambda rng, ids, n: f"/applications/{ids.student(rng)}", None, False),
+    "club_applications": ("GET", lambda rng, ids, n: f"/applications/club/{ids.club(rng)}", None, False),
+    "club_feedback": ("GET", lambda rng, ids, n: f"/feedback/club/{ids.club(rng)}", None, False),
+    "club_stats": ("GET", lambda rng, ids, n: f"/clubs/{ids.club(rng)}/stats?days=90", None, False),
+    "applications_export": ("GET", lambda rng, ids, n: f"/clubs/{ids.club(rng)}/applications/export", None, False),
+    "attendance_export_gzip": ("GET", lambda rng, ids, n: f"/clubs/{ids.club(rng)}/attendance/export"
+                               "?format=ndjson&compress=gzip", None, False),
+    "events": ("GET", "/events", None, False),
+    "events_page": ("GET", "/events?limit=50", None, False),
+    "apply": ("POST", lambda rng, ids, n: f"/apply/{ids.student(rng)}/{ids.club(rng)}", None, False),
+}
+
+
+class Ids:
+    """Random valid ids drawn from a ``synthetic_data.generate`` summary."""
+
+    def __init__(self, summary):
+        self.summary = summary
+
+    def student(self, rng):
+        return rng.randint(*self.summary["student_ids"])
+
+    def club(self, rng):
+        return rng.randint(1, self.summary["clubs"])
+
+    def event(self, rng):
+        return rng.randint(1, self.summary["events"])
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, len(sorted_values) * pct // 100)]
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def send(client, name, rng, ids, n):
+    method, path, body, _ = ROUTES[name]
+    url = path(rng, ids, n) if callable(path) else path
+    payload = body(rng, ids, n) if body else None
+    if isinstance(payload, str):
+        response = client.open(url, method=method, data=payload, content_type="text/csv")
+    else:
+        response = client.open(url, method=method, json=payload)
+    # Read the whole body (streamed exports included) and release the request context.
+    response.get_data()
+    response.close()
+    return response
+
+
+def run_route(client, name, count, warmup, rng, ids, statements):
+    # Warm-up requests pay one-off costs (lazy imports, index fits) outside the measurements.
+    for n in range(warmup):
+        send(client, name, rng, ids, f"warmup{n}")
+    latencies, sql, statuses = [], [], Counter()
+    tracemalloc.reset_peak()
+    started = time.perf_counter()
+    for n in range(count):
+        before = statements[0]
+        request_started = time.perf_counter()
+        response = send(client, name, rng, ids, n)
+        latencies.append((time.perf_counter() - request_started) * 1000)
+        sql.append(statements[0] - before)
+        statuses[response.status_code] += 1
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": count,
+        "throughput_rps": round(count / elapsed, 1),
+        "latency_ms": {pct: round(percentile(latencies, q), 3)
+                       for pct, q in (("p50", 50), ("p95", 95), ("p99", 99))} | {"max": round(latencies[-1], 3)},
+        "sql_statements_per_request": round(sum(sql) / count, 2),
+        "sql_statements_max": max(sql),
+        "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        "python_peak_mb": round(tracemalloc.get_traced_memory()[1] / 2**20, 2) if tracemalloc.is_tracing() else None,
+        "process_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline["meta"]["scale"] != results["meta"]["scale"]:
+        print(f"warning: baseline scale {baseline['meta']['scale']} differs from {results['meta']['scale']}")
+    regressions = 0
+    print(f"{'route':24} {'p99 ms':>18} {'req/s':>18} {'sql/req':>14}")
+    for name, current in results["routes"].items():
+        old = baseline["routes"].get(name)
+        if old is None:
+            continue
+        p99_old, p99_new = old["latency_ms"]["p99"], current["latency_ms"]["p99"]
+        sql_old, sql_new = old["sql_statements_per_request"], current["sql_statements_per_request"]
+        flags = []
+        if sql_new > sql_old:
+            flags.append("MORE SQL")
+        if p99_new > p99_old * (1 + tolerance):
+            flags.append("SLOWER")
+        regressions += bool(flags)
+        print(f"{name:24} {p99_old:8.1f} -> {p99_new:7.1f} "
+              f"{old['throughput_rps']:8.0f} -> {current['throughput_rps']:7.0f} "
+              f"{sql_old:5.1f} -> {sql_new:5.1f}  {' '.join(flags)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", default="1k", help="synthetic_data scale: 1k, 10k, 100k or 1m")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--requests", type=int, default=200, help="requests per route")
+    parser.add_argument("--slow-requests", type=int, default=10, help="requests per bcrypt route")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured requests per route")
+    parser.add_argument("--routes", help="comma-separated subset of routes to run")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache on")
+    parser.add_argument("--rate-limit", action="store_true", help="keep the per-route rate limits on")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record peak Python allocations per route (slows every request)")
+    parser.add_argument("--output", default="endpoint_benchmark.json")
+    parser.add_argument("--compare", help="earlier result file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p99 growth when comparing")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="club-endpoint-bench-")
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(workdir, "bench.db")
+    os.environ.pop("READ_DATABASE_URL", None)
+    os.environ.setdefault("QR_CACHE_DIR", os.path.join(workdir, "qr"))
+    if not args.cache:
+        os.environ["RESPONSE_CACHE_TTL"] = "0"
+    if not args.rate_limit:
+        os.environ["RATE_LIMIT_ENABLED"] = "0"
+
+    from sqlalchemy import event
+    from app import app, db, upgrade_schema
+    from synthetic_data import SCALES, generate
+
+    if args.scale not in SCALES:
+        parser.error(f"--scale must be one of {', '.join(SCALES)}")
+    app.config["RECOMMENDATION_INDEX_PATH"] = os.path.join(workdir, "recommendation_index.pkl")
+    names = args.routes.split(",") if args.routes else list(ROUTES)
+    unknown = set(names) - set(ROUTES)
+    if unknown:
+        parser.error(f"unknown route(s): {', '.join(sorted(unknown))}")
+
+    with app.app_context():
+        upgrade_schema()
+        generation_started = time.perf_counter()
+        summary = generate(args.scale, args.seed)
+        print(f"generated {args.scale} dataset in {time.perf_counter() - generation_started:.1f}s")
+        statements = [0]
+
+        def count_statement(*_):
+            statements[0] += 1
+
+        event.listen(db.engine, "after_cursor_execute", count_statement)
+
+    if args.trace_memory:
+        tracemalloc.start()
+    client = app.test_client()
+    ids = Ids(summary)
+    results = {
+        "meta": {
+            "commit": git_commit(), "scale": args.scale, "seed": args.seed, "dataset": summary,
+            "requests": args.requests, "slow_requests": args.slow_requests, "warmup": args.warmup,
+            "response_cache": args.cache,
+            "python": platform.python_version(), "platform": platform.platform(),
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+        },
+        "routes": {},
+    }
+    for name in names:
+        rng = random.Random(f"{args.seed}:{name}")
+        count = args.slow_requests if ROUTES[name][3] else args.requests
+        route = results["routes"][name] = run_route(client, name, count, args.warmup, rng, ids, statements)
+        print(f"{name:24} {route['throughput_rps']:8.0f} req/s  p50={route['latency_ms']['p50']:7.1f}ms  "
+              f"p99={route['latency_ms']['p99']:7.1f}ms  sql/req={route['sql_statements_per_request']:5.1f}  "
+              f"status={route['status_codes']}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.output}")
+
+    if args.compare and compare(results, args.compare, args.tolerance):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
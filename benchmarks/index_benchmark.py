@@ -0,0 +1,141 @@
+"""Compare query plans and timings for the hot lookups before and after indexing.
+
+    python benchmarks/index_benchmark.py [--attendance 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+DB_DIR = tempfile.mkdtemp(prefix="club-index-bench-")
+# Always a throwaway database: the benchmark drops indexes and seeds a million rows.
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(DB_DIR, "index_bench.db")
+os.environ.pop("READ_DATABASE_URL", None)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, text  # noqa: E402
+
+from app import (  # noqa: E402
+    app, db, upgrade_schema, User, Club, Event, Attendance, Application, Feedback,
+)
+
+QUERIES = {
+    "attendees of an event": (
+        "SELECT a.timestamp, u.id, u.full_name FROM attendance a JOIN \"user\" u ON u.id = a.student_id "
+        "WHERE a.event_id = :event_id ORDER BY a.id", {"event_id": 7}),
+    "duplicate check-in": (
+        "SELECT id FROM attendance WHERE event_id = :event_id AND student_id = :student_id",
+        {"event_id": 7, "student_id": 42}),
+    "a student's attendance": (
+        "SELECT event_id, timestamp FROM attendance WHERE student_id = :student_id", {"student_id": 42}),
+    "buzz over the last hour": (
+        "SELECT c.name, count(a.id) FROM club c JOIN event e ON c.id = e.club_id "
+        "JOIN attendance a ON e.id = a.event_id WHERE a.timestamp >= :since GROUP BY c.name",
+        {"since": None}),
+    "a student's applications": (
+        "SELECT id, club_id, status FROM application WHERE student_id = :student_id", {"student_id": 42}),
+    "a club's applications": (
+        "SELECT id, student_id, status FROM application WHERE club_id = :club_id ORDER BY id",
+        {"club_id": 3}),
+    "a club's feedback": (
+        "SELECT id, rating FROM feedback WHERE club_id = :club_id ORDER BY id", {"club_id": 3}),
+    "a club's events": (
+        "SELECT id, name, date FROM event WHERE club_id = :club_id ORDER BY date", {"club_id": 3}),
+    "coordinator's club": (
+        "SELECT id FROM club WHERE coordinator_id = :coordinator_id", {"coordinator_id": 1}),
+}
+
+
+def seed(attendance_rows, students, clubs, events_per_club, batch=50_000):
+    rng = random.Random(1234)
+    now = datetime.utcnow()
+    db.session.execute(insert(User), [
+        {"username": f"user{i}", "email": f"user{i}@example.com", "password_hash": "x",
+         "full_name": f"User {i}", "role": "student"} for i in range(students)])
+    db.session.execute(insert(Club), [
+        {"name": f"Club {i}", "description": "Synthetic club", "coordinator_id": 1 + i % students}
+        for i in range(clubs)])
+    event_count = clubs * events_per_club
+    db.session.execute(insert(Event), [
+        {"club_id": 1 + i % clubs, "name": f"Event {i}", "location": "Hall",
+         "date": now + timedelta(hours=i), "qr_code_key": f"bench-{i}"} for i in range(event_count)])
+    db.session.execute(insert(Application), [
+        {"student_id": s, "club_id": c, "status": "pending", "timestamp": now}
+        for s in range(1, students + 1) for c in rng.sample(range(1, clubs + 1), 3)])
+    db.session.execute(insert(Feedback), [
+        {"student_id": rng.randint(1, students), "club_id": rng.randint(1, clubs),
+         "rating": rng.randint(1, 5), "timestamp": now} for _ in range(students)])
+
+    # One row per (event, student) pair so the unique index can be built afterwards.
+    pairs = rng.sample(range(event_count * students), attendance_rows)
+    for start in range(0, attendance_rows, batch):
+        db.session.execute(insert(Attendance), [
+            {"event_id": 1 + p // students, "student_id": 1 + p % students,
+             "timestamp": now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))}
+            for p in pairs[start:start + batch]])
+    db.session.commit()
+
+
+def drop_secondary_indexes():
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(text(f'DROP INDEX IF EXISTS "{index.name}"'))
+
+
+def explain(connection, sql, params):
+    if db.engine.dialect.name == "sqlite":
+        rows = connection.execute(text("EXPLAIN QUERY PLAN " + sql), params).fetchall()
+        return [row[-1] for row in rows]
+    return [row[0] for row in connection.execute(text("EXPLAIN " + sql), params).fetchall()]
+
+
+def measure(repeat):
+    results = {}
+    with db.engine.connect() as connection:
+        for label, (sql, params) in QUERIES.items():
+            if "since" in params:
+                params = dict(params, since=datetime.utcnow() - timedelta(hours=1))
+            plan = explain(connection, sql, params)
+            start = time.perf_counter()
+            for _ in range(repeat):
+                connection.execute(text(sql), params).fetchall()
+            results[label] = ((time.perf_counter() - start) / repeat * 1000, plan)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--attendance", type=int, default=1_000_000)
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--clubs", type=int, default=200)
+    parser.add_argument("--events-per-club", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        drop_secondary_indexes()
+        print(f"Seeding {args.attendance:,} attendance rows ...")
+        seed(args.attendance, args.students, args.clubs, args.events_per_club)
+
+        before = measure(args.repeat)
+        start = time.perf_counter()
+        upgrade_schema()
+        print(f"upgrade_schema() took {time.perf_counter() - start:.1f}s")
+        after = measure(args.repeat)
+
+    for label in QUERIES:
+        before_ms, before_plan = before[label]
+        after_ms, after_plan = after[label]
+        print(f"\n{label}: {before_ms:.2f} ms -> {after_ms:.2f} ms ({before_ms / max(after_ms, 1e-6):.0f}x)")
+        print("  before: " + "; ".join(before_plan))
+        print("  after:  " + "; ".join(after_plan))
+
+
+if __name__ == "__main__":
+    main()
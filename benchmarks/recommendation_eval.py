@@ -0,0 +1,159 @@
+"""Compare recommendation backends and index settings on quality and latency.
+
+    python benchmarks/recommendation_eval.py --scale 10k --clubs 5000 --backends tfidf,hashing
+    RECOMMENDATION_EMBEDDINGS_PATH=glove.6B.100d.txt python benchmarks/recommendation_eval.py --backends embedding
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from endpoint_benchmark import git_commit, percentile  # noqa: E402
+
+
+def parse_weights(value):
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+def topics(value):
+    return {term.strip().lower() for term in (value or "").split(",") if term.strip()}
+
+
+def ground_truth(profiles, clubs):
+    """{user_id: {club_id: gain}} from topic overlap between profile and club fields."""
+    club_topics = {club.id: topics(club.tags) | topics(club.skills_required) for club in clubs}
+    truth = {}
+    for profile in profiles:
+        wanted = topics(profile.interests) | topics(profile.skills)
+        truth[profile.user_id] = {club_id: len(wanted & have) for club_id, have in club_topics.items()
+                                  if wanted & have}
+    return truth
+
+
+def ndcg(ranked, gains, k):
+    dcg = sum(gains.get(club_id, 0) / math.log2(rank + 2) for rank, club_id in enumerate(ranked[:k]))
+    ideal = sorted(gains.values(), reverse=True)[:k]
+    idcg = sum(gain / math.log2(rank + 2) for rank, gain in enumerate(ideal))
+    return dcg / idcg if idcg else 0.0
+
+
+def evaluate(index, profiles, truth, top_k, exact_results=None, batch_size=1000):
+    from app import profile_text
+
+    texts = [profile_text(p.major, p.interests, p.skills) for p in profiles]
+    skills = [p.skills for p in profiles]
+
+    started = time.perf_counter()
+    state = index.refresh()
+    build_seconds = time.perf_counter() - started
+
+    latencies, results = [], []
+    for text, skill in zip(texts, skills):
+        request_started = time.perf_counter()
+        results.append([club_id for club_id, _ in index.recommend(text, top_n=top_k, skills=skill)])
+        latencies.append((time.perf_counter() - request_started) * 1000)
+    latencies.sort()
+
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        index.recommend_many(texts[start:start + batch_size], top_n=top_k, state=state,
+                             skills=skills[start:start + batch_size])
+    batch_seconds = time.perf_counter() - started
+
+    report = {
+        "build_seconds": round(build_seconds, 3),
+        "vector_mb": round(state.matrix.nbytes / 2**20, 2) if state.matrix is not None else 0,
+        "lists": len(state.centroids) if state.centroids is not None else 1,
+        "latency_ms": {pct: round(percentile(latencies, q), 3) for pct, q in (("p50", 50), ("p99", 99))},
+        "batch_profiles_per_second": round(len(texts) / batch_seconds, 1),
+        "ndcg": round(sum(ndcg(ranked, truth[p.user_id], top_k) for p, ranked in zip(profiles, results))
+                      / len(profiles), 4),
+        "precision": round(sum(sum(1 for club_id in ranked if club_id in truth[p.user_id]) / top_k
+                               for p, ranked in zip(profiles, results)) / len(profiles), 4),
+    }
+    if exact_results is not None:
+        report["recall_vs_exact"] = round(sum(len(set(ranked) & set(exact)) / max(1, len(exact))
+                                              for ranked, exact in zip(results, exact_results))
+                                          / len(profiles), 4)
+    return report, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", default="10k", help="synthetic_data scale: 1k, 10k, 100k or 1m")
+    parser.add_argument("--clubs", type=int, help="override the scale's number of clubs")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--backends", default="tfidf,hashing")
+    parser.add_argument("--probes", default="2,8,32", help="comma-separated ANN probe counts")
+    parser.add_argument("--queries", type=int, default=500, help="student profiles to evaluate")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--weights", help="blend weights, e.g. text=1,skills=0,recruiting=0,deadline=0")
+    parser.add_argument("--output", default="recommendation_eval.json")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="club-recommendation-eval-")
+    os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(workdir, "eval.db")
+    os.environ.pop("READ_DATABASE_URL", None)
+
+    from app import app, db, upgrade_schema, Club, RecommendationIndex, StudentProfile
+    from synthetic_data import generate
+
+    if args.weights:
+        app.config["RECOMMENDATION_WEIGHTS"] = dict(app.config["RECOMMENDATION_WEIGHTS"], **parse_weights(args.weights))
+    results = {
+        "meta": {
+            "commit": git_commit(), "scale": args.scale, "clubs": args.clubs, "seed": args.seed,
+            "queries": args.queries, "top_k": args.top_k, "weights": app.config["RECOMMENDATION_WEIGHTS"],
+            "python": platform.python_version(), "platform": platform.platform(),
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+        },
+        "configs": {},
+    }
+    with app.app_context():
+        upgrade_schema()
+        generate(args.scale, args.seed, overrides={"clubs": args.clubs} if args.clubs else None)
+        clubs = db.session.query(Club.id, Club.tags, Club.skills_required).all()
+        profiles = db.session.query(StudentProfile).all()
+        profiles = random.Random(args.seed).sample(profiles, min(args.queries, len(profiles)))
+        truth = ground_truth(profiles, clubs)
+        print(f"{len(clubs)} clubs, {len(profiles)} query profiles")
+
+        for backend in args.backends.split(","):
+            app.config["RECOMMENDATION_BACKEND"] = backend
+            configs = [("exact", math.inf, None)] + [(f"ivf-{p}", 0, int(p)) for p in args.probes.split(",")]
+            exact_results = None
+            for label, min_clubs, probes in configs:
+                app.config["RECOMMENDATION_ANN_MIN_CLUBS"] = min_clubs
+                app.config["RECOMMENDATION_ANN_PROBES"] = probes
+                app.config["RECOMMENDATION_INDEX_PATH"] = os.path.join(workdir, f"{backend}-{label}.pkl")
+                report, ranked = evaluate(RecommendationIndex(), profiles, truth, args.top_k, exact_results)
+                exact_results = exact_results or ranked
+                name = f"{backend}/{label}"
+                results["configs"][name] = report
+                print(f"{name:18} build={report['build_seconds']:6.2f}s lists={report['lists']:4} "
+                      f"p50={report['latency_ms']['p50']:6.2f}ms p99={report['latency_ms']['p99']:6.2f}ms "
+                      f"batch={report['batch_profiles_per_second']:8.0f}/s ndcg={report['ndcg']:.3f} "
+                      f"precision={report['precision']:.3f} recall={report.get('recall_vs_exact', 1.0):.3f}")
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"wrote {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
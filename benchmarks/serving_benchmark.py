@@ -0,0 +1,150 @@
+"""Compare the threaded WSGI server with the ASGI entry point under concurrent load.
+
+    pip install uvicorn asgiref aiosqlite
+    python benchmarks/serving_benchmark.py --requests 2000 --concurrency 100
+"""
+
+import argparse
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SERVERS = {
+    "wsgi": [sys.executable, "-c",
+             "from app import app; app.run(port={port}, threaded=True, use_reloader=False)"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi:application", "--port", "{port}",
+             "--log-level", "warning"],
+}
+
+# Paths served with POST to a fresh (event, student) pair per request instead of a fixed URL.
+CHECKIN_PATH = "/checkin"
+EXPECTED_STATUS = {CHECKIN_PATH: 201}
+
+
+def fetch(request):
+    method, url = request
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method=method), timeout=30) as resp:
+            resp.read()
+            status = resp.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except OSError:
+        status = "error"
+    return status, time.perf_counter() - start
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[min(len(sorted_values) - 1, len(sorted_values) * pct // 100)]
+
+
+def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if fetch(("GET", url))[0] == 200:
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def seed(path, scale, seed_value):
+    """Generate the dataset into ``path``; returns the summary and the unused check-in pairs."""
+    os.environ["DATABASE_URL"] = "sqlite:///" + path
+    os.environ.pop("READ_DATABASE_URL", None)
+    sys.path.insert(0, ROOT)
+
+    from app import app, db, upgrade_schema, Attendance
+    from synthetic_data import generate
+
+    with app.app_context():
+        upgrade_schema()
+        summary = generate(scale, seed_value)
+        taken = set(db.session.query(Attendance.event_id, Attendance.student_id))
+        db.session.remove()
+        # Closing the last connection checkpoints the WAL, so the file can be copied on its own.
+        db.engine.dispose()
+    first_student, last_student = summary["student_ids"]
+    pairs = [(event_id, student_id) for event_id in range(1, summary["events"] + 1)
+             for student_id in range(first_student, last_student + 1) if (event_id, student_id) not in taken]
+    random.Random(seed_value).shuffle(pairs)
+    return summary, pairs
+
+
+def requests_for(base, path, count, checkins):
+    if path == CHECKIN_PATH:
+        if count > len(checkins):
+            raise SystemExit(f"only {len(checkins)} unused check-in pairs; lower --requests or raise --scale")
+        return [("POST", f"{base}/checkin/synthetic-{event_id}/{student_id}")
+                for event_id, student_id in checkins[:count]]
+    return [("GET", base + path)] * count
+
+
+def run(name, port, paths, requests, concurrency, env, checkins):
+    command = [part.format(port=port) for part in SERVERS[name]]
+    server = subprocess.Popen(command, cwd=ROOT, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base = f"http://127.0.0.1:{port}"
+    try:
+        if not wait_until_up(base + "/clubs"):
+            print(f"{name}: server did not start")
+            return
+        for path in paths:
+            batch = requests_for(base, path, requests, checkins)
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                start = time.perf_counter()
+                results = list(pool.map(fetch, batch))
+                elapsed = time.perf_counter() - start
+            errors = sum(status != EXPECTED_STATUS.get(path, 200) for status, _ in results)
+            latencies = sorted(latency * 1000 for _, latency in results)
+            print(f"{name:5} {path:24} {requests / elapsed:8.0f} req/s  "
+                  f"p50={percentile(latencies, 50):6.1f}ms  p99={percentile(latencies, 99):6.1f}ms  "
+                  f"errors={errors}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", default="wsgi,asgi")
+    parser.add_argument("--paths", default=f"/clubs,/events,/buzz,{CHECKIN_PATH}")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--port", type=int, default=5100)
+    parser.add_argument("--scale", default="10k", help="synthetic_data scale: 1k, 10k, 100k or 1m")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-cache", action="store_true", help="serve every request from the database")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="club-serving-bench-")
+    template = os.path.join(workdir, "seed.db")
+    summary, checkins = seed(template, args.scale, args.seed)
+    print(f"seeded {args.scale}: {summary['clubs']} clubs, {summary['events']} events, "
+          f"{summary['attendance']} check-ins")
+
+    env = dict(os.environ, RATE_LIMIT_ENABLED="0")
+    if args.no_cache:
+        env["RESPONSE_CACHE_TTL"] = "0"
+    paths = args.paths.split(",")
+    for offset, name in enumerate(args.servers.split(",")):
+        # Each server starts from the same rows, so both insert the same new check-ins.
+        database = os.path.join(workdir, f"{name}.db")
+        shutil.copyfile(template, database)
+        env["DATABASE_URL"] = "sqlite:///" + database
+        env["RESPONSE_CACHE_DIR"] = os.path.join(workdir, f"{name}-cache")
+        run(name, args.port + offset, paths, args.requests, args.concurrency, env, checkins)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Report the import time and memory footprint of booting the backend.
+
+    python benchmarks/startup_benchmark.py [--preload] [--top 15] [--budget-ms 1500]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = (
+    "import resource, sys, time\n"
+    "start = time.perf_counter()\n"
+    "import app\n"
+    "elapsed = time.perf_counter() - start\n"
+    "rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "print(f'{elapsed * 1000:.1f} {rss_kb} {len(sys.modules)}')\n"
+)
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+\d+ \| *(\S+)$")
+
+
+def measure(preload):
+    env = dict(os.environ, PRELOAD_HEAVY_MODULES="1" if preload else "0")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    elapsed_ms, rss_kb, modules = result.stdout.split()
+    packages = defaultdict(int)
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        # Sum self time per top-level package so nested imports are charged to their owner.
+        if match:
+            packages[match.group(2).split(".")[0]] += int(match.group(1))
+    return float(elapsed_ms), int(rss_kb), int(modules), packages
+
+
+def report(label, elapsed_ms, rss_kb, modules, packages, top):
+    print(f"{label}: import app {elapsed_ms:.0f} ms, peak RSS {rss_kb / 1024:.1f} MB, {modules} modules")
+    for name, micros in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:30} {micros / 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preload", action="store_true", help="also measure with heavy modules preloaded")
+    parser.add_argument("--top", type=int, default=15, help="packages to list per pass")
+    parser.add_argument("--budget-ms", type=float, help="fail if a lazy import of app takes longer")
+    args = parser.parse_args()
+
+    elapsed_ms, rss_kb, modules, packages = measure(preload=False)
+    report("lazy", elapsed_ms, rss_kb, modules, packages, args.top)
+    if args.preload:
+        preload = measure(preload=True)
+        report("preloaded", *preload, args.top)
+        print(f"heavy modules add {preload[0] - elapsed_ms:.0f} ms and "
+              f"{(preload[1] - rss_kb) / 1024:.1f} MB per worker")
+
+    if args.budget_ms is not None and elapsed_ms > args.budget_ms:
+        print(f"FAIL: import took {elapsed_ms:.0f} ms, budget is {args.budget_ms:.0f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Fill the app's database with a deterministic synthetic campus.
+
+    DATABASE_URL=sqlite:////tmp/campus.db python benchmarks/synthetic_data.py --scale 100k
+"""
+
+import argparse
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCALES = {
+    "1k": {"students": 200, "clubs": 10, "events_per_club": 3, "attendance": 1_000,
+           "applications_per_student": 3, "feedback": 100},
+    "10k": {"students": 2_000, "clubs": 40, "events_per_club": 5, "attendance": 10_000,
+            "applications_per_student": 3, "feedback": 1_000},
+    "100k": {"students": 20_000, "clubs": 200, "events_per_club": 5, "attendance": 100_000,
+             "applications_per_student": 3, "feedback": 10_000},
+    "1m": {"students": 200_000, "clubs": 1_000, "events_per_club": 5, "attendance": 1_000_000,
+           "applications_per_student": 3, "feedback": 100_000},
+}
+
+TOPICS = [
+    "AI", "Robotics", "Dance", "Music", "Theatre", "Writing", "Poetry", "Photography", "Film",
+    "Programming", "Web Development", "Data Science", "Finance", "Entrepreneurship", "Debate",
+    "Public Speaking", "Design", "Painting", "Chess", "Football", "Cricket", "Basketball",
+    "Environment", "Volunteering", "Astronomy", "Electronics", "Quizzing", "Gaming", "Cooking",
+    "Languages",
+]
+MAJORS = ["Computer Science", "Electrical", "Mechanical", "Civil", "Economics", "Design",
+          "Mathematics", "Physics", "Literature", "Business"]
+STATUSES = ["pending", "pending", "accepted", "rejected"]
+COMMENTS = ["Great sessions", "Well organised", "Could be better", "Loved the events", "Too crowded"]
+
+
+def insert_batches(model, rows, batch):
+    from sqlalchemy import insert
+    from app import db
+
+    count = 0
+    while True:
+        chunk = list(islice(rows, batch))
+        if not chunk:
+            return count
+        db.session.execute(insert(model), chunk)
+        count += len(chunk)
+
+
+def generate(scale="1k", seed=1234, batch=50_000, now=None, overrides=None):
+    """Insert a synthetic dataset into an empty database; returns the row counts and id ranges."""
+    from app import (
+        db, bump_index_version, sync_club_terms, sync_profile_terms,
+        User, StudentProfile, Club, Event, Attendance, Application, Feedback,
+    )
+
+    sizes = dict(SCALES[scale], **(overrides or {}))
+    rng = random.Random(seed)
+    now = now or datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+    clubs, students = sizes["clubs"], sizes["students"]
+    events = clubs * sizes["events_per_club"]
+    first_student = clubs + 1
+
+    def topics(k):
+        return ",".join(rng.sample(TOPICS, k))
+
+    insert_batches(User, ({
+        "username": f"coord{i}", "email": f"coord{i}@example.com", "password_hash": "x",
+        "full_name": f"Coordinator {i}", "role": "coordinator"} for i in range(clubs)), batch)
+    insert_batches(User, ({
+        "username": f"student{i}", "email": f"student{i}@example.com", "password_hash": "x",
+        "full_name": f"Student {i}", "role": "student"} for i in range(students)), batch)
+    insert_batches(StudentProfile, ({
+        "user_id": first_student + i, "major": rng.choice(MAJORS), "interests": topics(3),
+        "skills": topics(2)} for i in range(students)), batch)
+    insert_batches(Club, ({
+        "name": f"Club {i}", "description": f"A club for {topics(3).replace(',', ', ')} enthusiasts.",
+        "tags": topics(3), "coordinator_id": 1 + i, "is_recruiting": rng.random() < 0.7,
+        "open_positions": "Members", "skills_required": topics(2), "total_members": rng.randint(5, 200),
+        "interview_date": now + timedelta(days=rng.randint(1, 60))} for i in range(clubs)), batch)
+    # Bulk inserts skip the Club mapper events, so invalidate any saved recommendation index here.
+    bump_index_version(db.session.connection(), "clubs")
+    insert_batches(Event, ({
+        "club_id": 1 + i % clubs, "name": f"Event {i}", "location": f"Hall {i % 12}",
+        "date": now + timedelta(hours=rng.randint(-24 * 30, 24 * 30)), "qr_code_key": f"synthetic-{i + 1}"}
+        for i in range(events)), batch)
+
+    # Unique (event, student) and (student, club) pairs, as the schema's unique indexes require.
+    pairs = rng.sample(range(events * students), min(sizes["attendance"], events * students))
+    insert_batches(Attendance, ({
+        "event_id": 1 + p // students, "student_id": first_student + p % students,
+        "timestamp": now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))} for p in pairs), batch)
+    per_student = min(sizes["applications_per_student"], clubs)
+    insert_batches(Application, ({
+        "student_id": first_student + s, "club_id": club_id, "status": rng.choice(STATUSES),
+        "timestamp": now - timedelta(days=rng.randint(0, 60))}
+        for s in range(students) for club_id in rng.sample(range(1, clubs + 1), per_student)), batch)
+    insert_batches(Feedback, ({
+        "student_id": first_student + rng.randrange(students), "club_id": rng.randint(1, clubs),
+        "rating": rng.randint(1, 5), "comment": rng.choice(COMMENTS),
+        "timestamp": now - timedelta(days=rng.randint(0, 60))} for _ in range(sizes["feedback"])), batch)
+    # Bulk inserts skip the mapper listeners that maintain the tag and skill links.
+    sync_club_terms(db.session.connection())
+    sync_profile_terms(db.session.connection())
+    db.session.commit()
+
+    return {
+        "scale": scale, "seed": seed, "clubs": clubs, "events": events, "students": students,
+        "coordinator_ids": [1, clubs], "student_ids": [first_student, clubs + students],
+        "attendance": len(pairs), "applications": students * per_student, "feedback": sizes["feedback"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="1k")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--batch", type=int, default=50_000, help="rows per INSERT")
+    args = parser.parse_args()
+
+    from app import app, db, upgrade_schema, User
+
+    with app.app_context():
+        upgrade_schema()
+        if db.session.query(User.id).first() is not None:
+            print("database already has users; point DATABASE_URL at an empty database")
+            return 1
+        summary = generate(args.scale, args.seed, args.batch)
+    print(", ".join(f"{key}={value}" for key, value in summary.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+
+import pytest
+from sqlalchemy import text
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DB_DIR = tempfile.mkdtemp(prefix="club-tests-")
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(DB_DIR, "test.db")
+os.environ.pop("READ_DATABASE_URL", None)
+os.environ["RATE_LIMIT_ENABLED"] = "0"
+
+import app as app_module  # noqa: E402
+from app import db, upgrade_schema  # noqa: E402
+
+SINGLETONS = ["recommendation_index", "event_key_cache", "buzz_engine", "response_cache",
+              "single_flight", "rate_limiter", "event_broker", "qr_image_cache"]
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    instance = tmp_path / "instance"
+    monkeypatch.setitem(app_module.app.config, "TESTING", True)
+    monkeypatch.setitem(app_module.app.config, "RECOMMENDATION_INDEX_PATH", str(instance / "recommendation_index.pkl"))
+    monkeypatch.setitem(app_module.app.config, "RESPONSE_CACHE_DIR", str(instance / "response_cache"))
+    monkeypatch.setitem(app_module.app.config, "RATE_LIMIT_STORE_PATH", str(instance / "rate_limits.db"))
+    for name in SINGLETONS:
+        # Reset in place: views and asgi.py hold references to these objects.
+        getattr(app_module, name).__init__()
+    with app_module.app.app_context():
+        db.drop_all()
+        # Not part of the models' metadata, so drop_all leaves it indexing the previous test's clubs.
+        with db.engine.begin() as connection:
+            connection.execute(text("DROP TABLE IF EXISTS club_fts"))
+        upgrade_schema()
+        yield app_module.app
+        db.session.remove()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def campus(app):
+    return add_campus()
+
+
+def add_campus():
+    from app import Club, Event, StudentProfile, User
+
+    coordinator = User(username="coord", email="coord@example.edu", password_hash="x",
+                       full_name="Coordinator", role="coordinator")
+    students = [User(username=f"student{i}", email=f"student{i}@example.edu", password_hash="x",
+                     full_name=f"Student {i}") for i in range(3)]
+    db.session.add_all([coordinator] + students)
+    db.session.flush()
+    clubs = [
+        Club(name="Robotics", description="Build robots", tags="robotics,engineering",
+             skills_required="python", coordinator_id=coordinator.id),
+        Club(name="Chess", description="Play chess", tags="chess,strategy", coordinator_id=coordinator.id),
+    ]
+    db.session.add_all(clubs)
+    db.session.flush()
+    for student in students:
+        db.session.add(StudentProfile(user_id=student.id, major="CS", interests="robotics", skills="python"))
+    event = Event(club_id=clubs[0].id, name="Kickoff", date=app_module.datetime(2026, 1, 10, 18),
+                  location="Hall", qr_code_key="kickoff-key")
+    db.session.add(event)
+    db.session.commit()
+    return {"coordinator": coordinator.id, "students": [s.id for s in students],
+            "clubs": [c.id for c in clubs], "event": event.id}
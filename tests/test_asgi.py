@@ -0,0 +1,67 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("asgiref")
+pytest.importorskip("aiosqlite")
+
+import app as app_module  # noqa: E402
+import asgi  # noqa: E402
+
+
+def serve(*requests):
+    """Send ``(method, path)`` requests through the ASGI app; returns ``(status, body)`` pairs."""
+    async def call(method, path):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        await asgi.application({"type": "http", "method": method, "path": path, "query_string": b"",
+                                "headers": [], "client": ("127.0.0.1", 1)}, receive, send)
+        body = b"".join(m.get("body", b"") for m in messages if m["type"] == "http.response.body")
+        return messages[0]["status"], body
+
+    async def run():
+        asgi.database.start()
+        try:
+            return [await call(method, path) for method, path in requests]
+        finally:
+            await asgi.database.stop()
+
+    return asyncio.run(run())
+
+
+def test_file_cache_backend_is_not_called_on_the_event_loop(app, campus, monkeypatch):
+    monkeypatch.setitem(app.config, "RESPONSE_CACHE_BACKEND", "filesystem")
+    app_module.response_cache.__init__()
+    on_loop = []
+    for name in ("get", "set"):
+        original = getattr(app_module.FileCacheBackend, name)
+
+        def spy(self, *args, _original=original):
+            on_loop.append(threading.current_thread() is threading.main_thread())
+            return _original(self, *args)
+
+        monkeypatch.setattr(app_module.FileCacheBackend, name, spy)
+
+    (first_status, first), (second_status, second) = serve(("GET", "/clubs"), ("GET", "/clubs"))
+
+    assert first_status == second_status == 200
+    assert first == second
+    assert {club["name"] for club in json.loads(first)} == {"Robotics", "Chess"}
+    assert on_loop and not any(on_loop)
+
+
+def test_native_checkin(app, campus):
+    student = campus["students"][0]
+
+    (status, _), (repeat_status, _) = serve(("POST", f"/checkin/kickoff-key/{student}"),
+                                            ("POST", f"/checkin/kickoff-key/{student}"))
+
+    assert (status, repeat_status) == (201, 409)
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+
+from app import Attendance, buzz_engine, db
+
+
+def buzz(client, window="1h"):
+    return {row["club_name"]: row["buzz_score"] for row in client.get(f"/buzz?window={window}").get_json()["buzz_data"]}
+
+
+def test_checkins_show_up_in_the_window(client, campus):
+    assert buzz(client) == {}
+    for student in campus["students"][:2]:
+        assert client.post(f"/checkin/kickoff-key/{student}").status_code == 201
+
+    assert buzz(client) == {"Robotics": 2}
+    assert client.get("/buzz?window=1y").status_code == 400
+
+
+def test_rebuild_counts_only_the_longest_window(app, client, campus):
+    now = datetime.utcnow()
+    db.session.add(Attendance(event_id=campus["event"], student_id=campus["students"][0], timestamp=now))
+    db.session.add(Attendance(event_id=campus["event"], student_id=campus["students"][1],
+                              timestamp=now - timedelta(hours=3)))
+    db.session.add(Attendance(event_id=campus["event"], student_id=campus["students"][2],
+                              timestamp=now - timedelta(days=3)))
+    db.session.commit()
+
+    assert buzz(client, "1h") == {"Robotics": 1}
+    assert buzz(client, "24h") == {"Robotics": 2}
+
+
+def test_a_future_checkin_does_not_wipe_live_counts(client, campus):
+    club = campus["clubs"][0]
+    buzz_engine.rebuild()
+    now = datetime.utcnow()
+    buzz_engine.record(club, now)
+    # Lands in the current minute's ring slot if taken at face value.
+    buzz_engine.record(club, now + timedelta(minutes=buzz_engine.size))
+    buzz_engine.record(club, now)
+
+    assert buzz(client, "15m") == {"Robotics": 3}
@@ -0,0 +1,42 @@
+import random
+import re
+
+from app import IntentMatcher
+
+
+def first_listed(intents, message):
+    """The original chatbot loop: the first intent with any pattern in the message."""
+    for intent, data in intents.items():
+        if any(re.search(r"\b" + re.escape(p) + r"\b", message) for p in data["patterns"]):
+            return intent
+    return None
+
+
+def test_earlier_intent_wins_over_a_longer_overlapping_match():
+    matcher = IntentMatcher({"a": {"patterns": ["club"]}, "b": {"patterns": ["join club"]}})
+
+    assert matcher.match("join club") == "a"
+    assert matcher.match("how do i join club today") == "a"
+
+
+def test_overlapping_matches_at_different_positions():
+    matcher = IntentMatcher({"a": {"patterns": ["club events"]}, "b": {"patterns": ["join club"]}})
+
+    assert matcher.match("join club events") == "a"
+    assert matcher.match("clubs") is None
+
+
+def test_matches_the_original_loop_on_random_intents():
+    rng = random.Random(5)
+    words = ["join", "club", "events", "how", "to", "a", "list", "clubs", "thanks"]
+    for _ in range(300):
+        intents = {f"i{n}": {"patterns": [" ".join(rng.choices(words, k=rng.randint(1, 3)))
+                                          for _ in range(rng.randint(1, 3))]} for n in range(4)}
+        matcher = IntentMatcher(intents)
+        for _ in range(10):
+            message = " ".join(rng.choices(words, k=rng.randint(1, 6)))
+            assert matcher.match(message) == first_listed(intents, message), (intents, message)
+
+
+def test_chatbot_endpoint(client):
+    assert "Club Directory" in client.post("/chatbot", json={"message": "What clubs are there?"}).get_json()["response"]
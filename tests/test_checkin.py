@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+from app import Attendance, db
+
+
+def test_checkin_batch_accepts_utc_offset_timestamps(app, client, campus):
+    students = campus["students"]
+    earlier = datetime.utcnow().replace(microsecond=0) - timedelta(hours=1)
+    response = client.post("/checkin/batch", json={"checkins": [
+        {"qr_code_key": "kickoff-key", "user_id": students[0], "timestamp": earlier.isoformat() + "Z"},
+        {"qr_code_key": "kickoff-key", "user_id": students[1],
+         "timestamp": (earlier + timedelta(hours=2)).isoformat() + "+02:00"},
+        {"qr_code_key": "kickoff-key", "user_id": students[2]},
+    ]})
+
+    assert response.status_code == 200
+    assert [r["status"] for r in response.get_json()["results"]] == ["checked_in"] * 3
+    timestamps = dict(db.session.query(Attendance.student_id, Attendance.timestamp))
+    assert timestamps[students[0]] == earlier
+    assert timestamps[students[1]] == earlier
+
+
+def test_checkin_batch_reports_duplicates_and_unknowns(client, campus):
+    student = campus["students"][0]
+    response = client.post("/checkin/batch", json={"checkins": [
+        {"qr_code_key": "kickoff-key", "user_id": student},
+        {"qr_code_key": "kickoff-key", "user_id": student},
+        {"qr_code_key": "missing-key", "user_id": student},
+        {"qr_code_key": "kickoff-key", "user_id": 999},
+    ]})
+
+    assert response.status_code == 200
+    assert [r["status"] for r in response.get_json()["results"]] == [
+        "checked_in", "duplicate", "invalid_event", "invalid_user"]
+
+
+def test_checkin_batch_rejects_malformed_timestamps(client, campus):
+    response = client.post("/checkin/batch", json={"checkins": [
+        {"qr_code_key": "kickoff-key", "user_id": campus["students"][0], "timestamp": "yesterday"},
+    ]})
+
+    assert response.status_code == 400
+    assert db.session.query(Attendance).count() == 0
+
+
+def test_checkin_batch_rejects_timestamps_outside_the_clock_bounds(client, campus):
+    students = campus["students"]
+    now = datetime.utcnow()
+    response = client.post("/checkin/batch", json={"checkins": [
+        {"qr_code_key": "kickoff-key", "user_id": students[0], "timestamp": (now + timedelta(hours=24)).isoformat()},
+        {"qr_code_key": "kickoff-key", "user_id": students[1], "timestamp": "2019-01-01T00:00:00"},
+        {"qr_code_key": "kickoff-key", "user_id": students[2], "timestamp": (now + timedelta(minutes=1)).isoformat()},
+    ]})
+
+    assert [r["status"] for r in response.get_json()["results"]] == [
+        "invalid_timestamp", "invalid_timestamp", "checked_in"]
+    assert db.session.query(Attendance).count() == 1
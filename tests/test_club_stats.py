@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from sqlalchemy import text
+
+from conftest import add_campus
+from app import Application, Attendance, ClubStatTotal, Feedback, db, rebuild_club_stats
+
+
+def add_activity(campus):
+    club = campus["clubs"][0]
+    now = datetime.utcnow()
+    db.session.add_all(Attendance(event_id=campus["event"], student_id=s, timestamp=now) for s in campus["students"])
+    db.session.add(Application(student_id=campus["students"][0], club_id=club, status="accepted", timestamp=now))
+    db.session.add(Application(student_id=campus["students"][1], club_id=club, timestamp=now))
+    db.session.add(Feedback(student_id=campus["students"][0], club_id=club, rating=4, timestamp=now))
+    db.session.add(Feedback(student_id=campus["students"][1], club_id=club, rating=2, timestamp=now))
+    db.session.commit()
+
+
+def test_stats_follow_writes_across_shards(client, campus):
+    add_activity(campus)
+    db.session.query(Application).filter_by(status="accepted").update({"status": "rejected"})
+    db.session.commit()
+
+    body = client.get(f"/clubs/{campus['clubs'][0]}/stats?days=1").get_json()
+
+    assert body["attendance"]["total"] == 3
+    assert body["attendance"]["by_event"][0]["checkins"] == 3
+    assert body["applications"]["by_status"] == {"pending": 1, "accepted": 0, "rejected": 1}
+    assert body["feedback"] == {"count": 2, "average_rating": 3.0}
+    assert body["daily"][-1]["checkins"] == 3
+    assert body["daily"][-1]["average_rating"] == 3.0
+    event_rows = db.session.query(ClubStatTotal).filter_by(metric=f"event:{campus['event']}").count()
+    assert event_rows == 3
+
+
+def test_rebuild_matches_incremental_rollups(client, campus):
+    add_activity(campus)
+    url = f"/clubs/{campus['clubs'][0]}/stats?days=1"
+    incremental = client.get(url).get_json()
+
+    with db.engine.begin() as connection:
+        rebuild_club_stats(connection)
+
+    assert client.get(url).get_json() == incremental
+
+
+def test_create_all_installs_the_triggers(client):
+    db.drop_all()
+    db.create_all()
+    campus = add_campus()
+    add_activity(campus)
+
+    body = client.get(f"/clubs/{campus['clubs'][0]}/stats").get_json()
+
+    assert body["attendance"]["total"] == 3
+
+
+def test_missing_triggers_fail_loudly(client, campus):
+    for (name,) in db.session.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).all():
+        db.session.execute(text(f'DROP TRIGGER "{name}"'))
+    db.session.commit()
+
+    response = client.get(f"/clubs/{campus['clubs'][0]}/stats")
+
+    assert response.status_code == 503
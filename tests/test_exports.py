@@ -0,0 +1,86 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from app import db, Application, Attendance, Feedback
+
+
+@pytest.fixture
+def activity(campus):
+    club, event = campus["clubs"][0], campus["event"]
+    first, second, third = campus["students"]
+    db.session.add_all([
+        Application(student_id=first, club_id=club, status="accepted"),
+        Application(student_id=second, club_id=club),
+        Attendance(event_id=event, student_id=first),
+        Attendance(event_id=event, student_id=third),
+        Feedback(student_id=first, club_id=club, rating=4, comment='Great, "hands-on"\nsessions'),
+    ])
+    db.session.commit()
+    return campus
+
+
+def test_applications_export_as_csv(client, activity):
+    response = client.get(f"/clubs/{activity['clubs'][0]}/applications/export?fields=student_id,status")
+
+    assert response.mimetype == "text/csv"
+    assert response.headers["Content-Disposition"] == (
+        f'attachment; filename="club-{activity["clubs"][0]}-applications.csv"')
+    assert list(csv.reader(io.StringIO(response.get_data(as_text=True)))) == [
+        ["student_id", "status"], [str(activity["students"][0]), "accepted"], [str(activity["students"][1]), "pending"],
+    ]
+
+
+def test_csv_quotes_awkward_values(client, activity):
+    response = client.get(f"/clubs/{activity['clubs'][0]}/feedback/export?fields=rating,comment")
+
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows == [["rating", "comment"], ["4", 'Great, "hands-on"\nsessions']]
+
+
+def test_attendance_export_as_ndjson(client, activity):
+    response = client.get(f"/events/{activity['event']}/attendance/export?format=ndjson"
+                          "&fields=student_name,event_name")
+
+    assert response.mimetype == "application/x-ndjson"
+    assert [json.loads(line) for line in response.get_data(as_text=True).splitlines()] == [
+        {"student_name": "Student 0", "event_name": "Kickoff"},
+        {"student_name": "Student 2", "event_name": "Kickoff"},
+    ]
+    club_export = client.get(f"/clubs/{activity['clubs'][0]}/attendance/export?format=ndjson&fields=student_name")
+    assert len(club_export.get_data(as_text=True).splitlines()) == 2
+
+
+def test_gzip_matches_the_plain_export(client, activity):
+    url = f"/clubs/{activity['clubs'][0]}/applications/export?format=ndjson"
+
+    compressed = client.get(url + "&compress=gzip")
+
+    assert compressed.mimetype == "application/gzip"
+    assert compressed.headers["Content-Disposition"].endswith('applications.ndjson.gz"')
+    assert gzip.decompress(compressed.get_data()) == client.get(url).get_data()
+
+
+def test_rows_are_streamed_in_buffered_chunks(app, client, activity, monkeypatch):
+    monkeypatch.setitem(app.config, "EXPORT_BUFFER_BYTES", 1)
+
+    response = client.get(f"/events/{activity['event']}/attendance/export?fields=student_id")
+
+    assert response.is_streamed
+    # A chunk is sent as soon as a row fills the buffer; the header rides along with the first.
+    assert list(response.response) == [
+        f"student_id\r\n{activity['students'][0]}\r\n".encode(), f"{activity['students'][2]}\r\n".encode(),
+    ]
+
+
+@pytest.mark.parametrize("query", ["format=xml", "compress=zip", "fields=password"])
+def test_bad_options_are_rejected(client, activity, query):
+    assert client.get(f"/clubs/{activity['clubs'][0]}/applications/export?{query}").status_code == 400
+
+
+def test_unknown_owner_is_not_found(client, activity):
+    assert client.get("/clubs/999/feedback/export").status_code == 404
+    assert client.get("/events/999/attendance/export").status_code == 404
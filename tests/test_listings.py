@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import Application, Event, db
+
+
+def cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+@pytest.fixture
+def events(campus):
+    start = datetime(2026, 2, 1, 18)
+    db.session.add_all(Event(club_id=campus["clubs"][i % 2], name=f"Meetup {i}", location="Hall",
+                             date=start + timedelta(days=i // 2), qr_code_key=f"meetup-{i}") for i in range(5))
+    db.session.commit()
+    return campus
+
+
+def test_cursor_pagination_walks_every_row_once(client, events):
+    response = client.get("/events?limit=2")
+    names = [event["name"] for event in response.get_json()]
+    while "X-Next-Cursor" in response.headers:
+        assert 'rel="next"' in response.headers["Link"]
+        response = client.get("/events", query_string={"limit": 2, "cursor": response.headers["X-Next-Cursor"]})
+        assert response.status_code == 200
+        names += [event["name"] for event in response.get_json()]
+
+    assert names == ["Kickoff"] + [f"Meetup {i}" for i in range(5)]
+
+
+@pytest.mark.parametrize("token", [
+    cursor([1, 2]), cursor(["2026-01-01T00:00:00"]), cursor(["not a date", 2]),
+    cursor(["2026-01-01T00:00:00", "2"]), "%%%", cursor({"date": 1}),
+])
+def test_invalid_cursors_are_rejected(client, events, token):
+    assert client.get("/events", query_string={"cursor": token}).status_code == 400
+
+
+def test_field_selection(client, events):
+    assert set(client.get("/events?fields=id,name").get_json()[0]) == {"id", "name"}
+    assert client.get("/events?fields=id,secret").status_code == 400
+    assert client.get("/events?limit=0").status_code == 400
+
+
+
+def test_next_link_keeps_path_arguments(client, campus):
+    club = campus["clubs"][0]
+    db.session.add_all(Application(student_id=s, club_id=club) for s in campus["students"])
+    db.session.commit()
+
+    response = client.get(f"/applications/club/{club}?limit=1&club_id=999")
+
+    assert response.status_code == 200
+    assert response.headers["Link"].startswith(f"</applications/club/{club}?")
@@ -0,0 +1,85 @@
+import re
+import time
+
+import pytest
+
+from app import MetricsRegistry, timed
+
+
+def sample(text, name):
+    """Value of the exposition line starting with ``name`` (labels included), or 0."""
+    match = re.search(r"^" + re.escape(name) + r" (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0
+
+
+def test_counter_and_histogram_exposition():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs run.", ("queue",))
+    histogram = registry.histogram("job_seconds", "Job time.", buckets=(0.1, 1.0))
+    counter.inc('a "quoted"\\name')
+    counter.inc('a "quoted"\\name', amount=2)
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value)
+
+    text = registry.render()
+
+    assert "# TYPE jobs_total counter" in text
+    assert sample(text, r'jobs_total{queue="a \"quoted\"\\name"}') == 3
+    assert sample(text, 'job_seconds_bucket{le="0.1"}') == 1
+    assert sample(text, 'job_seconds_bucket{le="1.0"}') == 2
+    assert sample(text, 'job_seconds_bucket{le="+Inf"}') == 3
+    assert sample(text, "job_seconds_sum") == 5.55
+    assert sample(text, "job_seconds_count") == 3
+
+
+def test_requests_are_recorded_by_route(client, campus):
+    count = 'http_request_duration_seconds_count{method="GET",route="/clubs/<int:club_id>/events",status="200"}'
+    statements = 'http_request_sql_statements_count{route="/clubs/<int:club_id>/events"}'
+    before = client.get("/metrics").get_data(as_text=True)
+
+    client.get(f"/clubs/{campus['clubs'][0]}/events")
+    client.get(f"/clubs/{campus['clubs'][1]}/events")
+    after = client.get("/metrics").get_data(as_text=True)
+
+    assert sample(after, count) - sample(before, count) == 2
+    assert sample(after, statements) - sample(before, statements) == 2
+
+
+def test_timed_records_stage_durations(client):
+    name = 'stage_duration_seconds_count{stage="test_stage"}'
+    before = sample(client.get("/metrics").get_data(as_text=True), name)
+
+    with timed("test_stage"):
+        pass
+
+    assert sample(client.get("/metrics").get_data(as_text=True), name) == before + 1
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_metrics_can_be_turned_off(app, client, monkeypatch, enabled):
+    monkeypatch.setitem(app.config, "METRICS_ENABLED", enabled)
+    name = 'http_request_duration_seconds_count{method="GET",route="/clubs",status="200"}'
+    before = sample(client.get("/metrics").get_data(as_text=True), name)
+
+    client.get("/clubs")
+
+    assert sample(client.get("/metrics").get_data(as_text=True), name) == before + enabled
+
+
+def test_sampled_requests_write_folded_stacks(app, client, tmp_path, monkeypatch):
+    monkeypatch.setitem(app.config, "PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setitem(app.config, "PROFILE_SAMPLE_RATE", 1.0)
+    monkeypatch.setitem(app.config, "PROFILE_INTERVAL", 0.001)
+    view = app.view_functions["get_clubs"]
+
+    def slow_view(**kwargs):
+        time.sleep(0.05)
+        return view(**kwargs)
+
+    monkeypatch.setitem(app.view_functions, "get_clubs", slow_view)
+
+    client.get("/clubs")
+
+    profiles = list((tmp_path / "profiles").iterdir())
+    assert [p.name.endswith("-GET_clubs.folded") for p in profiles] == [True]
+    assert "slow_view" in profiles[0].read_text()
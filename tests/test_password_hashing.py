@@ -0,0 +1,68 @@
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import bcrypt
+import pytest
+
+from app import PasswordHasher, PasswordHashQueueFull
+
+
+@pytest.fixture
+def hasher(app, monkeypatch):
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_BULK_WORKERS", 1)
+    monkeypatch.setitem(app.config, "BCRYPT_LOG_ROUNDS", 4)
+    hasher = PasswordHasher()
+    yield hasher
+    for executor in (hasher._executor, hasher._bulk_executor):
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def test_hash_round_trips(hasher):
+    hashed = hasher.hash("secret")
+
+    assert bcrypt.checkpw(b"secret", hashed.encode())
+
+
+def test_timed_out_hash_keeps_its_slot_until_the_job_finishes(app, hasher, monkeypatch):
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_MAX_PENDING", 1)
+    hasher.hash("warm up the worker")
+    monkeypatch.setitem(app.config, "BCRYPT_LOG_ROUNDS", 13)
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_TIMEOUT", 0.05)
+
+    with pytest.raises(FutureTimeoutError):
+        hasher.hash("slow")
+    with pytest.raises(PasswordHashQueueFull):
+        hasher.hash("rejected while the slow job still runs")
+
+    assert hasher._slots.acquire(timeout=30)
+    hasher._slots.release()
+
+
+def test_bulk_hashing_does_not_queue_ahead_of_single_hashes(app, hasher, monkeypatch):
+    monkeypatch.setitem(app.config, "BCRYPT_LOG_ROUNDS", 10)
+    hasher.hash("warm up the worker")
+    bulk = threading.Thread(target=hasher.hash_many, args=([f"password{i}" for i in range(60)],))
+    bulk.start()
+    time.sleep(0.2)
+
+    hasher.hash("registering while an import runs")
+
+    assert bulk.is_alive()
+    bulk.join()
+
+
+@pytest.mark.parametrize("password, message", [
+    ("", "Password must be a non-empty string."),
+    (12345678, "Password must be a non-empty string."),
+    (None, "Password must be a non-empty string."),
+    ("x" * 73, "Password must be at most 72 bytes long."),
+])
+def test_register_rejects_invalid_passwords(client, password, message):
+    response = client.post("/register", json={"username": "new", "email": "new@example.edu", "password": password,
+                                               "full_name": "New Student", "role": "student"})
+
+    assert response.status_code == 400
+    assert response.get_json()["message"] == message
@@ -0,0 +1,75 @@
+import base64
+
+import pytest
+
+import app as app_module
+from app import QRImageCache
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+    render = app_module.render_qr
+
+    def counting_render(*cache_key):
+        calls.append(cache_key)
+        return render(*cache_key)
+
+    monkeypatch.setattr(app_module, "render_qr", counting_render)
+    return calls
+
+
+def test_repeated_requests_render_once(client, campus, renders):
+    first = client.get(f"/generate_qr/{campus['event']}")
+    second = client.get(f"/generate_qr/{campus['event']}")
+
+    assert first.get_json() == second.get_json()
+    assert base64.b64decode(first.get_json()["image_base64"]).startswith(b"\x89PNG")
+    assert renders == [("kickoff-key", 10, 4, "png")]
+
+
+def test_unchanged_image_answers_not_modified(client, campus, renders):
+    etag = client.get(f"/generate_qr/{campus['event']}").headers["ETag"]
+
+    response = client.get(f"/generate_qr/{campus['event']}", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert len(renders) == 1
+
+
+def test_raw_svg_and_options(client, campus):
+    response = client.get(f"/generate_qr/{campus['event']}?format=svg&raw=1&box_size=5&border=0")
+
+    assert response.mimetype == "image/svg+xml"
+    assert response.data.lstrip().startswith(b"<?xml")
+    assert client.get(f"/generate_qr/{campus['event']}?box_size=0").status_code == 400
+    assert client.get(f"/generate_qr/{campus['event']}?format=gif").status_code == 400
+
+
+def test_club_codes_share_the_cache(client, campus, renders):
+    client.get(f"/generate_qr/{campus['event']}")
+
+    codes = client.get(f"/clubs/{campus['clubs'][0]}/generate_qr").get_json()["qr_codes"]
+
+    assert [code["event_name"] for code in codes] == ["Kickoff"]
+    assert len(renders) == 1
+
+
+def test_disk_cache_survives_a_restart(app, tmp_path, monkeypatch, renders):
+    monkeypatch.setitem(app.config, "QR_CACHE_DIR", str(tmp_path / "qr"))
+    image = QRImageCache().get(("kickoff-key", 10, 4, "png"))
+
+    assert QRImageCache().get(("kickoff-key", 10, 4, "png")) == image
+    assert len(renders) == 1
+
+
+def test_memory_cache_stays_within_its_byte_budget(app, monkeypatch, renders):
+    cache = QRImageCache()
+    size = len(cache.get(("a", 10, 4, "png")))
+    monkeypatch.setitem(app.config, "QR_CACHE_MAX_BYTES", size * 2)
+    for key in "bc":
+        cache.get((key, 10, 4, "png"))
+
+    cache.get(("a", 10, 4, "png"))
+
+    assert [key[0] for key in renders] == ["a", "b", "c", "a"]
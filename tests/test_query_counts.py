@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import db, User, StudentProfile, Club, Event, Attendance, Application, Feedback
+
+ROWS = 200
+
+# endpoint -> maximum statements per request, independent of row count
+BUDGETS = {
+    "/events/{event_id}/attendees": 2,
+    "/applications/{student_id}": 1,
+    "/applications/club/{club_id}": 1,
+    "/feedback/club/{club_id}": 1,
+    "/events": 1,
+    "/clubs/{club_id}/stats": 3,
+}
+
+
+@pytest.fixture
+def listings(app):
+    coordinator = User(username="coord", email="coord@example.com", password_hash="x",
+                       full_name="Coordinator", role="coordinator")
+    db.session.add(coordinator)
+    db.session.flush()
+    clubs = [Club(name=f"Club {i}", description="A club", tags="Tag", coordinator_id=coordinator.id)
+             for i in range(ROWS // 50)]
+    db.session.add_all(clubs)
+    db.session.flush()
+    students = [User(username=f"s{i}", email=f"s{i}@example.com", password_hash="x",
+                     full_name=f"Student {i}") for i in range(ROWS)]
+    db.session.add_all(students)
+    db.session.flush()
+    db.session.add_all(StudentProfile(user_id=s.id) for s in students)
+    events = [Event(club_id=club.id, name=f"Event {club.id}", location="Hall",
+                    date=datetime.utcnow() + timedelta(days=club.id), qr_code_key=f"key-{club.id}")
+              for club in clubs]
+    db.session.add_all(events)
+    db.session.flush()
+    first_club, first_event, first_student = clubs[0], events[0], students[0]
+    db.session.add_all(Attendance(event_id=first_event.id, student_id=s.id) for s in students)
+    db.session.add_all(Application(student_id=s.id, club_id=first_club.id) for s in students)
+    db.session.add_all(Application(student_id=first_student.id, club_id=c.id) for c in clubs[1:])
+    db.session.add_all(Feedback(student_id=s.id, club_id=first_club.id, rating=5, comment="Great")
+                       for s in students)
+    db.session.commit()
+    return {"event_id": first_event.id, "student_id": first_student.id, "club_id": first_club.id}
+
+
+@pytest.mark.parametrize("template,budget", BUDGETS.items(), ids=list(BUDGETS))
+def test_listing_stays_within_statement_budget(client, listings, template, budget):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.get(template.format(**listings))
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert len(statements) <= budget, statements
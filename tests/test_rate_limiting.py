@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from flask import g
+
+from app import SingleFlight, rate_limiter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def limited(app, monkeypatch):
+    monkeypatch.setitem(app.config, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setitem(app.config, "RATE_LIMITS", {"get_recommendations": {"per_minute": 1, "burst": 2}})
+    return app
+
+
+def test_cycling_user_ids_does_not_bypass_the_limit(limited, client, campus):
+    statuses = [client.get(f"/recommendations/{user_id}").status_code for user_id in campus["students"]]
+
+    assert statuses[:2] == [200, 200]
+    assert statuses[2] == 429
+
+
+def test_one_client_cannot_lock_out_another(limited, client, campus):
+    target = campus["students"][0]
+    for _ in range(3):
+        client.get(f"/recommendations/{target}", environ_base={"REMOTE_ADDR": "10.0.0.1"})
+
+    response = client.get(f"/recommendations/{target}", environ_base={"REMOTE_ADDR": "10.0.0.2"})
+
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Remaining"] == "1"
+
+
+def test_limited_response_says_when_to_retry(limited, client, campus):
+    for _ in range(2):
+        client.get(f"/recommendations/{campus['students'][0]}")
+
+    response = client.get(f"/recommendations/{campus['students'][0]}")
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+BEHIND_PROXY = """
+import json
+from app import app, upgrade_schema
+app.config["RATE_LIMITS"] = {"get_clubs": {"per_minute": 1, "burst": 1}}
+with app.app_context():
+    upgrade_schema()
+client = app.test_client()
+statuses = [client.get("/clubs", headers={"X-Forwarded-For": f"203.0.113.{n}"}).status_code
+            for n in (1, 1, 2)]
+print(json.dumps(statuses))
+"""
+
+
+def test_forwarded_client_addresses_are_limited_separately_behind_a_trusted_proxy(tmp_path):
+    env = dict(os.environ, TRUSTED_PROXIES="1", RATE_LIMIT_ENABLED="1",
+               DATABASE_URL="sqlite:///" + str(tmp_path / "proxy.db"),
+               RESPONSE_CACHE_DIR=str(tmp_path / "cache"), RATE_LIMIT_STORE_PATH=str(tmp_path / "rate.db"))
+    output = subprocess.run([sys.executable, "-c", BEHIND_PROXY], env=env, cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+
+    # Every request arrives from the proxy's address; only X-Forwarded-For tells the clients apart.
+    assert json.loads(output.splitlines()[-1]) == [200, 429, 200]
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies(limited, client, campus):
+    for n in range(3):
+        response = client.get(f"/recommendations/{campus['students'][0]}",
+                              headers={"X-Forwarded-For": f"203.0.113.{n}"})
+
+    assert response.status_code == 429
+
+
+def test_authenticated_requests_are_keyed_on_the_user(limited):
+    def key(user_id, address):
+        with limited.test_request_context("/recommendations/1", environ_base={"REMOTE_ADDR": address}):
+            g.user_id = user_id
+            return rate_limiter.client_key()
+
+    assert key(7, "10.0.0.1") == key(7, "10.0.0.2") == "user:7"
+    assert key(None, "10.0.0.1") == "addr:10.0.0.1"
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers(app):
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "rendered"
+
+    def caller():
+        with app.app_context():
+            results.append(flight.do("key", compute))
+
+    leader = threading.Thread(target=caller)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=caller) for _ in range(3)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.2)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(5)
+
+    assert results == ["rendered"] * 4
+    assert len(calls) == 1
+    assert flight._calls == {}
+
+
+def test_single_flight_shares_errors_and_forgets_the_key(app):
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: "again") == "again"
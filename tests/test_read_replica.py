@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import create_engine, event
+
+from app import db, read_db, Application
+
+
+@pytest.fixture
+def replica(app, monkeypatch):
+    """A read-only connection to the test database standing in for the ``read`` bind."""
+    path = db.engine.url.database
+    engine = create_engine(f"sqlite:///file:{path}?mode=ro&uri=true")
+    monkeypatch.setitem(app.config, "SQLALCHEMY_BINDS", {"read": {"url": str(engine.url)}})
+    monkeypatch.setitem(db.engines, "read", engine)
+    yield engine
+    engine.dispose()
+
+
+def statements_on(engine):
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_without_a_read_bind_reads_use_the_primary_session(app):
+    assert read_db() is db.session
+
+
+def test_listings_are_served_from_the_read_bind(client, campus, replica):
+    on_replica, on_primary = statements_on(replica), statements_on(db.engine)
+
+    clubs = client.get("/clubs").get_json()
+    events = client.get(f"/clubs/{campus['clubs'][0]}/events").get_json()["events"]
+
+    assert [club["name"] for club in clubs] == ["Robotics", "Chess"]
+    assert [e["name"] for e in events] == ["Kickoff"]
+    assert on_replica and not on_primary
+
+
+def test_writes_go_to_the_primary(client, campus, replica):
+    on_replica = statements_on(replica)
+
+    response = client.post(f"/apply/{campus['students'][0]}/{campus['clubs'][1]}")
+
+    assert response.status_code == 201
+    assert db.session.query(Application).count() == 1
+    assert not any(s.lstrip().upper().startswith("INSERT") for s in on_replica)
+
+
+def test_the_read_session_is_reused_within_a_request(app, replica):
+    with app.test_request_context("/clubs"):
+        session = read_db()
+
+        assert read_db() is session
+        assert session.get_bind() is replica
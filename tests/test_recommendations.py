@@ -0,0 +1,58 @@
+import os
+import sys
+
+
+def test_recommendations_build_index_in_fresh_instance_dir(app, client, campus):
+    index_dir = os.path.dirname(app.config["RECOMMENDATION_INDEX_PATH"])
+    assert not os.path.exists(index_dir)
+
+    response = client.get(f"/recommendations/{campus['students'][0]}")
+
+    assert response.status_code == 200
+    assert response.get_json()["recommendations"][0]["name"] == "Robotics"
+    assert os.path.exists(app.config["RECOMMENDATION_INDEX_PATH"])
+
+
+def test_batch_recommendations_in_fresh_instance_dir(client, campus):
+    response = client.post("/recommendations/batch", json={"user_ids": campus["students"] + [999]})
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert set(body["recommendations"]) == {str(user_id) for user_id in campus["students"]}
+    assert body["missing"] == [999]
+
+
+def test_batch_recommendations_reject_invalid_arguments(client, campus):
+    student = campus["students"][0]
+    for payload in (
+        [student],
+        {"user_ids": []},
+        {"user_ids": [student, "2"]},
+        {"user_ids": [student, None]},
+        {"user_ids": [student, True]},
+        {"user_ids": [student], "top_n": "five"},
+        {"user_ids": [student], "top_n": 0},
+        {"user_ids": [student], "top_n": 10**9},
+        {"user_ids": [student], "top_n": 2.5},
+    ):
+        response = client.post("/recommendations/batch", json=payload)
+        assert response.status_code == 400, payload
+
+
+def test_batch_recommendations_honour_top_n(client, campus):
+    response = client.post("/recommendations/batch", json={"user_ids": campus["students"][:1], "top_n": 1})
+
+    assert response.status_code == 200
+    assert len(response.get_json()["recommendations"][str(campus["students"][0])]) == 1
+
+
+def test_scores_stay_between_zero_and_one(app, client):
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+    from synthetic_data import generate
+
+    summary = generate("1k", seed=7)
+    first, last = summary["student_ids"]
+    response = client.post("/recommendations/batch", json={"user_ids": list(range(first, last + 1)), "top_n": 10})
+
+    scores = [club["score"] for clubs in response.get_json()["recommendations"].values() for club in clubs]
+    assert scores and all(0 <= score <= 1 for score in scores)
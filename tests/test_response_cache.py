@@ -0,0 +1,34 @@
+from app import db, response_cache, Club, InProcessCacheBackend
+
+
+def test_tag_generations_survive_eviction():
+    backend = InProcessCacheBackend(max_entries=2)
+    backend.incr("tag:clubs")
+    for n in range(5):
+        backend.set(f"response:{n}", n, ttl=60)
+
+    assert backend.get("tag:clubs") == 1
+    assert backend.get("response:0") is None
+    assert backend.get("response:4") == 4
+
+
+def test_invalidation_still_works_after_the_cache_overflows(app, client, campus, monkeypatch):
+    monkeypatch.setitem(app.config, "RESPONSE_CACHE_MAX_ENTRIES", 3)
+    response_cache.__init__()
+
+    def club_names():
+        return [club["name"] for club in client.get("/clubs").get_json()]
+
+    def add_club(name):
+        db.session.add(Club(name=name, description="New", tags="new", coordinator_id=campus["coordinator"]))
+        db.session.commit()
+
+    club_names()
+    add_club("Debate")
+    assert "Debate" in club_names()
+    # Enough other responses to push out what came before the cached listing, but not the listing itself.
+    for limit in (1, 2):
+        client.get(f"/events?limit={limit}")
+    add_club("Drama")
+
+    assert "Drama" in club_names()
@@ -0,0 +1,33 @@
+import logging
+
+from sqlalchemy import text
+
+from app import db, upgrade_schema, Application
+
+
+def test_upgrade_keeps_the_decided_duplicate(campus, caplog):
+    student, club = campus["students"][0], campus["clubs"][0]
+    with db.engine.begin() as connection:
+        connection.execute(text("DROP INDEX uq_application_student_club"))
+        for status in ("pending", "accepted", "pending"):
+            connection.execute(text("INSERT INTO application (student_id, club_id, status) "
+                                    "VALUES (:student, :club, :status)"),
+                               {"student": student, "club": club, "status": status})
+        connection.execute(text("INSERT INTO application (student_id, club_id, status) "
+                                "VALUES (:student, :club, 'pending')"),
+                           {"student": campus["students"][1], "club": club})
+
+    with caplog.at_level(logging.WARNING):
+        upgrade_schema()
+
+    assert sorted(db.session.execute(db.select(Application.student_id, Application.status))) == [
+        (student, "accepted"), (campus["students"][1], "pending"),
+    ]
+    assert "Removed 2 duplicate rows from application" in caplog.text
+
+
+def test_upgrade_is_quiet_without_duplicates(campus, caplog):
+    with caplog.at_level(logging.WARNING):
+        upgrade_schema()
+
+    assert "duplicate" not in caplog.text
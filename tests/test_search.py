@@ -0,0 +1,104 @@
+from sqlalchemy import text
+
+from app import (
+    db, split_terms, sync_club_terms, upgrade_schema, Club, ClubTag, StudentInterest, StudentProfile, Tag,
+    CLUB_TERM_LINKS, PROFILE_TERM_LINKS,
+)
+
+
+def club_tags(club_id):
+    return sorted(db.session.scalars(db.select(Tag.name).join(ClubTag, ClubTag.tag_id == Tag.id)
+                                     .where(ClubTag.club_id == club_id)))
+
+
+def interests(user_id):
+    return sorted(db.session.scalars(db.select(Tag.name).join(StudentInterest, StudentInterest.tag_id == Tag.id)
+                                     .where(StudentInterest.user_id == user_id)))
+
+
+def names(response):
+    return [club["name"] for club in response.get_json()]
+
+
+def test_split_terms_normalises_and_deduplicates():
+    assert split_terms(" Machine  Learning, robotics,,ROBOTICS , ") == ["machine learning", "robotics"]
+    assert split_terms(None) == []
+
+
+def test_text_search_matches_prefixes_and_ranks_by_name(client, campus):
+    db.session.add(Club(name="Drama", description="Stage robotics props", tags="theatre",
+                        coordinator_id=campus["coordinator"]))
+    # Enough clubs without the word that it carries weight in bm25.
+    db.session.add_all(Club(name=f"Society {i}", description="Meets weekly", tags="social",
+                            coordinator_id=campus["coordinator"]) for i in range(4))
+    db.session.commit()
+
+    response = client.get("/clubs/search?q=robot")
+
+    assert names(response) == ["Robotics", "Drama"]
+    assert response.get_json()[0]["relevance"]["text_score"] > response.get_json()[1]["relevance"]["text_score"]
+
+
+def test_tag_and_skill_filters(client, campus):
+    assert names(client.get("/clubs/search?tag=Strategy")) == ["Chess"]
+    assert names(client.get("/clubs/search?tag=chess&tag=engineering")) == ["Robotics", "Chess"]
+    assert names(client.get("/clubs/search?skill=python&q=build")) == ["Robotics"]
+    assert names(client.get("/clubs/search?tag=chess&skill=python")) == []
+
+
+def test_search_rejects_bad_requests(client, campus):
+    assert client.get("/clubs/search").status_code == 400
+    assert client.get("/clubs/search?q=chess&limit=0").status_code == 400
+
+
+def test_club_edits_resync_links_and_search(client, campus):
+    robotics = db.session.get(Club, campus["clubs"][0])
+    assert names(client.get("/clubs/search?tag=engineering")) == ["Robotics"]
+
+    robotics.tags = "AI, Engineering ,ai"
+    robotics.description = "Train neural networks"
+    db.session.commit()
+
+    assert club_tags(robotics.id) == ["ai", "engineering"]
+    assert names(client.get("/clubs/search?tag=robotics")) == []
+    assert names(client.get("/clubs/search?q=neural")) == ["Robotics"]
+
+    db.session.delete(db.session.get(Club, campus["clubs"][1]))
+    db.session.commit()
+
+    assert db.session.query(ClubTag).filter_by(club_id=campus["clubs"][1]).count() == 0
+    assert names(client.get("/clubs/search?q=chess")) == []
+
+
+def test_profile_updates_resync_interests(client, campus):
+    student = campus["students"][0]
+
+    response = client.put(f"/profile/{student}", json={"interests": "Chess, Debate"})
+
+    assert response.status_code == 200
+    assert interests(student) == ["chess", "debate"]
+
+    db.session.delete(db.session.query(StudentProfile).filter_by(user_id=student).one())
+    db.session.commit()
+
+    assert interests(student) == []
+
+
+def test_non_orm_writes_are_picked_up_by_a_resync(campus):
+    chess = campus["clubs"][1]
+    with db.engine.begin() as connection:
+        connection.execute(text("UPDATE club SET tags = 'Chess, Go' WHERE id = :id"), {"id": chess})
+        sync_club_terms(connection, [chess])
+
+    assert club_tags(chess) == ["chess", "go"]
+
+
+def test_upgrade_backfills_empty_link_tables(campus):
+    with db.engine.begin() as connection:
+        for _, link, _, _, _ in CLUB_TERM_LINKS + PROFILE_TERM_LINKS:
+            connection.execute(link.__table__.delete())
+
+    upgrade_schema()
+
+    assert club_tags(campus["clubs"][0]) == ["engineering", "robotics"]
+    assert interests(campus["students"][0]) == ["robotics"]
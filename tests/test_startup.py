@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app import HEAVY_MODULES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADED = """
+import json, sys
+import app
+print(json.dumps([name for name in app.HEAVY_MODULES if name in sys.modules]))
+"""
+
+
+def loaded_after_import(tmp_path, **env):
+    env = dict(os.environ, DATABASE_URL="sqlite:///" + str(tmp_path / "startup.db"), **env)
+    output = subprocess.run([sys.executable, "-c", LOADED], env=env, cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_heavy_modules_are_not_imported_at_startup(tmp_path):
+    assert loaded_after_import(tmp_path, PRELOAD_HEAVY_MODULES="0") == []
+
+
+def test_preloading_imports_them_up_front(tmp_path):
+    pytest.importorskip("sklearn")
+
+    assert loaded_after_import(tmp_path, PRELOAD_HEAVY_MODULES="1") == list(HEAVY_MODULES)
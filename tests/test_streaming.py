@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from app import db, event_broker, format_sse, parse_topics, Application, Subscription
+
+
+def test_parse_topics(app, monkeypatch):
+    assert parse_topics("buzz,event:1:attendance,buzz") == {"buzz", "event:1:attendance"}
+    monkeypatch.setitem(app.config, "STREAM_MAX_TOPICS", 2)
+    for value, error in [("", "required"), ("club:x:attendance", "Unknown topic"),
+                         ("buzz,club:1:attendance,club:2:attendance", "At most 2")]:
+        with pytest.raises(ValueError, match=error):
+            parse_topics(value)
+
+
+def test_subscribers_receive_only_their_topics(app):
+    subscription = event_broker.subscribe(Subscription({"club:1:attendance"}))
+
+    event_broker.publish("club:2:attendance", {"n": 1})
+    event_broker.publish("club:1:attendance", {"n": 2})
+
+    message = subscription.get(0)
+    assert format_sse(message) == f'id: {message[0]}\nevent: club:1:attendance\ndata: {{"n": 2}}\n\n'
+    assert subscription.get(0) is None
+
+
+def test_lagging_subscribers_are_dropped_and_can_resume(app, monkeypatch):
+    monkeypatch.setitem(app.config, "STREAM_MAX_PENDING", 2)
+    subscription = event_broker.subscribe(Subscription({"buzz"}))
+    for n in range(3):
+        event_broker.publish("buzz", {"n": n})
+
+    assert subscription.closed
+    last_seen = subscription.get(0)[0]
+    subscription.get(0)
+
+    resumed = event_broker.subscribe(Subscription({"buzz"}), last_event_id=last_seen)
+    assert [resumed.get(0)[2] for _ in range(2)] == [{"n": 1}, {"n": 2}]
+
+
+def test_application_changes_are_published_on_commit_only(app, campus):
+    subscription = event_broker.subscribe(Subscription({f"club:{campus['clubs'][0]}:applications"}))
+    application = Application(student_id=campus["students"][0], club_id=campus["clubs"][0])
+    db.session.add(application)
+    db.session.flush()
+    assert subscription.get(0) is None
+
+    db.session.commit()
+    assert subscription.get(0)[2]["status"] == "pending"
+
+    application.status = "accepted"
+    db.session.flush()
+    db.session.rollback()
+    assert subscription.get(0) is None
+
+
+def test_stream_endpoint_sends_published_messages(app, client, campus, monkeypatch):
+    monkeypatch.setitem(app.config, "STREAM_HEARTBEAT_SECONDS", 0.01)
+    topic = f"event:{campus['event']}:attendance"
+
+    response = client.get(f"/stream?topics={topic}")
+    chunks = iter(response.response)
+
+    assert response.mimetype == "text/event-stream"
+    assert next(chunks) == b"retry: 10.0\n\n"
+    assert next(chunks) == b": heartbeat\n\n"
+    client.post(f"/checkin/kickoff-key/{campus['students'][0]}")
+    assert f"event: {topic}\n".encode() in next(chunks)
+
+    response.close()
+    assert not event_broker._subscribers
+
+
+def test_stream_endpoint_rejects_bad_topics(client):
+    assert client.get("/stream?topics=everything").status_code == 400
+
+
+def test_asgi_stream_delivers_and_unsubscribes_on_disconnect(app):
+    asgi = pytest.importorskip("asgi")
+
+    async def run():
+        disconnected = asyncio.Event()
+        bodies = []
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                bodies.append(message["body"])
+                if len(bodies) == 1:
+                    event_broker.publish("buzz", {"club_id": 1})
+                else:
+                    disconnected.set()
+
+        scope = {"type": "http", "method": "GET", "path": "/stream", "query_string": b"topics=buzz",
+                 "headers": [], "client": ("127.0.0.1", 1)}
+        await asyncio.wait_for(asgi.application(scope, receive, send), 5)
+        return bodies
+
+    bodies = asyncio.run(run())
+
+    assert bodies[0].startswith(b"retry:")
+    assert b'event: buzz\ndata: {"club_id": 1}' in bodies[1]
+    assert not event_broker._subscribers
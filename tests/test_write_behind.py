@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import pytest
+
+import app as app_module
+from app import db, Application, Attendance, WriteBehindQueue
+
+
+@pytest.fixture
+def log_path(app, tmp_path, monkeypatch):
+    path = tmp_path / "write_behind.log"
+    monkeypatch.setitem(app.config, "WRITE_BEHIND_ENABLED", True)
+    monkeypatch.setitem(app.config, "WRITE_BEHIND_LOG_PATH", str(path))
+    # The background thread reads this once; a long interval leaves flushing to the tests.
+    monkeypatch.setitem(app.config, "WRITE_BEHIND_FLUSH_INTERVAL", 60)
+    return path
+
+
+def attendance(campus, student):
+    return {"kind": "attendance", "event_id": campus["event"], "club_id": campus["clubs"][0],
+            "student_id": student, "timestamp": "2026-01-10T18:05:00"}
+
+
+def application(campus, student):
+    return {"kind": "application", "student_id": student, "club_id": campus["clubs"][1],
+            "timestamp": "2026-01-10T18:05:00"}
+
+
+def rows():
+    return (sorted(db.session.scalars(db.select(Attendance.student_id))),
+            sorted(db.session.scalars(db.select(Application.student_id))))
+
+
+def test_acknowledged_records_are_replayed_after_a_restart(campus, log_path):
+    first, second, third = campus["students"]
+    log_path.write_text("".join(json.dumps(record) + "\n" for record in [
+        attendance(campus, first), application(campus, second), attendance(campus, third),
+    ]) + '{"kind": "attendance", "event_')  # torn by the crash before its fsync
+
+    queue = WriteBehindQueue()
+    assert queue.start()
+    queue.flush()
+
+    assert rows() == ([first, third], [second])
+    assert log_path.read_text() == ""
+
+
+def test_replay_writes_each_record_exactly_once(campus, log_path):
+    first, second, _ = campus["students"]
+    # The process died after committing the first check-in but before trimming the log.
+    db.session.add(Attendance(event_id=campus["event"], student_id=first))
+    db.session.commit()
+    log_path.write_text("".join(json.dumps(record) + "\n" for record in [
+        attendance(campus, first), application(campus, second), application(campus, second),
+    ]))
+
+    queue = WriteBehindQueue()
+    queue.start()
+    queue.flush()
+    queue.flush()
+
+    assert rows() == ([first], [second])
+
+
+def test_duplicate_submissions_are_refused_while_pending(campus, log_path):
+    queue = WriteBehindQueue()
+    queue.start()
+
+    assert queue.submit(attendance(campus, campus["students"][0]))
+    assert not queue.submit(attendance(campus, campus["students"][0]))
+    assert len(log_path.read_text().splitlines()) == 1
+
+
+def test_checkin_is_acknowledged_before_the_insert(client, campus, log_path, monkeypatch):
+    queue = WriteBehindQueue()
+    monkeypatch.setattr(app_module, "write_behind", queue)
+    student = campus["students"][0]
+
+    assert client.post(f"/checkin/kickoff-key/{student}").status_code == 202
+    assert client.post(f"/checkin/kickoff-key/{student}").status_code == 409
+    assert rows() == ([], [])
+
+    queue.flush()
+
+    assert rows() == ([student], [])
+
+
+def test_pending_records_are_flushed_on_shutdown(campus, log_path, monkeypatch):
+    asgi = pytest.importorskip("asgi")
+    queue = WriteBehindQueue()
+    monkeypatch.setattr(asgi, "write_behind", queue)
+    student = campus["students"][0]
+
+    async def run():
+        messages = asyncio.Queue()
+        await messages.put({"type": "lifespan.startup"})
+        sent = []
+
+        async def send(message):
+            sent.append(message["type"])
+            if message["type"] == "lifespan.startup.complete":
+                queue.submit(attendance(campus, student))
+                await messages.put({"type": "lifespan.shutdown"})
+
+        await asgi.application({"type": "lifespan"}, messages.get, send)
+        return sent
+
+    assert asyncio.run(run()) == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert rows() == ([student], [])